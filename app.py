@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import os
 
 from flask import Flask
@@ -8,7 +9,9 @@ from flask_restful import Api
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from . import config
-from .extensions import db, jwt, migrate, oauth
+from .extensions import cache, db, exercise_type_cache, jwt, migrate, password_hasher
+
+log = logging.getLogger(__name__)
 
 
 def create_app() -> Flask:
@@ -34,19 +37,20 @@ def create_app() -> Flask:
 
     app.json.ensure_ascii = False
 
+    from .utils import etag
+    from .utils.engine import engine_options, init_engine
+
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        engine_options(app.config["SQLALCHEMY_DATABASE_URI"], app.config),
+    )
     db.init_app(app)
+    init_engine(app, db)
     migrate.init_app(app, db)
     jwt.init_app(app)
-
-    if oauth is not None:
-        oauth.init_app(app)
-        oauth.register(
-            name="google",
-            client_id=app.config["GOOGLE_CLIENT_ID"],
-            client_secret=app.config["GOOGLE_CLIENT_SECRET"],
-            server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-            client_kwargs={"scope": "openid email profile", "prompt": "consent"},
-        )
+    cache.init_app(app, version=etag.data_version)
+    exercise_type_cache.init_app(app)
+    password_hasher.init_app(app)
 
     CORS(
         app,
@@ -62,58 +66,85 @@ def create_app() -> Flask:
 
     register_error_handlers(app)
 
+    from .resources.account import AccountSettings
     from .resources.auth import Login, Register
+    from .resources.challenge import (
+        ChallengeDetail,
+        ChallengeJoin,
+        ChallengeLeaderboard,
+        ChallengeList,
+        ChallengeMembership,
+    )
     from .resources.exercise import ExerciseTypeDetail, ExerciseTypeList
     from .resources.goal import GoalDetail, GoalList
+    from .resources.goal_progress import GoalHistory, GoalProgress
     from .resources.health import bp as health_bp
-    from .resources.report import SummaryReport
-    from .resources.session import SessionDetail, SessionList
+    from .resources.oauth_google import bp as oauth_google_bp
+    from .resources.report import SummaryReport, TimeseriesReport
+    from .resources.session import SessionBulk, SessionDetail, SessionExport, SessionList
+    from .resources.stats import StatsOverview
 
     api.add_resource(GoalList, "/goals")
     api.add_resource(GoalDetail, "/goals/<int:goal_id>")
+    api.add_resource(GoalProgress, "/goals/<int:goal_id>/progress")
+    api.add_resource(GoalHistory, "/goals/<int:goal_id>/history")
 
     api.add_resource(SessionList, "/sessions")
+    api.add_resource(SessionBulk, "/sessions/bulk")
+    api.add_resource(SessionExport, "/sessions/export")
     api.add_resource(SessionDetail, "/sessions/<int:session_id>")
 
     api.add_resource(Register, "/auth/register")
     api.add_resource(Login, "/auth/login")
+    api.add_resource(AccountSettings, "/account/settings")
 
     api.add_resource(ExerciseTypeList, "/exercise-types")
     api.add_resource(ExerciseTypeDetail, "/exercise-types/<int:type_id>")
 
     api.add_resource(SummaryReport, "/reports/summary")
+    api.add_resource(TimeseriesReport, "/reports/timeseries")
+
+    api.add_resource(StatsOverview, "/stats/overview")
+
+    api.add_resource(ChallengeList, "/challenges")
+    api.add_resource(ChallengeJoin, "/challenges/join")
+    api.add_resource(ChallengeDetail, "/challenges/<int:challenge_id>")
+    api.add_resource(ChallengeMembership, "/challenges/<int:challenge_id>/membership")
+    api.add_resource(ChallengeLeaderboard, "/challenges/<int:challenge_id>/leaderboard")
 
     app.register_blueprint(health_bp)
+    app.register_blueprint(oauth_google_bp)
+
+    if app.config.get("INSTRUMENTATION_ENABLED"):
+        from .resources.metrics import bp as metrics_bp
+        from .utils.instrumentation import init_instrumentation
 
-    try:
-        from .resources.oauth_google import bp as oauth_google_bp  # type: ignore
+        init_instrumentation(app, db)
+        app.register_blueprint(metrics_bp)
 
-        app.register_blueprint(oauth_google_bp)
-    except Exception:
-        pass
+    from .utils.leaderboards import challenges_cli
+    from .utils.rollup import rollup_cli
+    from .utils.snapshots import SnapshotWorker, snapshots_cli
 
-    try:
-        from .resources.stats import StatsOverview  # type: ignore
-    except Exception:
-        StatsOverview = None
-    if StatsOverview is not None:
-        api.add_resource(StatsOverview, "/stats/overview")
+    app.cli.add_command(challenges_cli)
+    app.cli.add_command(rollup_cli)
+    app.cli.add_command(snapshots_cli)
+
+    if app.config.get("SNAPSHOT_WORKER_ENABLED"):
+        worker = SnapshotWorker(app, interval=float(app.config.get("SNAPSHOT_WORKER_INTERVAL", 10)))
+        worker.start()
+        app.extensions["snapshot_worker"] = worker
 
     @app.route("/", methods=["GET"])
     def hello():
         return {"message": "Fitness Tracker API działa!"}
 
-    if app.config.get("DEBUG") or app.config.get("ENV") == "development":
-        print("\n=== URL MAP ===")
+    if log.isEnabledFor(logging.DEBUG):
         for rule in app.url_map.iter_rules():
-            methods = ",".join(sorted(rule.methods))
-            print(f"{rule.rule:35} -> {methods}")
-        print("==============\n")
+            log.debug("route %-35s -> %s", rule.rule, ",".join(sorted(rule.methods)))
 
     return app
 
 
-app = create_app()
-
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,267 @@
+"""Cheap-read latency while slow OAuth callbacks are in flight, per worker mode.
+
+    python -m backend.benchmarks.bench_concurrency [--modes sync,gthread,gevent]
+
+Starts a local stub OpenID provider whose token endpoint sleeps ``--delay``
+seconds, then runs gunicorn with ``gunicorn.conf.py`` once per worker class.
+``--oauth-clients`` threads loop through Google sign-in against the stub
+while ``--readers`` threads hit ``/api/health``. The table shows read
+throughput and latency next to the sign-ins that completed or got a 503.
+Modes whose worker class is not installed are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import itertools
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+_root = Path(__file__).resolve().parents[2]
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+_package = Path(__file__).resolve().parents[1]
+
+
+class StubProvider:
+    """Minimal OpenID provider: discovery, a slow token endpoint and userinfo."""
+
+    def __init__(self, delay: float = 0.5):
+        self.delay = delay
+        self._ids = itertools.count(1)
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _json(self, payload: dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith("/.well-known/openid-configuration"):
+                    self._json(
+                        {
+                            "issuer": provider.url,
+                            "authorization_endpoint": f"{provider.url}/authorize",
+                            "token_endpoint": f"{provider.url}/token",
+                            "userinfo_endpoint": f"{provider.url}/userinfo",
+                        }
+                    )
+                elif self.path.startswith("/userinfo"):
+                    n = next(provider._ids)
+                    self._json({"sub": f"stub-{n}", "email": f"stub-{n}@stub.dev", "name": "Stub"})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not self.path.startswith("/token"):
+                    self.send_error(404)
+                    return
+                time.sleep(provider.delay)
+                self._json({"access_token": "stub", "token_type": "Bearer", "expires_in": 3600})
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        self.metadata_url = f"{self.url}/.well-known/openid-configuration"
+
+    def __enter__(self) -> StubProvider:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def sign_in(http, base: str) -> int:
+    """One Google sign-in against the app; returns the callback's status code."""
+    r = http.get(f"{base}/api/auth/google/login", allow_redirects=False, timeout=30)
+    state = parse_qs(urlsplit(r.headers["Location"]).query)["state"][0]
+    r = http.get(
+        f"{base}/api/auth/google/callback",
+        params={"code": "stub", "state": state},
+        allow_redirects=False,
+        timeout=30,
+    )
+    return r.status_code
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _available(mode: str) -> bool:
+    return mode != "gevent" or importlib.util.find_spec("gevent") is not None
+
+
+def _serve(mode: str, env: dict, workers: int, threads: int):
+    port = _free_port()
+    env = {
+        **env,
+        "GUNICORN_WORKER_CLASS": mode,
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        "GUNICORN_WORKER_CONNECTIONS": str(threads * 4),
+    }
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            str(_package / "gunicorn.conf.py"),
+            f"{_package.name}.wsgi:app",
+        ],
+        cwd=str(_root),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def _wait_ready(http, base: str, proc, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+        try:
+            if http.get(f"{base}/api/health", timeout=1).status_code == 200:
+                return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready")
+
+
+def run_mode(mode: str, env: dict, opts) -> dict:
+    import requests
+
+    proc, base = _serve(mode, env, opts.workers, opts.threads)
+    try:
+        _wait_ready(requests, base, proc)
+        stop = time.monotonic() + opts.duration
+        latencies: list[float] = []
+        outcomes: dict[int, int] = {}
+        lock = threading.Lock()
+
+        def reader():
+            http = requests.Session()
+            while time.monotonic() < stop:
+                t0 = time.perf_counter()
+                ok = http.get(f"{base}/api/health", timeout=30).status_code == 200
+                elapsed = time.perf_counter() - t0
+                if ok:
+                    with lock:
+                        latencies.append(elapsed)
+
+        def signer():
+            while time.monotonic() < stop:
+                status = sign_in(requests.Session(), base)
+                with lock:
+                    outcomes[status] = outcomes.get(status, 0) + 1
+                if status == 503:
+                    time.sleep(0.05)
+
+        pool = [threading.Thread(target=signer) for _ in range(opts.oauth_clients)]
+        pool += [threading.Thread(target=reader) for _ in range(opts.readers)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    ordered = sorted(latencies)
+    return {
+        "reads_per_s": round(len(ordered) / opts.duration, 1),
+        "read_p50_ms": round(statistics.median(ordered) * 1000, 1) if ordered else None,
+        "read_p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 1) if ordered else None,
+        "sign_ins_ok": outcomes.get(302, 0),
+        "sign_ins_busy": outcomes.get(503, 0),
+        "sign_ins_other": sum(v for k, v in outcomes.items() if k not in (302, 503)),
+    }
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modes", default="sync,gthread,gevent")
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--delay", type=float, default=0.5, help="stub token endpoint delay (s)")
+    ap.add_argument("--oauth-clients", type=int, default=16)
+    ap.add_argument("--readers", type=int, default=4)
+    ap.add_argument("--duration", type=float, default=5.0)
+    opts = ap.parse_args(argv)
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "GOOGLE_CLIENT_ID": "stub",
+        "GOOGLE_CLIENT_SECRET": "stub",
+        "LOG_LEVEL": "WARNING",
+    }
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"from {_package.name}.app import create_app\n"
+            f"from {_package.name}.extensions import db\n"
+            "with create_app().app_context():\n"
+            "    db.create_all()\n",
+        ],
+        cwd=str(_root),
+        env=env,
+        check=True,
+    )
+
+    try:
+        with StubProvider(opts.delay) as stub:
+            env["GOOGLE_METADATA_URL"] = stub.metadata_url
+            print(
+                f"{'mode':8} {'reads/s':>8} {'p50 ms':>8} {'p95 ms':>8}"
+                f" {'sign-ins':>9} {'503':>5} {'other':>6}"
+            )
+            for mode in opts.modes.split(","):
+                if not _available(mode):
+                    print(f"{mode:8} skipped (not installed)")
+                    continue
+                r = run_mode(mode, env, opts)
+                print(
+                    f"{mode:8} {r['reads_per_s']:8.1f} {r['read_p50_ms'] or 0:8.1f}"
+                    f" {r['read_p95_ms'] or 0:8.1f} {r['sign_ins_ok']:9d}"
+                    f" {r['sign_ins_busy']:5d} {r['sign_ins_other']:6d}"
+                )
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Memory per session row: ORM objects vs Core tuples vs SessionColumns.
+
+    python -m backend.benchmarks.bench_memory [--sessions 50000]
+
+Loads one user's full history three ways under tracemalloc and prints the
+retained and peak bytes per row for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[2]
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+
+def _loaders(user_id: int) -> dict:
+    from backend.extensions import db
+    from backend.models import WorkoutSession
+    from backend.utils.columns import SessionColumns, session_rows
+
+    def orm():
+        return (
+            WorkoutSession.query.filter(WorkoutSession.user_id == user_id)
+            .order_by(WorkoutSession.date)
+            .all()
+        )
+
+    def core():
+        return db.session.execute(session_rows(user_id)).all()
+
+    def columns():
+        return SessionColumns.load(user_id)
+
+    return {"orm": orm, "core_tuples": core, "session_columns": columns}
+
+
+def measure(app, user_id: int) -> dict:
+    """Bytes per row kept alive by each loader's result, and its peak during the load."""
+    from backend.extensions import db
+
+    results = {}
+    for name, load in _loaders(user_id).items():
+        with app.app_context():
+            gc.collect()
+            tracemalloc.start()
+            data = load()
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows = len(data)
+            del data
+            db.session.remove()
+        results[name] = {
+            "rows": rows,
+            "retained_bytes_per_row": round(retained / max(rows, 1), 1),
+            "peak_bytes_per_row": round(peak / max(rows, 1), 1),
+        }
+    return results
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sessions", type=int, default=50000)
+    opts = ap.parse_args(argv)
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from backend.app import create_app
+    from backend.benchmarks.datagen import DatasetSpec, generate
+    from backend.extensions import db
+
+    app = create_app()
+    try:
+        with app.app_context():
+            db.create_all()
+            (user_id,) = generate(
+                DatasetSpec(users=1, sessions_per_user=opts.sessions, goals_per_user=0)
+            )
+
+        for name, r in measure(app, user_id).items():
+            print(
+                f"{name:16} {r['rows']:8d} rows  retained {r['retained_bytes_per_row']:8.1f} B/row"
+                f"  peak {r['peak_bytes_per_row']:8.1f} B/row"
+            )
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.unlink(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Microbenchmark: reqparse vs the precompiled Schema on POST /api/sessions.
+
+    python -m backend.benchmarks.bench_request_parsing [--requests 2000]
+
+Prints parse-only timings and end-to-end requests/sec for both parsers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[2]
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+
+def _legacy_parser(positive_int):
+    from flask_restful import reqparse
+
+    parser = reqparse.RequestParser()
+    parser.add_argument("exercise_type_id", type=int, required=True, location=("json", "form"))
+    parser.add_argument("duration", type=positive_int, required=True, location=("json", "form"))
+    parser.add_argument("calories", type=positive_int, required=True, location=("json", "form"))
+    parser.add_argument("date", type=str, required=False, location=("json", "form"))
+    return parser
+
+
+class _ReqparseShim:
+    def __init__(self, parser):
+        self.parser = parser
+
+    def parse(self):
+        return self.parser.parse_args()
+
+
+def _rps(client, headers, payload, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        r = client.post("/api/sessions", json=payload, headers=headers)
+        assert r.status_code == 201, r.get_json()
+    return n / (time.perf_counter() - t0)
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--parses", type=int, default=20000)
+    opts = ap.parse_args(argv)
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from backend.app import create_app
+    from backend.extensions import db
+    from backend.resources import session as session_res
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+    client = app.test_client()
+    email = f"{uuid.uuid4().hex}@bench.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "pw"}).get_json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=headers).get_json()
+    payload = {"exercise_type_id": etid["id"], "duration": 30, "calories": 250}
+
+    legacy = _legacy_parser(session_res._positive_int)
+    schema = session_res.create_parser
+
+    with app.test_request_context(json=payload):
+        for label, parse in (("reqparse", legacy.parse_args), ("schema", schema.parse)):
+            t0 = time.perf_counter()
+            for _ in range(opts.parses):
+                parse()
+            us = (time.perf_counter() - t0) / opts.parses * 1e6
+            print(f"parse  {label:9} {us:8.2f} us/call")
+
+    # Alternate rounds so table growth and warm-up affect both parsers alike.
+    rounds = 5
+    per_round = max(1, opts.requests // rounds)
+    samples: dict[str, list[float]] = {"reqparse": [], "schema": []}
+    try:
+        for _ in range(rounds):
+            session_res.create_parser = _ReqparseShim(legacy)
+            samples["reqparse"].append(_rps(client, headers, payload, per_round))
+            session_res.create_parser = schema
+            samples["schema"].append(_rps(client, headers, payload, per_round))
+    finally:
+        session_res.create_parser = schema
+
+    results = {label: sorted(v)[len(v) // 2] for label, v in samples.items()}
+    for label, rps in results.items():
+        print(f"POST   {label:9} {rps:8.1f} req/s")
+    print(f"speedup {results['schema'] / results['reqparse']:.2f}x")
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    os.close(fd)
+    os.unlink(db_path)
+
+
+if __name__ == "__main__":
+    main()
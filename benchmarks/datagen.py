@@ -0,0 +1,102 @@
+"""Synthetic data generator for the benchmark suite.
+
+Rows are written with executemany-style bulk inserts and the daily rollup is
+rebuilt at the end, so the database looks like one filled through the API.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+from ..extensions import db
+from ..models import ExerciseType, Goal, User, WorkoutSession
+from ..utils import rollup
+
+EXERCISE_NAMES = ("Run", "Bike", "Swim", "Row", "Walk", "Yoga", "Lift", "Climb", "Ski", "Hike")
+PERIODS = ("weekly", "monthly", "yearly")
+METRICS = ("duration", "calories", "sessions")
+CHUNK = 5000
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    users: int = 5
+    types_per_user: int = 5
+    sessions_per_user: int = 2000
+    goals_per_user: int = 20
+    days: int = 3 * 365
+    seed: int = 42
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _insert(model, rows: list[dict]) -> None:
+    for i in range(0, len(rows), CHUNK):
+        db.session.execute(insert(model), rows[i : i + CHUNK])
+
+
+def generate(spec: DatasetSpec, *, now: datetime | None = None) -> list[int]:
+    """Fill an empty database according to ``spec``; returns the user ids."""
+    rnd = random.Random(spec.seed)
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    pw_hash = generate_password_hash("bench")
+
+    user_ids = list(range(1, spec.users + 1))
+    _insert(
+        User,
+        [
+            {"id": uid, "email": f"bench{uid}@bench.dev", "password_hash": pw_hash}
+            for uid in user_ids
+        ],
+    )
+
+    types: dict[int, list[int]] = {}
+    type_rows = []
+    next_type = 1
+    for uid in user_ids:
+        types[uid] = []
+        for name in EXERCISE_NAMES[: spec.types_per_user]:
+            type_rows.append({"id": next_type, "user_id": uid, "name": name})
+            types[uid].append(next_type)
+            next_type += 1
+    _insert(ExerciseType, type_rows)
+
+    session_rows = []
+    for uid in user_ids:
+        for _ in range(spec.sessions_per_user):
+            duration = rnd.randint(10, 120)
+            session_rows.append(
+                {
+                    "user_id": uid,
+                    "exercise_type_id": rnd.choice(types[uid]),
+                    "duration": duration,
+                    "calories": duration * rnd.randint(5, 12),
+                    "date": now - timedelta(minutes=rnd.randint(0, spec.days * 24 * 60)),
+                }
+            )
+    _insert(WorkoutSession, session_rows)
+
+    goal_rows = []
+    for uid in user_ids:
+        for i in range(spec.goals_per_user):
+            goal_rows.append(
+                {
+                    "user_id": uid,
+                    "description": f"goal {i}",
+                    "target_value": rnd.randint(5, 5000),
+                    "period": rnd.choice(PERIODS),
+                    "metric": rnd.choice(METRICS),
+                    "exercise_type_id": rnd.choice(types[uid] + [None]),
+                }
+            )
+    _insert(Goal, goal_rows)
+
+    db.session.commit()
+    rollup.rebuild()
+    return user_ids
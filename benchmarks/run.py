@@ -0,0 +1,189 @@
+"""Benchmark the hot endpoints against a synthetic dataset.
+
+    python -m backend.benchmarks.run --sessions 5000 --out bench.json
+    python -m backend.benchmarks.run --baseline bench.json --max-regression 0.25
+
+The database is SQLite in a temp file unless --database-url points at a
+local Postgres. Timings go through the Flask test client, and the response
+cache is off unless --with-cache is given. Results are written as JSON so
+later runs can be compared against a stored baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[2]
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+
+def _timed(fn, repeat: int) -> dict:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "repeat": repeat,
+    }
+
+
+def _get(client, url: str, headers: dict):
+    def call():
+        r = client.get(url, headers=headers)
+        assert r.status_code == 200, (url, r.status_code, r.get_data(as_text=True)[:200])
+
+    return call
+
+
+def build_cases(app, client, user_id: int, spec) -> dict:
+    from backend.extensions import db
+    from backend.models import Goal, User
+    from backend.utils.progress import compute_goal_progress
+
+    with app.app_context():
+        token = db.session.get(User, user_id).create_token()
+    h = {"Authorization": f"Bearer {token}"}
+
+    deep_page = max(1, spec.sessions_per_user // 10 // 2)
+    cases = {
+        "sessions.page_1": _get(client, "/api/sessions?page=1&page_size=10", h),
+        f"sessions.page_{deep_page}": _get(
+            client, f"/api/sessions?page={deep_page}&page_size=10", h
+        ),
+        "sessions.cursor_first": _get(
+            client, "/api/sessions?page_size=10&cursor=&include_total=false", h
+        ),
+        "goals.with_progress": _get(client, "/api/goals?page_size=100&with_progress=true", h),
+        "reports.summary_week": _get(client, "/api/reports/summary?range=week", h),
+        "reports.summary_month_by_day": _get(
+            client, "/api/reports/summary?range=month&group_by=day", h
+        ),
+    }
+
+    def progress_all():
+        with app.app_context():
+            for goal in Goal.query.filter_by(user_id=user_id).all():
+                compute_goal_progress(goal, now=datetime.utcnow())
+
+    cases["compute_goal_progress.all_goals"] = progress_all
+    return cases
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> bool:
+    ok = True
+    print(f"\n{'case':40} {'base ms':>10} {'now ms':>10} {'ratio':>7}")
+    for name, cur in results["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            print(f"{name:40} {'-':>10} {cur['median_ms']:10.3f} {'new':>7}")
+            continue
+        ratio = cur["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        flag = ""
+        if ratio > 1 + max_regression:
+            ok = False
+            flag = "  REGRESSION"
+        print(f"{name:40} {base['median_ms']:10.3f} {cur['median_ms']:10.3f} {ratio:7.2f}{flag}")
+    return ok
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    ap.add_argument("--users", type=int, default=5)
+    ap.add_argument("--types", type=int, default=5)
+    ap.add_argument("--sessions", type=int, default=2000, help="sessions per user")
+    ap.add_argument("--goals", type=int, default=20, help="goals per user")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--database-url", default=None)
+    ap.add_argument("--with-cache", action="store_true")
+    ap.add_argument("--out", default=None, help="write results JSON here")
+    ap.add_argument("--baseline", default=None, help="compare against this results JSON")
+    ap.add_argument("--max-regression", type=float, default=0.25)
+    opts = ap.parse_args(argv)
+
+    tmp = None
+    if opts.database_url:
+        os.environ["DATABASE_URL"] = opts.database_url
+    else:
+        fd, tmp = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}"
+    os.environ["RESPONSE_CACHE_ENABLED"] = "True" if opts.with_cache else "False"
+
+    from backend.app import create_app
+    from backend.benchmarks.datagen import DatasetSpec, generate
+    from backend.extensions import db
+
+    spec = DatasetSpec(
+        users=opts.users,
+        types_per_user=opts.types,
+        sessions_per_user=opts.sessions,
+        goals_per_user=opts.goals,
+        seed=opts.seed,
+    )
+
+    app = create_app()
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            t0 = time.perf_counter()
+            user_ids = generate(spec)
+            gen_s = time.perf_counter() - t0
+            dialect = db.engine.dialect.name
+        print(f"generated dataset in {gen_s:.1f}s: {spec.as_dict()}")
+
+        client = app.test_client()
+        cases = build_cases(app, client, user_ids[0], spec)
+
+        results = {
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "database": dialect,
+                "cache": opts.with_cache,
+                "spec": spec.as_dict(),
+            },
+            "results": {},
+        }
+        for name, fn in cases.items():
+            results["results"][name] = stats = _timed(fn, opts.repeat)
+            print(f"{name:40} median {stats['median_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms")
+
+        if opts.out:
+            Path(opts.out).write_text(json.dumps(results, indent=2))
+            print(f"\nwrote {opts.out}")
+
+        if opts.baseline:
+            baseline = json.loads(Path(opts.baseline).read_text())
+            if not compare(results, baseline, opts.max_regression):
+                return 1
+        return 0
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        if tmp:
+            os.unlink(tmp)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,6 +10,48 @@ SQLALCHEMY_DATABASE_URI: str = os.getenv(
 )
 SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
 
+# Engine profile; create_app turns these into SQLALCHEMY_ENGINE_OPTIONS unless
+# that is set explicitly. Pool settings apply to server databases only.
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "")
+
+EXERCISE_TYPE_CACHE_ENABLED: bool = (
+    os.getenv("EXERCISE_TYPE_CACHE_ENABLED", "True").lower() == "true"
+)
+EXERCISE_TYPE_CACHE_TTL: float = float(os.getenv("EXERCISE_TYPE_CACHE_TTL", "300"))
+
+INSTRUMENTATION_ENABLED: bool = os.getenv("INSTRUMENTATION_ENABLED", "False").lower() == "true"
+SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Bearer token the scraper sends to /api/metrics; while unset the endpoint answers 401.
+METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
+SNAPSHOT_MAX_AGE: float = float(os.getenv("SNAPSHOT_MAX_AGE", "900"))
+SNAPSHOT_WORKER_ENABLED: bool = os.getenv("SNAPSHOT_WORKER_ENABLED", "False").lower() == "true"
+SNAPSHOT_WORKER_INTERVAL: float = float(os.getenv("SNAPSHOT_WORKER_INTERVAL", "10"))
+
+SESSIONS_BULK_CHUNK_SIZE: int = int(os.getenv("SESSIONS_BULK_CHUNK_SIZE", "1000"))
+
+# Any werkzeug method string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000".
+# Stored hashes made with other parameters are upgraded on the next login.
+PASSWORD_HASH_METHOD: str = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+PASSWORD_HASH_TIMEOUT: float = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
 JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "dev-jwt-secret")
 
 SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-session-secret")
@@ -25,6 +67,14 @@ FRONTEND_OAUTH_REDIRECT: str = os.getenv(
     "FRONTEND_OAUTH_REDIRECT",
     "http://localhost:8080/login/oauth",
 )
+GOOGLE_METADATA_URL: str = os.getenv(
+    "GOOGLE_METADATA_URL",
+    "https://accounts.google.com/.well-known/openid-configuration",
+)
+# Outbound calls to the provider are bounded in time and in how many run at
+# once per worker; callbacks over the limit get a 503 instead of a thread.
+OAUTH_HTTP_TIMEOUT: float = float(os.getenv("OAUTH_HTTP_TIMEOUT", "10"))
+OAUTH_MAX_INFLIGHT: int = int(os.getenv("OAUTH_MAX_INFLIGHT", "4"))
 
 CORS_ORIGINS: str = os.getenv("CORS_ORIGINS", "http://localhost:8080")
 
@@ -1,23 +1,15 @@
 from __future__ import annotations
 
-import logging
-
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
-log = logging.getLogger(__name__)
+from .utils.cache import ExerciseTypeCache, ResponseCache
+from .utils.passwords import PasswordHasher
 
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
-
-oauth = None
-try:
-    from authlib.integrations.flask_client import OAuth as AuthlibOAuth  # type: ignore
-
-    oauth = AuthlibOAuth()
-    log.info("Authlib OAuth: initialized")
-except Exception as exc:
-    log.warning("Authlib OAuth not available: %r", exc)
-    oauth = None
+cache = ResponseCache()
+exercise_type_cache = ExerciseTypeCache()
+password_hasher = PasswordHasher()
@@ -0,0 +1,81 @@
+"""Gunicorn settings, sized from the CPUs this container may use.
+
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+
+GUNICORN_WORKER_CLASS picks the mode:
+
+* ``gthread`` (default): ``WEB_CONCURRENCY`` processes x ``GUNICORN_THREADS``
+  threads. A request waiting on Google or a slow aggregate holds one thread,
+  not a whole worker, and needs no extra dependency.
+* ``gevent``: one greenlet per request, up to ``GUNICORN_WORKER_CONNECTIONS``
+  per worker (``pip install gevent``). The stdlib is patched here, before the
+  app is preloaded, so every lock and socket the app creates is cooperative.
+  A Postgres driver also needs its own green support (e.g. psycogreen).
+* ``sync``: the old one-request-per-process model.
+
+Flask-SQLAlchemy scopes sessions to the app context, so each thread or
+greenlet gets its own. The pool defaults are raised to match the threads so a
+full worker never waits on a connection.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+
+
+def _cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - not on Linux
+        return os.cpu_count() or 1
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+if worker_class == "gevent":
+    try:
+        from gevent import monkey
+
+        monkey.patch_all()
+    except ImportError:
+        logging.getLogger("gunicorn.error").warning(
+            "gevent is not installed; falling back to gthread workers"
+        )
+        worker_class = "gthread"
+
+cpus = _cpus()
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+
+if worker_class == "sync":
+    workers = _int("WEB_CONCURRENCY", 2 * cpus + 1)
+    threads = 1
+else:
+    # Threads and greenlets cover the waiting; processes only need to cover the CPUs.
+    workers = _int("WEB_CONCURRENCY", cpus + 1)
+    threads = _int("GUNICORN_THREADS", 8) if worker_class == "gthread" else 1
+    worker_connections = _int("GUNICORN_WORKER_CONNECTIONS", 200)
+
+per_worker = threads if worker_class != "gevent" else worker_connections
+os.environ.setdefault("DB_POOL_SIZE", str(min(per_worker, 20)))
+os.environ.setdefault("DB_MAX_OVERFLOW", "10")
+
+# Bounded outbound OAuth calls per worker; the rest of the slots stay free for reads.
+os.environ.setdefault("OAUTH_MAX_INFLIGHT", str(max(1, min(per_worker // 2, 32))))
+
+# Build the app once in the master; backend.wsgi resets fork-unsafe state in each worker.
+preload_app = True
+
+timeout = _int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _int("GUNICORN_KEEPALIVE", 5)
+max_requests = _int("GUNICORN_MAX_REQUESTS", 0)
+max_requests_jitter = _int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
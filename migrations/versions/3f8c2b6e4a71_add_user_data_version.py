@@ -0,0 +1,27 @@
+"""add user.data_version
+
+Revision ID: 3f8c2b6e4a71
+Revises: 9e4b7a2d1c53
+Create Date: 2026-10-18 17:40:12.503871
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "3f8c2b6e4a71"
+down_revision = "9e4b7a2d1c53"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("data_version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.drop_column("data_version")
@@ -0,0 +1,50 @@
+"""add goal_progress_snapshot
+
+Revision ID: 5d2a9f3c7e08
+Revises: c41f0a8e6b17
+Create Date: 2026-10-18 13:24:05.551930
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "5d2a9f3c7e08"
+down_revision = "c41f0a8e6b17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "goal_progress_snapshot",
+        sa.Column("goal_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column("target", sa.Integer(), nullable=False),
+        sa.Column("percent", sa.Float(), nullable=False),
+        sa.Column("remaining", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("window_start", sa.DateTime(), nullable=False),
+        sa.Column("window_end", sa.DateTime(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+        sa.Column("dirty", sa.Boolean(), nullable=False),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["goal_id"],
+            ["goal.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("goal_id"),
+    )
+    with op.batch_alter_table("goal_progress_snapshot", schema=None) as batch_op:
+        batch_op.create_index("ix_goal_progress_snapshot_user_id", ["user_id"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("goal_progress_snapshot", schema=None) as batch_op:
+        batch_op.drop_index("ix_goal_progress_snapshot_user_id")
+    op.drop_table("goal_progress_snapshot")
@@ -0,0 +1,34 @@
+"""add composite indexes on workout_session
+
+Revision ID: 7b3e5c1d9a42
+Revises: 2624281cc1ff
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+
+from alembic import op
+
+revision = "7b3e5c1d9a42"
+down_revision = "2624281cc1ff"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("workout_session", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_workout_session_user_id_date",
+            ["user_id", "date"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_workout_session_user_id_exercise_type_id_date",
+            ["user_id", "exercise_type_id", "date"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("workout_session", schema=None) as batch_op:
+        batch_op.drop_index("ix_workout_session_user_id_exercise_type_id_date")
+        batch_op.drop_index("ix_workout_session_user_id_date")
@@ -0,0 +1,57 @@
+"""add user_stats and user_exercise_stats
+
+Revision ID: 9e4b7a2d1c53
+Revises: 5d2a9f3c7e08
+Create Date: 2026-10-18 15:02:41.118204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "9e4b7a2d1c53"
+down_revision = "5d2a9f3c7e08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are created lazily on a user's first session write or stats read.
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("last_active_day", sa.Date(), nullable=True),
+        sa.Column("current_streak_start", sa.Date(), nullable=True),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak_start", sa.Date(), nullable=True),
+        sa.Column("longest_streak_end", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_table(
+        "user_exercise_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exercise_type_id", sa.Integer(), nullable=False),
+        sa.Column("longest_duration", sa.Integer(), nullable=False),
+        sa.Column("longest_duration_date", sa.DateTime(), nullable=True),
+        sa.Column("most_calories", sa.Integer(), nullable=False),
+        sa.Column("most_calories_date", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["exercise_type_id"],
+            ["exercise_type.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "exercise_type_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("user_exercise_stats")
+    op.drop_table("user_stats")
@@ -0,0 +1,36 @@
+"""widen user.password_hash for scrypt hashes
+
+Revision ID: a6d1e9c4f257
+Revises: 3f8c2b6e4a71
+Create Date: 2026-10-18 19:12:33.204917
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a6d1e9c4f257"
+down_revision = "3f8c2b6e4a71"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Werkzeug's scrypt hashes are ~162 characters.
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.alter_column(
+            "password_hash",
+            existing_type=sa.String(length=128),
+            type_=sa.String(length=255),
+            existing_nullable=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.alter_column(
+            "password_hash",
+            existing_type=sa.String(length=255),
+            type_=sa.String(length=128),
+            existing_nullable=False,
+        )
@@ -0,0 +1,56 @@
+"""add daily_activity_rollup
+
+Revision ID: c41f0a8e6b17
+Revises: 7b3e5c1d9a42
+Create Date: 2026-10-18 11:02:47.918233
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "c41f0a8e6b17"
+down_revision = "7b3e5c1d9a42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "daily_activity_rollup",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exercise_type_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("duration_sum", sa.Integer(), nullable=False),
+        sa.Column("calories_sum", sa.Integer(), nullable=False),
+        sa.Column("session_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["exercise_type_id"],
+            ["exercise_type.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "exercise_type_id", "day"),
+    )
+    with op.batch_alter_table("daily_activity_rollup", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_daily_activity_rollup_user_id_day",
+            ["user_id", "day"],
+            unique=False,
+        )
+
+    op.execute(
+        "INSERT INTO daily_activity_rollup "
+        "(user_id, exercise_type_id, day, duration_sum, calories_sum, session_count) "
+        "SELECT user_id, exercise_type_id, date(date), SUM(duration), SUM(calories), COUNT(id) "
+        "FROM workout_session WHERE date IS NOT NULL "
+        "GROUP BY user_id, exercise_type_id, date(date)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("daily_activity_rollup", schema=None) as batch_op:
+        batch_op.drop_index("ix_daily_activity_rollup_user_id_day")
+    op.drop_table("daily_activity_rollup")
@@ -0,0 +1,29 @@
+"""add user.timezone
+
+Revision ID: d83f1a5c2b96
+Revises: a6d1e9c4f257
+Create Date: 2026-10-18 19:48:05.631290
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "d83f1a5c2b96"
+down_revision = "a6d1e9c4f257"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Stored dates are already naive UTC (aware inputs were converted before
+    # the driver dropped the offset), so only the new column is needed.
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("timezone", sa.String(length=64), nullable=False, server_default="UTC")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.drop_column("timezone")
@@ -0,0 +1,83 @@
+"""add challenge, challenge_member and challenge_score
+
+Revision ID: f2b7c9d4e618
+Revises: d83f1a5c2b96
+Create Date: 2026-10-18 20:26:14.870352
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "f2b7c9d4e618"
+down_revision = "d83f1a5c2b96"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "challenge",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=120), nullable=False),
+        sa.Column("metric", sa.String(length=20), nullable=False),
+        sa.Column("period", sa.String(length=20), nullable=False),
+        sa.Column("exercise_name", sa.String(length=50), nullable=True),
+        sa.Column("timezone", sa.String(length=64), nullable=False, server_default="UTC"),
+        sa.Column("join_code", sa.String(length=32), nullable=False),
+        sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("join_code"),
+    )
+    op.create_table(
+        "challenge_member",
+        sa.Column("challenge_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("joined_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["challenge_id"],
+            ["challenge.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("challenge_id", "user_id"),
+    )
+    op.create_index("ix_challenge_member_user_id", "challenge_member", ["user_id"])
+    # Scores are built per window on first read and then kept current by session writes.
+    op.create_table(
+        "challenge_score",
+        sa.Column("challenge_id", sa.Integer(), nullable=False),
+        sa.Column("window_start", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["challenge_id"],
+            ["challenge.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("challenge_id", "window_start", "user_id"),
+    )
+    op.create_index(
+        "ix_challenge_score_rank",
+        "challenge_score",
+        ["challenge_id", "window_start", "value", "user_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_challenge_score_rank", table_name="challenge_score")
+    op.drop_table("challenge_score")
+    op.drop_index("ix_challenge_member_user_id", table_name="challenge_member")
+    op.drop_table("challenge_member")
+    op.drop_table("challenge")
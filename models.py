@@ -1,10 +1,10 @@
 import secrets
-from datetime import datetime
 
 from flask_jwt_extended import create_access_token
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from .extensions import db
+from .utils.dates import UTC, now_utc_naive
 
 
 class User(db.Model):
@@ -13,13 +13,19 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
 
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
 
     provider = db.Column(db.String(20), nullable=True, index=True)
     provider_sub = db.Column(db.String(255), unique=True, nullable=True)
     name = db.Column(db.String(120), nullable=True)
     avatar_url = db.Column(db.String(255), nullable=True)
 
+    # Bumped by every session/goal/exercise-type write; feeds conditional GETs.
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    # IANA zone; goal and report windows follow the user's local calendar.
+    timezone = db.Column(db.String(64), nullable=False, default=UTC, server_default=UTC)
+
     sessions = db.relationship("WorkoutSession", backref="user", lazy=True)
     goals = db.relationship("Goal", backref="user", lazy=True)
     types = db.relationship("ExerciseType", backref="user", lazy=True)
@@ -62,7 +68,17 @@ class WorkoutSession(db.Model):
     exercise_type_id = db.Column(db.Integer, db.ForeignKey("exercise_type.id"), nullable=False)
     duration = db.Column(db.Integer, nullable=False)
     calories = db.Column(db.Integer, nullable=False)
-    date = db.Column(db.DateTime, default=datetime.utcnow)
+    date = db.Column(db.DateTime, default=now_utc_naive)
+
+    __table_args__ = (
+        db.Index("ix_workout_session_user_id_date", "user_id", "date"),
+        db.Index(
+            "ix_workout_session_user_id_exercise_type_id_date",
+            "user_id",
+            "exercise_type_id",
+            "date",
+        ),
+    )
 
 
 class Goal(db.Model):
@@ -79,3 +95,109 @@ class Goal(db.Model):
     start_date = db.Column(db.DateTime, nullable=True)
     end_date = db.Column(db.DateTime, nullable=True)
     exercise_type_id = db.Column(db.Integer, db.ForeignKey("exercise_type.id"), nullable=True)
+
+
+class DailyActivityRollup(db.Model):
+    __tablename__ = "daily_activity_rollup"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    exercise_type_id = db.Column(db.Integer, db.ForeignKey("exercise_type.id"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+
+    duration_sum = db.Column(db.Integer, nullable=False, default=0)
+    calories_sum = db.Column(db.Integer, nullable=False, default=0)
+    session_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.Index("ix_daily_activity_rollup_user_id_day", "user_id", "day"),)
+
+
+class GoalProgressSnapshot(db.Model):
+    __tablename__ = "goal_progress_snapshot"
+
+    goal_id = db.Column(db.Integer, db.ForeignKey("goal.id"), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+
+    value = db.Column(db.Integer, nullable=False, default=0)
+    target = db.Column(db.Integer, nullable=False, default=0)
+    percent = db.Column(db.Float, nullable=False, default=0.0)
+    remaining = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False)
+    window_start = db.Column(db.DateTime, nullable=False)
+    window_end = db.Column(db.DateTime, nullable=False)
+
+    computed_at = db.Column(db.DateTime, nullable=False)
+    dirty = db.Column(db.Boolean, nullable=False, default=False)
+    revision = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.Index("ix_goal_progress_snapshot_user_id", "user_id"),)
+
+
+class UserStats(db.Model):
+    __tablename__ = "user_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+
+    last_active_day = db.Column(db.Date, nullable=True)
+    current_streak_start = db.Column(db.Date, nullable=True)
+    longest_streak = db.Column(db.Integer, nullable=False, default=0)
+    longest_streak_start = db.Column(db.Date, nullable=True)
+    longest_streak_end = db.Column(db.Date, nullable=True)
+
+    updated_at = db.Column(db.DateTime, nullable=False, default=now_utc_naive)
+
+
+class UserExerciseStats(db.Model):
+    __tablename__ = "user_exercise_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    exercise_type_id = db.Column(
+        db.Integer, db.ForeignKey("exercise_type.id"), primary_key=True
+    )
+
+    longest_duration = db.Column(db.Integer, nullable=False, default=0)
+    longest_duration_date = db.Column(db.DateTime, nullable=True)
+    most_calories = db.Column(db.Integer, nullable=False, default=0)
+    most_calories_date = db.Column(db.DateTime, nullable=True)
+
+
+class Challenge(db.Model):
+    __tablename__ = "challenge"
+
+    id = db.Column(db.Integer, primary_key=True)
+    owner_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    name = db.Column(db.String(120), nullable=False)
+
+    metric = db.Column(db.String(20), nullable=False, default="duration")
+    period = db.Column(db.String(20), nullable=False)
+    # Exercise types are per user, so a challenge narrows by type name.
+    exercise_name = db.Column(db.String(50), nullable=True)
+    timezone = db.Column(db.String(64), nullable=False, default=UTC, server_default=UTC)
+
+    join_code = db.Column(db.String(32), unique=True, nullable=False)
+    member_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    created_at = db.Column(db.DateTime, nullable=False, default=now_utc_naive)
+
+
+class ChallengeMember(db.Model):
+    __tablename__ = "challenge_member"
+
+    challenge_id = db.Column(db.Integer, db.ForeignKey("challenge.id"), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    joined_at = db.Column(db.DateTime, nullable=False, default=now_utc_naive)
+
+    __table_args__ = (db.Index("ix_challenge_member_user_id", "user_id"),)
+
+
+class ChallengeScore(db.Model):
+    """Materialized leaderboard: one row per member for every window read so far."""
+
+    __tablename__ = "challenge_score"
+
+    challenge_id = db.Column(db.Integer, db.ForeignKey("challenge.id"), primary_key=True)
+    window_start = db.Column(db.DateTime, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ix_challenge_score_rank", "challenge_id", "window_start", "value", "user_id"),
+    )
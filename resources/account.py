@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_restful import Resource, abort
+
+from ..extensions import cache, db
+from ..models import User
+from ..utils import etag, snapshots
+from ..utils.dates import is_valid_timezone
+from ..utils.schema import Arg, Schema
+
+
+def _timezone(v):
+    name = str(v or "").strip()
+    if not is_valid_timezone(name):
+        abort(400, message="timezone must be an IANA zone name, e.g. Europe/Warsaw")
+    return name
+
+
+settings_parser = Schema(
+    Arg("timezone", type=_timezone, required=True),
+)
+
+
+def _settings(user: User) -> dict:
+    return {"email": user.email, "timezone": user.timezone}
+
+
+class AccountSettings(Resource):
+    @jwt_required()
+    def get(self):
+        user = db.session.get(User, int(get_jwt_identity()))
+        if user is None:
+            abort(404, message="User not found")
+        return _settings(user), 200
+
+    @jwt_required()
+    def patch(self):
+        user_id = int(get_jwt_identity())
+        user = db.session.get(User, user_id)
+        if user is None:
+            abort(404, message="User not found")
+        args = settings_parser.parse()
+
+        if args["timezone"] != user.timezone:
+            user.timezone = args["timezone"]
+            # Every period window and "today" moves with the zone.
+            snapshots.mark_user_dirty(user_id)
+            etag.bump(user_id)
+            db.session.commit()
+            cache.invalidate(user_id)
+
+        return _settings(user), 200
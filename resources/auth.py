@@ -1,8 +1,15 @@
 from flask import request
 from flask_restful import Resource
 
-from ..extensions import db
+from ..extensions import db, password_hasher
 from ..models import User
+from ..utils.dates import UTC, is_valid_timezone
+from ..utils.passwords import HasherBusy
+
+
+def _busy():
+    message = "Too many authentication requests, retry shortly"
+    return {"message": message}, 429, {"Retry-After": "1"}
 
 
 class Register(Resource):
@@ -10,8 +17,14 @@ class Register(Resource):
         data = request.get_json()
         if User.query.filter_by(email=data.get("email")).first():
             return {"message": "Email already registered"}, 400
-        user = User(email=data["email"])
-        user.set_password(data["password"])
+        tz = data.get("timezone") or UTC
+        if not is_valid_timezone(tz):
+            return {"message": "timezone must be an IANA zone name, e.g. Europe/Warsaw"}, 400
+        try:
+            pwhash = password_hasher.hash(data["password"])
+        except HasherBusy:
+            return _busy()
+        user = User(email=data["email"], password_hash=pwhash, timezone=tz)
         db.session.add(user)
         db.session.commit()
         return {"message": "User registered"}, 201
@@ -20,8 +33,23 @@ class Register(Resource):
 class Login(Resource):
     def post(self):
         data = request.get_json()
+        password = data.get("password")
         user = User.query.filter_by(email=data.get("email")).first()
-        if user and user.check_password(data.get("password")):
-            token = user.create_token()
-            return {"access_token": token}, 200
-        return {"message": "Invalid credentials"}, 401
+        if user is None or not password:
+            return {"message": "Invalid credentials"}, 401
+        try:
+            ok = password_hasher.verify(user.password_hash, password)
+        except HasherBusy:
+            return _busy()
+        if not ok:
+            return {"message": "Invalid credentials"}, 401
+
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = password_hasher.hash(password)
+                db.session.commit()
+            except HasherBusy:
+                pass  # keep the old hash; upgrade on a quieter login
+
+        token = user.create_token()
+        return {"access_token": token}, 200
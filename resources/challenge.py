@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import secrets
+
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_restful import Resource, abort
+from sqlalchemy import delete, select, update
+
+from ..extensions import db
+from ..models import Challenge, ChallengeMember
+from ..utils import leaderboards
+from ..utils.dates import PERIODS, is_valid_timezone
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.progress import user_timezone
+from ..utils.schema import Arg, Schema
+
+MAX_WINDOWS_BACK = 52
+
+
+def _name(v):
+    name = str(v or "").strip()
+    if not name or len(name) > 120:
+        abort(400, message="name must be 1-120 characters")
+    return name
+
+
+create_parser = Schema(
+    Arg("name", type=_name, required=True),
+    Arg("metric", type=str, required=True),
+    Arg("period", type=str, required=True),
+    Arg("exercise_name", type=str),
+    Arg("timezone", type=str),
+)
+
+join_parser = Schema(
+    Arg("code", type=str, required=True),
+)
+
+leaderboard_parser = Schema(
+    Arg("page_size", type=int, default=25),
+    Arg("cursor", type=str),
+    Arg("ago", type=int, default=0),
+    location="args",
+)
+
+
+def _challenge_item(c: Challenge, user_id: int) -> dict:
+    return {
+        "id": c.id,
+        "name": c.name,
+        "metric": c.metric,
+        "period": c.period,
+        "exercise_name": c.exercise_name,
+        "timezone": c.timezone,
+        "member_count": c.member_count,
+        "is_owner": c.owner_id == user_id,
+        "join_code": c.join_code,
+    }
+
+
+def _member_challenge_or_404(challenge_id: int, user_id: int) -> Challenge:
+    c = db.session.execute(
+        select(Challenge)
+        .join(ChallengeMember, ChallengeMember.challenge_id == Challenge.id)
+        .where(Challenge.id == challenge_id, ChallengeMember.user_id == user_id)
+    ).scalar()
+    if c is None:
+        abort(404, message="Challenge not found")
+    return c
+
+
+def _add_member(c: Challenge, user_id: int) -> None:
+    # First, so its user-then-challenge locks come before the member_count update.
+    leaderboards.add_member(c, user_id)
+    db.session.add(ChallengeMember(challenge_id=c.id, user_id=user_id))
+    db.session.execute(
+        update(Challenge)
+        .where(Challenge.id == c.id)
+        .values(member_count=Challenge.member_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class ChallengeList(Resource):
+    @jwt_required()
+    def get(self):
+        user_id = int(get_jwt_identity())
+        rows = db.session.execute(
+            select(Challenge)
+            .join(ChallengeMember, ChallengeMember.challenge_id == Challenge.id)
+            .where(ChallengeMember.user_id == user_id)
+            .order_by(Challenge.id.desc())
+        ).scalars()
+        return {"items": [_challenge_item(c, user_id) for c in rows]}, 200
+
+    @jwt_required()
+    def post(self):
+        user_id = int(get_jwt_identity())
+        args = create_parser.parse()
+
+        metric = (args["metric"] or "").lower()
+        if metric not in leaderboards.METRICS:
+            abort(400, message="metric must be one of: duration, calories, sessions")
+        period = (args["period"] or "").lower()
+        if period not in PERIODS:
+            abort(400, message="period must be one of: weekly, monthly, yearly")
+        tz = args.get("timezone") or user_timezone(user_id)
+        if not is_valid_timezone(tz):
+            abort(400, message="timezone must be an IANA zone name, e.g. Europe/Warsaw")
+
+        c = Challenge(
+            owner_id=user_id,
+            name=args["name"],
+            metric=metric,
+            period=period,
+            exercise_name=(args.get("exercise_name") or "").strip() or None,
+            timezone=tz,
+            join_code=secrets.token_urlsafe(9),
+        )
+        db.session.add(c)
+        db.session.flush()
+        _add_member(c, user_id)
+        db.session.commit()
+        db.session.refresh(c)
+        return _challenge_item(c, user_id), 201
+
+
+class ChallengeDetail(Resource):
+    @jwt_required()
+    def get(self, challenge_id: int):
+        user_id = int(get_jwt_identity())
+        return _challenge_item(_member_challenge_or_404(challenge_id, user_id), user_id), 200
+
+    @jwt_required()
+    def delete(self, challenge_id: int):
+        user_id = int(get_jwt_identity())
+        c = _member_challenge_or_404(challenge_id, user_id)
+        if c.owner_id != user_id:
+            abort(403, message="Only the owner can delete a challenge")
+        leaderboards.reset(c.id)
+        db.session.execute(delete(ChallengeMember).where(ChallengeMember.challenge_id == c.id))
+        db.session.delete(c)
+        db.session.commit()
+        return "", 204
+
+
+class ChallengeJoin(Resource):
+    @jwt_required()
+    def post(self):
+        user_id = int(get_jwt_identity())
+        code = join_parser.parse()["code"]
+        c = db.session.execute(select(Challenge).where(Challenge.join_code == code)).scalar()
+        if c is None:
+            abort(404, message="Challenge not found")
+        if db.session.get(ChallengeMember, (c.id, user_id)) is None:
+            _add_member(c, user_id)
+            db.session.commit()
+            db.session.refresh(c)
+        return _challenge_item(c, user_id), 200
+
+
+class ChallengeMembership(Resource):
+    @jwt_required()
+    def delete(self, challenge_id: int):
+        user_id = int(get_jwt_identity())
+        c = _member_challenge_or_404(challenge_id, user_id)
+        db.session.execute(
+            delete(ChallengeMember).where(
+                ChallengeMember.challenge_id == c.id, ChallengeMember.user_id == user_id
+            )
+        )
+        db.session.execute(
+            update(Challenge)
+            .where(Challenge.id == c.id)
+            .values(member_count=Challenge.member_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+        leaderboards.reset(c.id, user_id)
+        db.session.commit()
+        return "", 204
+
+
+class ChallengeLeaderboard(Resource):
+    @jwt_required()
+    def get(self, challenge_id: int):
+        user_id = int(get_jwt_identity())
+        args = leaderboard_parser.parse()
+        page_size = min(max(1, args["page_size"] or 25), 100)
+        ago = args["ago"] or 0
+        if not 0 <= ago <= MAX_WINDOWS_BACK:
+            abort(400, message=f"ago must be between 0 and {MAX_WINDOWS_BACK}")
+        after = None
+        if args.get("cursor"):
+            c_value, c_user = decode_cursor(args["cursor"], 2)
+            try:
+                after = (int(c_value), int(c_user))
+            except (TypeError, ValueError):
+                abort(400, message="Invalid cursor")
+
+        c = _member_challenge_or_404(challenge_id, user_id)
+        win = leaderboards.window_of(c, ago)
+        leaderboards.ensure_window(c, win)
+        db.session.commit()
+
+        items = leaderboards.page(c, win, limit=page_size, after=after)
+        next_cursor = None
+        if len(items) == page_size:
+            last = items[-1]
+            next_cursor = encode_cursor(last["value"], last["user_id"])
+
+        return {
+            "challenge_id": c.id,
+            "metric": c.metric,
+            "window": win.as_iso(),
+            "member_count": c.member_count,
+            "items": items,
+            "me": leaderboards.standing(c, win, user_id),
+            "next_cursor": next_cursor,
+        }, 200
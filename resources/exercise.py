@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from flask import abort
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restful import Resource, reqparse
+from flask_restful import Resource
 
 from ..extensions import db
 from ..models import ExerciseType
+from ..utils import etag, exercise_types, leaderboards
+from ..utils.schema import Arg, Schema
 
-_parser = reqparse.RequestParser()
-_parser.add_argument("name", required=True, help="name is required")
+_parser = Schema(
+    Arg("name", required=True, help="name is required"),
+)
 
 
 def _get_owned_or_404(type_id: int, owner_id: int) -> ExerciseType:
@@ -28,7 +31,7 @@ class ExerciseTypeList(Resource):
     @jwt_required()
     def post(self):
         uid = int(get_jwt_identity())
-        args = _parser.parse_args()
+        args = _parser.parse()
 
         exists = ExerciseType.query.filter_by(user_id=uid, name=args["name"]).first()
         if exists:
@@ -36,7 +39,9 @@ class ExerciseTypeList(Resource):
 
         typ = ExerciseType(user_id=uid, name=args["name"])
         db.session.add(typ)
+        etag.bump(uid)
         db.session.commit()
+        exercise_types.invalidate(uid)
         return {"id": typ.id, "name": typ.name}, 201
 
 
@@ -44,11 +49,14 @@ class ExerciseTypeDetail(Resource):
     @jwt_required()
     def put(self, type_id: int):
         uid = int(get_jwt_identity())
-        args = _parser.parse_args()
+        args = _parser.parse()
         typ = _get_owned_or_404(type_id, uid)
 
         typ.name = args["name"]
+        leaderboards.reset_named(uid)
+        etag.bump(uid)
         db.session.commit()
+        exercise_types.invalidate(uid)
         return {"id": typ.id, "name": typ.name}, 200
 
     @jwt_required()
@@ -57,5 +65,7 @@ class ExerciseTypeDetail(Resource):
         typ = _get_owned_or_404(type_id, uid)
 
         db.session.delete(typ)
+        etag.bump(uid)
         db.session.commit()
+        exercise_types.invalidate(uid)
         return {"message": "deleted"}, 204
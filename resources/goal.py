@@ -1,12 +1,15 @@
-from datetime import datetime
-
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restful import Resource, abort, reqparse
+from flask_restful import Resource, abort
 from sqlalchemy import or_
 
-from ..extensions import db
+from ..extensions import cache, db
 from ..models import ExerciseType, Goal
-from ..utils.progress import compute_goal_progress
+from ..utils import etag, snapshots
+from ..utils.dates import parse_local
+from ..utils.exercise_types import owned_name_or_404, type_fk_guard, type_names
+from ..utils.pagination import decode_cursor, encode_cursor, truthy
+from ..utils.progress import user_timezone
+from ..utils.schema import Arg, Schema
 
 
 def _positive_int(v):
@@ -19,13 +22,12 @@ def _positive_int(v):
     return i
 
 
-def _parse_iso(d: str):
+def _parse_iso(d: str, tz: str):
+    """Naive UTC; like session dates, input without an offset is the owner's local time."""
     if not d:
         return None
     try:
-        if len(d) == 10:
-            return datetime.fromisoformat(d + "T00:00:00")
-        return datetime.fromisoformat(d)
+        return parse_local(d, tz)
     except Exception:
         abort(
             400,
@@ -33,122 +35,54 @@ def _parse_iso(d: str):
         )
 
 
-create_parser = reqparse.RequestParser()
-create_parser.add_argument(
-    "description",
-    type=str,
-    required=True,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "target_value",
-    type=_positive_int,
-    required=True,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "period",
-    type=str,
-    required=True,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "metric",
-    type=str,
-    required=True,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "exercise_type_id",
-    type=int,
-    required=False,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "start_date",
-    type=str,
-    required=False,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "end_date",
-    type=str,
-    required=False,
-    location=("json", "form"),
+create_parser = Schema(
+    Arg("description", type=str, required=True),
+    Arg("target_value", type=_positive_int, required=True),
+    Arg("period", type=str, required=True),
+    Arg("metric", type=str, required=True),
+    Arg("exercise_type_id", type=int),
+    Arg("start_date", type=str),
+    Arg("end_date", type=str),
 )
 
-list_parser = reqparse.RequestParser()
-list_parser.add_argument("page", type=int, default=1, location="args")
-list_parser.add_argument("page_size", type=int, default=10, location="args")
-list_parser.add_argument("metric", type=str, location="args")
-list_parser.add_argument("period", type=str, location="args")
-list_parser.add_argument("exercise_type_id", type=int, location="args")
-list_parser.add_argument("from", type=str, dest="date_from", location="args")
-list_parser.add_argument("to", type=str, dest="date_to", location="args")
-list_parser.add_argument("with_progress", type=str, location="args")
-
-
-update_parser = reqparse.RequestParser()
-update_parser.add_argument(
-    "description",
-    type=str,
-    required=False,
-    location=("json", "form"),
-)
-update_parser.add_argument(
-    "target_value",
-    type=_positive_int,
-    required=False,
-    location=("json", "form"),
-)
-update_parser.add_argument(
-    "period",
-    type=str,
-    required=False,
-    location=("json", "form"),
-)
-update_parser.add_argument(
-    "metric",
-    type=str,
-    required=False,
-    location=("json", "form"),
-)
-update_parser.add_argument(
-    "exercise_type_id",
-    type=int,
-    required=False,
-    location=("json", "form"),
-)
-update_parser.add_argument(
-    "start_date",
-    type=str,
-    required=False,
-    location=("json", "form"),
-)
-update_parser.add_argument(
-    "end_date",
-    type=str,
-    required=False,
-    location=("json", "form"),
+list_parser = Schema(
+    Arg("page", type=int, default=1),
+    Arg("page_size", type=int, default=10),
+    Arg("metric", type=str),
+    Arg("period", type=str),
+    Arg("exercise_type_id", type=int),
+    Arg("from", type=str, dest="date_from"),
+    Arg("to", type=str, dest="date_to"),
+    Arg("with_progress", type=str),
+    Arg("cursor", type=str),
+    Arg("include_total", type=str),
+    location="args",
 )
 
 
-def _etype_owned_or_404(type_id: int, owner_id: int):
-    et = ExerciseType.query.filter_by(id=type_id, user_id=owner_id).first()
-    if et is None:
-        abort(404, message="Exercise type not found")
-    return et
+update_parser = Schema(
+    Arg("description", type=str),
+    Arg("target_value", type=_positive_int),
+    Arg("period", type=str),
+    Arg("metric", type=str),
+    Arg("exercise_type_id", type=int),
+    Arg("start_date", type=str),
+    Arg("end_date", type=str),
+)
 
 
 class GoalList(Resource):
     @jwt_required()
+    @etag.conditional_get(daily=True)
     def get(self):
         user_id = int(get_jwt_identity())
-        args = list_parser.parse_args()
+        args = list_parser.parse()
         page = max(1, args["page"] or 1)
         page_size = min(max(1, args["page_size"] or 10), 100)
 
-        want_progress = str(args.get("with_progress") or "").lower() in {"1", "true", "yes"}
+        want_progress = truthy(args.get("with_progress"))
+        include_total = args.get("include_total") is None or truthy(args["include_total"])
+        use_cursor = args.get("cursor") is not None
 
         q_obj = (
             db.session.query(Goal, ExerciseType.name.label("etype_name"))
@@ -171,8 +105,9 @@ class GoalList(Resource):
 
         df = args.get("date_from")
         dt = args.get("date_to")
-        start_f = _parse_iso(df) if df else None
-        end_t = _parse_iso(dt) if dt else None
+        tz = user_timezone(user_id) if df or dt else None
+        start_f = _parse_iso(df, tz) if df else None
+        end_t = _parse_iso(dt, tz) if dt else None
         if start_f or end_t:
             if start_f and end_t:
                 q_obj = q_obj.filter(
@@ -190,9 +125,25 @@ class GoalList(Resource):
                     or_(Goal.start_date == None, Goal.start_date <= end_t)  # noqa: E711
                 )
 
-        total = q_obj.count()
-
-        rows = q_obj.order_by(Goal.id.desc()).limit(page_size).offset((page - 1) * page_size).all()
+        total = q_obj.count() if include_total else None
+
+        next_cursor = None
+        if use_cursor:
+            if args["cursor"]:
+                (c_id,) = decode_cursor(args["cursor"], 1)
+                if not isinstance(c_id, int):
+                    abort(400, message="Invalid cursor")
+                q_obj = q_obj.filter(Goal.id < c_id)
+            rows = q_obj.order_by(Goal.id.desc()).limit(page_size + 1).all()
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = encode_cursor(rows[-1][0].id)
+        else:
+            rows = (
+                q_obj.order_by(Goal.id.desc()).limit(page_size).offset((page - 1) * page_size).all()
+            )
+
+        progress = snapshots.progress_for_goals(g for g, _ in rows) if want_progress else {}
 
         items = []
         for g, etype_name in rows:
@@ -208,10 +159,17 @@ class GoalList(Resource):
                 "exercise_type": etype_name,
             }
             if want_progress:
-                pr = compute_goal_progress(g).as_dict()
-                it["progress"] = pr
+                it["progress"] = progress[g.id]
             items.append(it)
 
+        if use_cursor:
+            return {
+                "items": items,
+                "total": total,
+                "next_cursor": next_cursor,
+                "page_size": page_size,
+            }, 200
+
         return {
             "items": items,
             "total": total,
@@ -222,7 +180,7 @@ class GoalList(Resource):
     @jwt_required()
     def post(self):
         user_id = int(get_jwt_identity())
-        args = create_parser.parse_args()
+        args = create_parser.parse()
 
         period = (args["period"] or "").lower()
         if period not in {"weekly", "monthly", "yearly"}:
@@ -232,14 +190,15 @@ class GoalList(Resource):
         if metric not in {"duration", "calories", "sessions"}:
             abort(400, message="metric must be one of: duration, calories, sessions")
 
-        start_dt = _parse_iso(args.get("start_date")) if args.get("start_date") else None
-        end_dt = _parse_iso(args.get("end_date")) if args.get("end_date") else None
+        tz = user_timezone(user_id) if args.get("start_date") or args.get("end_date") else None
+        start_dt = _parse_iso(args.get("start_date"), tz) if args.get("start_date") else None
+        end_dt = _parse_iso(args.get("end_date"), tz) if args.get("end_date") else None
         if start_dt and end_dt and start_dt > end_dt:
             abort(400, message="start_date must be <= end_date")
 
         etype_id = args.get("exercise_type_id")
         if etype_id is not None:
-            _etype_owned_or_404(etype_id, user_id)
+            owned_name_or_404(etype_id, user_id)
 
         goal = Goal(
             user_id=user_id,
@@ -251,8 +210,11 @@ class GoalList(Resource):
             end_date=end_dt,
             exercise_type_id=etype_id,
         )
-        db.session.add(goal)
-        db.session.commit()
+        with type_fk_guard(etype_id, user_id):
+            db.session.add(goal)
+            etag.bump(user_id)
+            db.session.commit()
+        cache.invalidate(user_id)
 
         return {"id": goal.id}, 201
 
@@ -265,7 +227,7 @@ class GoalDetail(Resource):
         if not g:
             abort(404, message="Goal not found")
 
-        args = update_parser.parse_args()
+        args = update_parser.parse()
 
         if args.get("period") is not None:
             period = (args["period"] or "").lower()
@@ -288,29 +250,31 @@ class GoalDetail(Resource):
         if args.get("exercise_type_id") is not None:
             etid = args.get("exercise_type_id")
             if etid is not None:
-                _etype_owned_or_404(etid, user_id)
+                owned_name_or_404(etid, user_id)
             g.exercise_type_id = etid
 
         new_start = g.start_date
         new_end = g.end_date
-        if args.get("start_date") is not None:
-            new_start = _parse_iso(args.get("start_date"))
-        if args.get("end_date") is not None:
-            new_end = _parse_iso(args.get("end_date"))
+        if args.get("start_date") is not None or args.get("end_date") is not None:
+            tz = user_timezone(user_id)
+            if args.get("start_date") is not None:
+                new_start = _parse_iso(args.get("start_date"), tz)
+            if args.get("end_date") is not None:
+                new_end = _parse_iso(args.get("end_date"), tz)
         if new_start and new_end and new_start > new_end:
             abort(400, message="start_date must be <= end_date")
         g.start_date = new_start
         g.end_date = new_end
 
-        db.session.commit()
+        with type_fk_guard(args.get("exercise_type_id"), user_id):
+            snapshots.mark_goal_dirty(g.id)
+            etag.bump(user_id)
+            db.session.commit()
+        cache.invalidate(user_id)
 
         et_name = None
         if g.exercise_type_id:
-            et = ExerciseType.query.filter_by(
-                id=g.exercise_type_id,
-                user_id=user_id,
-            ).first()
-            et_name = et.name if et else None
+            et_name = type_names(user_id).get(g.exercise_type_id)
 
         return {
             "id": g.id,
@@ -330,6 +294,9 @@ class GoalDetail(Resource):
         g = Goal.query.filter_by(id=goal_id, user_id=user_id).first()
         if not g:
             abort(404, message="Goal not found")
+        snapshots.drop_goal(g.id)
         db.session.delete(g)
+        etag.bump(user_id)
         db.session.commit()
+        cache.invalidate(user_id)
         return "", 204
@@ -3,8 +3,21 @@ from __future__ import annotations
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from flask_restful import Resource, abort
 
+from ..extensions import cache
 from ..models import Goal
-from ..utils.progress import compute_goal_progress
+from ..utils import etag
+from ..utils.dates import current_window
+from ..utils.progress import goal_history, user_timezone
+from ..utils.schema import Arg, Schema
+from ..utils.snapshots import progress_for_goals
+
+DEFAULT_HISTORY_PERIODS = 8
+MAX_HISTORY_PERIODS = 104
+
+history_parser = Schema(
+    Arg("periods", type=int, default=DEFAULT_HISTORY_PERIODS),
+    location="args",
+)
 
 
 class GoalProgress(Resource):
@@ -15,5 +28,51 @@ class GoalProgress(Resource):
         if not goal:
             abort(404, message="Goal not found")
 
-        pr = compute_goal_progress(goal)
-        return {"goal_id": goal.id, "progress": pr.as_dict()}, 200
+        pr = progress_for_goals([goal])[goal.id]
+        return {"goal_id": goal.id, "progress": pr}, 200
+
+
+def _history_payload(goal: Goal, periods: int, tz: str) -> dict:
+    return {
+        "goal_id": goal.id,
+        "period": goal.period,
+        "metric": goal.metric,
+        "timezone": tz,
+        "history": [pr.as_dict() for pr in goal_history(goal, periods, tz=tz)],
+    }
+
+
+class GoalHistory(Resource):
+    @jwt_required()
+    @etag.conditional_get(daily=True)
+    def get(self, goal_id: int):
+        user_id = int(get_jwt_identity())
+        periods = history_parser.parse()["periods"]
+        if not 1 <= periods <= MAX_HISTORY_PERIODS:
+            abort(400, message=f"periods must be between 1 and {MAX_HISTORY_PERIODS}")
+
+        goal = Goal.query.filter_by(id=goal_id, user_id=user_id).first()
+        if not goal:
+            abort(404, message="Goal not found")
+        if goal.start_date is not None or goal.end_date is not None:
+            abort(400, message="History is only available for recurring goals without dates")
+
+        tz = user_timezone(user_id)
+        window_start, _ = current_window(goal.period, tz=tz)
+        args = {
+            "id": goal.id,
+            "metric": goal.metric,
+            "target": goal.target_value,
+            "period": goal.period,
+            "exercise_type_id": goal.exercise_type_id,
+            "periods": periods,
+            "tz": tz,
+        }
+        payload = cache.get_or_set(
+            user_id,
+            "goals.history",
+            args,
+            window_start.isoformat(),
+            lambda: _history_payload(goal, periods, tz),
+        )
+        return payload, 200
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from flask import Blueprint, jsonify
 from sqlalchemy import text
 
-from ..extensions import db
+from ..extensions import cache, db
 from . import __name__ as pkg_name
 
 bp = Blueprint("health", __name__)
@@ -28,5 +28,6 @@ def health():
         "checks": {
             "database": {"ok": db_ok, "error": db_error},
         },
+        "cache": cache.stats(),
     }
     return jsonify(payload), (200 if db_ok else 503)
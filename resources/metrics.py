@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from ..extensions import cache
+from ..utils.instrumentation import metrics
+
+bp = Blueprint("metrics", __name__)
+
+metrics.describe("response_cache_hits_total", "counter", "Response cache hits.")
+metrics.describe("response_cache_misses_total", "counter", "Response cache misses.")
+
+
+def _authorized() -> bool:
+    token = current_app.config.get("METRICS_TOKEN") or ""
+    scheme, _, given = (request.headers.get("Authorization") or "").partition(" ")
+    return bool(token) and scheme.lower() == "bearer" and hmac.compare_digest(given, token)
+
+
+@bp.get("/api/metrics")
+def prometheus_metrics():
+    # Request and SQL timings describe the deployment; only the scraper may read them.
+    if not _authorized():
+        resp = jsonify({"message": "Metrics need a valid METRICS_TOKEN bearer token"})
+        resp.headers["WWW-Authenticate"] = "Bearer"
+        return resp, 401
+    stats = cache.stats()
+    body = metrics.render(
+        {
+            "response_cache_hits_total": stats["hits"],
+            "response_cache_misses_total": stats["misses"],
+        }
+    )
+    return Response(body, mimetype="text/plain; version=0.0.4")
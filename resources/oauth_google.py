@@ -1,31 +1,96 @@
 from __future__ import annotations
 
+import logging
+import secrets
+import threading
+
 from flask import Blueprint, current_app, jsonify, redirect
 
-from ..extensions import db, oauth
+from ..extensions import db, password_hasher
 from ..models import User
+from ..utils.passwords import HasherBusy
+
+log = logging.getLogger(__name__)
 
 bp = Blueprint("oauth_google", __name__)
 
+_EXT_KEY = "oauth_google_client"
+_SLOTS_KEY = "oauth_google_slots"
+_lock = threading.Lock()
+
+
+def _google():
+    """The Authlib Google client, registered on the first OAuth request.
+
+    Keeps Authlib (and requests) out of app startup. Returns None when Authlib
+    is not installed.
+    """
+    if _EXT_KEY in current_app.extensions:
+        return current_app.extensions[_EXT_KEY]
+    with _lock:
+        if _EXT_KEY not in current_app.extensions:
+            client = None
+            try:
+                from authlib.integrations.flask_client import OAuth  # type: ignore
+
+                oauth = OAuth(current_app._get_current_object())
+                client = oauth.register(
+                    name="google",
+                    client_id=current_app.config["GOOGLE_CLIENT_ID"],
+                    client_secret=current_app.config["GOOGLE_CLIENT_SECRET"],
+                    server_metadata_url=current_app.config["GOOGLE_METADATA_URL"],
+                    client_kwargs={
+                        "scope": "openid email profile",
+                        "prompt": "consent",
+                        "default_timeout": current_app.config["OAUTH_HTTP_TIMEOUT"],
+                    },
+                )
+            except Exception as exc:
+                log.warning("Authlib OAuth not available: %r", exc)
+            current_app.extensions[_EXT_KEY] = client
+    return current_app.extensions[_EXT_KEY]
+
+
+def _slots() -> threading.BoundedSemaphore:
+    slots = current_app.extensions.get(_SLOTS_KEY)
+    if slots is None:
+        with _lock:
+            slots = current_app.extensions.setdefault(
+                _SLOTS_KEY,
+                threading.BoundedSemaphore(max(1, int(current_app.config["OAUTH_MAX_INFLIGHT"]))),
+            )
+    return slots
+
 
 @bp.get("/api/auth/google/login")
 def google_login():
-    if oauth is None or not hasattr(oauth, "google"):
+    google = _google()
+    if google is None:
         return jsonify({"message": "OAuth not configured"}), 501
 
     redirect_uri = current_app.config.get(
         "GOOGLE_REDIRECT_URI", "http://localhost:5000/api/auth/google/callback"
     )
-    return oauth.google.authorize_redirect(redirect_uri)
+    return google.authorize_redirect(redirect_uri)
 
 
 @bp.get("/api/auth/google/callback")
 def google_callback():
-    if oauth is None or not hasattr(oauth, "google"):
+    google = _google()
+    if google is None:
         return jsonify({"message": "OAuth not configured"}), 501
 
-    oauth.google.authorize_access_token()
-    userinfo = oauth.google.userinfo()  # type: ignore[attr-defined]
+    # Two outbound round trips to the provider. Cap how many a worker runs at
+    # once so slow callbacks cannot occupy every thread meant for reads.
+    slots = _slots()
+    if not slots.acquire(blocking=False):
+        busy = jsonify({"message": "Too many sign-ins in progress, retry shortly"})
+        return busy, 503, {"Retry-After": "1"}
+    try:
+        google.authorize_access_token()
+        userinfo = google.userinfo()  # type: ignore[attr-defined]
+    finally:
+        slots.release()
     data = userinfo if isinstance(userinfo, dict) else getattr(userinfo, "json", lambda: {})()
 
     sub = data.get("sub")
@@ -40,8 +105,13 @@ def google_callback():
     if user is None:
         user = User.query.filter(User.email == email).first()
         if user is None:
-            user = User(email=email)
-            user.set_unusable_password()
+            try:
+                # Random, never disclosed; hashed off-thread like any other password.
+                pwhash = password_hasher.hash("!" + secrets.token_urlsafe(32))
+            except HasherBusy:
+                busy = jsonify({"message": "Too many sign-ins in progress, retry shortly"})
+                return busy, 503, {"Retry-After": "1"}
+            user = User(email=email, password_hash=pwhash)
             db.session.add(user)
 
         user.provider = "google"
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
 from flask import current_app
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restful import Resource, abort, reqparse
+from flask_restful import Resource, abort
 from sqlalchemy import func
-from sqlalchemy.sql import literal
+from werkzeug.exceptions import HTTPException
 
-from ..extensions import db
-from ..models import WorkoutSession
-from ..utils.dates import current_window
+from ..extensions import cache, db
+from ..models import DailyActivityRollup
+from ..utils import etag
+from ..utils.columns import session_rows
+from ..utils.dates import current_window, local_day, now_utc_naive
+from ..utils.progress import user_timezone
+from ..utils.schema import Arg, Schema
 
 
 def _map_range_to_period(rng: str) -> str:
@@ -20,120 +27,250 @@ def _map_range_to_period(rng: str) -> str:
     abort(400, message="range must be one of: week, month")
 
 
-DATE_FIELDS = (
-    "created_at",
-    "performed_at",
-    "date",
-    "session_date",
-    "timestamp",
-    "logged_at",
-    "started_at",
-    "start_time",
-    "when",
-    "dt",
-)
-MINUTES_FIELDS = (
-    "minutes",
-    "duration",
-    "duration_min",
-    "duration_minutes",
-    "time_min",
-    "time_minutes",
-    "mins",
-)
-CALORIES_FIELDS = (
-    "calories",
-    "kcal",
-    "kcals",
-    "cal",
-    "calories_burned",
-    "cals",
+GROUP_BY_CHOICES = ("day", "week", "exercise_type")
+
+
+def _bucket_expr(group_by: str):
+    if group_by == "exercise_type":
+        return DailyActivityRollup.exercise_type_id
+    if group_by == "day":
+        return DailyActivityRollup.day
+    if db.engine.dialect.name == "sqlite":
+        return func.date(DailyActivityRollup.day, "weekday 0", "-6 days")
+    return func.date(func.date_trunc("week", DailyActivityRollup.day))
+
+
+def _bucket_key(value) -> str | int | None:
+    if value is None or isinstance(value, (int, str)):
+        return value
+    return value.isoformat()
+
+
+summary_parser = Schema(
+    Arg("range", type=str, default="week"),
+    Arg("exercise_type_id", type=int),
+    Arg("group_by", type=str),
+    location="args",
 )
 
 
-def _pick_column(candidates: tuple[str, ...]):
-    for name in candidates:
-        col = getattr(WorkoutSession, name, None)
-        if col is not None:
-            return col, name
-    return None, None
+def _rollup_rows(user_id: int, start_dt, end_dt, etid, group_by) -> list[tuple]:
+    filters = [
+        DailyActivityRollup.user_id == user_id,
+        DailyActivityRollup.day >= start_dt.date(),
+        DailyActivityRollup.day < end_dt.date(),
+    ]
+    if etid is not None:
+        filters.append(DailyActivityRollup.exercise_type_id == etid)
+
+    aggregates = (
+        func.coalesce(func.sum(DailyActivityRollup.duration_sum), 0),
+        func.coalesce(func.sum(DailyActivityRollup.calories_sum), 0),
+        func.coalesce(func.sum(DailyActivityRollup.session_count), 0),
+    )
+
+    if group_by is None:
+        return [(None, *db.session.query(*aggregates).filter(*filters).one())]
+
+    bucket = _bucket_expr(group_by).label("bucket")
+    return (
+        db.session.query(bucket, *aggregates)
+        .filter(*filters)
+        .group_by(bucket)
+        .order_by(bucket)
+        .all()
+    )
 
 
-summary_parser = reqparse.RequestParser()
-summary_parser.add_argument("range", type=str, default="week", location="args")
-summary_parser.add_argument("exercise_type_id", type=int, required=False, location="args")
+def _local_rows(user_id: int, start_dt, end_dt, etid, group_by, tz: str) -> list[tuple]:
+    """Same shape as ``_rollup_rows`` for windows that do not start at UTC midnight.
+
+    The rollup is keyed by UTC day, so local windows read the (at most a
+    month of) raw sessions and bucket them by the user's local day.
+    """
+    stmt = session_rows(user_id, exercise_type_id=etid, start=start_dt, end=end_dt)
+    acc: dict = defaultdict(lambda: [0, 0, 0])
+    for _id, etype_id, duration, kcal, when in db.session.execute(stmt):
+        if group_by == "exercise_type":
+            key = etype_id
+        elif group_by in ("day", "week"):
+            day = local_day(when, tz)
+            key = day - timedelta(days=day.weekday()) if group_by == "week" else day
+        else:
+            key = None
+        totals = acc[key]
+        totals[0] += duration
+        totals[1] += kcal
+        totals[2] += 1
+
+    if group_by is None:
+        return [(None, *acc[None])]
+    return [(key, *acc[key]) for key in sorted(acc)]
+
+
+def _summary_payload(user_id: int, period: str, etid, group_by, tz: str) -> dict:
+    start_dt, end_dt = current_window(period, tz=tz)
+
+    if start_dt.time() == time(0) and end_dt.time() == time(0):
+        rows = _rollup_rows(user_id, start_dt, end_dt, etid, group_by)
+    else:
+        rows = _local_rows(user_id, start_dt, end_dt, etid, group_by, tz)
+
+    if group_by is None:
+        _, minutes_sum, calories_sum, sessions_count = rows[0]
+        breakdown = None
+    else:
+        breakdown = [
+            {
+                "key": _bucket_key(key),
+                "minutes": int(m or 0),
+                "calories": int(c or 0),
+                "sessions": int(n or 0),
+            }
+            for key, m, c, n in rows
+        ]
+        minutes_sum = sum(b["minutes"] for b in breakdown)
+        calories_sum = sum(b["calories"] for b in breakdown)
+        sessions_count = sum(b["sessions"] for b in breakdown)
+
+    payload = {
+        "range": "week" if period == "weekly" else "month",
+        "timezone": tz,
+        "window": {"start": start_dt.isoformat(), "end": end_dt.isoformat()},
+        "totals": {
+            "minutes": int(minutes_sum or 0),
+            "calories": int(calories_sum or 0),
+            "sessions": int(sessions_count or 0),
+        },
+    }
+    if breakdown is not None:
+        payload["group_by"] = group_by
+        payload["breakdown"] = breakdown
+    return payload
 
 
 class SummaryReport(Resource):
     @jwt_required()
+    @etag.conditional_get(daily=True)
     def get(self):
         try:
             user_id = int(get_jwt_identity())
-            args = summary_parser.parse_args()
+            args = summary_parser.parse()
 
             period = _map_range_to_period(args["range"])
-            start_dt, end_dt = current_window(period)
-
-            filters = [WorkoutSession.user_id == user_id]
+            tz = user_timezone(user_id)
+            start_dt, _ = current_window(period, tz=tz)
 
-            date_col, date_name = _pick_column(DATE_FIELDS)
-            if date_col is not None:
-                current_app.logger.info("SummaryReport: using date column '%s'", date_name)
-                filters += [date_col >= start_dt, date_col <= end_dt]
-            else:
-                current_app.logger.warning(
-                    "SummaryReport: NO date column found on WorkoutSession; "
-                    "falling back to totals without date filtering."
-                )
+            group_by = (args.get("group_by") or "").lower() or None
+            if group_by is not None and group_by not in GROUP_BY_CHOICES:
+                abort(400, message="group_by must be one of: day, week, exercise_type")
 
             etid = args.get("exercise_type_id")
-            if etid is not None:
-                filters.append(WorkoutSession.exercise_type_id == etid)
-
-            minutes_col, minutes_name = _pick_column(MINUTES_FIELDS)
-            if minutes_col is not None:
-                current_app.logger.info("SummaryReport: using minutes column '%s'", minutes_name)
-                minutes_expr = minutes_col
-            else:
-                current_app.logger.warning(
-                    "SummaryReport: NO minutes-like column found; minutes will be 0."
-                )
-                minutes_expr = literal(0)
-
-            calories_col, calories_name = _pick_column(CALORIES_FIELDS)
-            if calories_col is not None:
-                current_app.logger.info("SummaryReport: using calories column '%s'", calories_name)
-                calories_expr = calories_col
-            else:
-                current_app.logger.warning(
-                    "SummaryReport: NO calories-like column found; calories will be 0."
-                )
-                calories_expr = literal(0)
-
-            minutes_sum = (
-                db.session.query(func.coalesce(func.sum(minutes_expr), 0)).filter(*filters).scalar()
-                or 0
-            )
-            calories_sum = (
-                db.session.query(func.coalesce(func.sum(calories_expr), 0))
-                .filter(*filters)
-                .scalar()
-                or 0
-            )
-            sessions_count = (
-                db.session.query(func.count(WorkoutSession.id)).filter(*filters).scalar() or 0
-            )
 
-            return {
-                "range": "week" if period == "weekly" else "month",
-                "window": {"start": start_dt.isoformat(), "end": end_dt.isoformat()},
-                "totals": {
-                    "minutes": int(minutes_sum),
-                    "calories": int(calories_sum),
-                    "sessions": int(sessions_count),
-                },
-            }, 200
+            payload = cache.get_or_set(
+                user_id,
+                "reports.summary",
+                {"period": period, "exercise_type_id": etid, "group_by": group_by, "tz": tz},
+                start_dt.isoformat(),
+                lambda: _summary_payload(user_id, period, etid, group_by, tz),
+            )
+            return payload, 200
 
+        except HTTPException:
+            raise
         except Exception:
             current_app.logger.exception("SummaryReport failed")
             abort(500, message="Internal Server Error")
+
+
+MAX_TIMESERIES_POINTS = 3700
+BUCKET_CHOICES = ("day", "week", "month")
+
+
+def _parse_day(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        abort(400, message="Invalid date format. Use YYYY-MM-DD.")
+
+
+timeseries_parser = Schema(
+    Arg("bucket", type=str, default="week"),
+    Arg("start", type=_parse_day),
+    Arg("end", type=_parse_day),
+    Arg("exercise_type_id", type=int),
+    Arg("window", type=int, default=4),
+    location="args",
+)
+
+
+def _timeseries_payload(user_id: int, args: dict, today: date) -> dict:
+    # NumPy is only needed here; importing it lazily keeps it off worker boot.
+    from ..utils import analytics
+
+    first, last = args.get("start"), args.get("end")
+    history = analytics.load_history(
+        user_id,
+        exercise_type_id=args.get("exercise_type_id"),
+        start=datetime.combine(first, datetime.min.time()) if first else None,
+        end=datetime.combine(last + timedelta(days=1), datetime.min.time()) if last else None,
+    )
+    if first is None or last is None:
+        default_first, default_last = analytics.default_range(history, today)
+        first = first or default_first
+        last = last or max(default_last, first)
+    if last < first:
+        abort(400, message="end must not be before start")
+
+    per_bucket = {"day": 1, "week": 7, "month": 28}[args["bucket"]]
+    if analytics.span_days(first, last) // per_bucket > MAX_TIMESERIES_POINTS:
+        abort(400, message="Range too large for this bucket; use a coarser bucket")
+
+    payload = analytics.timeseries(
+        history,
+        bucket=args["bucket"],
+        first=first,
+        last=last,
+        window=args["window"],
+        today=today,
+    )
+    payload["range"] = {"start": first.isoformat(), "end": last.isoformat()}
+    return payload
+
+
+class TimeseriesReport(Resource):
+    @jwt_required()
+    @etag.conditional_get(daily=True)
+    def get(self):
+        try:
+            user_id = int(get_jwt_identity())
+            args = timeseries_parser.parse()
+
+            args["bucket"] = (args["bucket"] or "").lower()
+            if args["bucket"] not in BUCKET_CHOICES:
+                abort(400, message="bucket must be one of: day, week, month")
+            if args["window"] < 1:
+                abort(400, message="window must be >= 1")
+
+            today = now_utc_naive().date()
+            key_args = {
+                "bucket": args["bucket"],
+                "start": args["start"].isoformat() if args.get("start") else None,
+                "end": args["end"].isoformat() if args.get("end") else None,
+                "exercise_type_id": args.get("exercise_type_id"),
+                "window": args["window"],
+            }
+            payload = cache.get_or_set(
+                user_id,
+                "reports.timeseries",
+                key_args,
+                today.isoformat(),
+                lambda: _timeseries_payload(user_id, args, today),
+            )
+            return payload, 200
+
+        except HTTPException:
+            raise
+        except Exception:
+            current_app.logger.exception("TimeseriesReport failed")
+            abort(500, message="Internal Server Error")
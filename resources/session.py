@@ -1,10 +1,24 @@
+import csv
+import io
+import json
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 
+from flask import Response, current_app, request, stream_with_context
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restful import Resource, abort, reqparse
+from flask_restful import Resource, abort
+from sqlalchemy import and_, func, insert, or_, select
+from werkzeug.exceptions import HTTPException
 
-from ..extensions import db
+from ..extensions import cache, db
 from ..models import ExerciseType, WorkoutSession
+from ..utils import etag, leaderboards, rollup, snapshots, stats
+from ..utils.dates import end_of_day_exclusive, now_utc_naive, parse_local
+from ..utils.exercise_types import invalidate as invalidate_types
+from ..utils.exercise_types import owned_ids, owned_name_or_404, type_fk_guard, type_names
+from ..utils.pagination import decode_cursor, encode_cursor, truthy
+from ..utils.progress import user_timezone
+from ..utils.schema import Arg, Schema
 
 
 def _positive_int(v):
@@ -19,55 +33,29 @@ def _positive_int(v):
     return v
 
 
-create_parser = reqparse.RequestParser()
-create_parser.add_argument(
-    "exercise_type_id",
-    type=int,
-    required=True,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "duration",
-    type=_positive_int,
-    required=True,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "calories",
-    type=_positive_int,
-    required=True,
-    location=("json", "form"),
-)
-create_parser.add_argument(
-    "date",
-    type=str,
-    required=False,
-    location=("json", "form"),
+create_parser = Schema(
+    Arg("exercise_type_id", type=int, required=True),
+    Arg("duration", type=_positive_int, required=True),
+    Arg("calories", type=_positive_int, required=True),
+    Arg("date", type=str),
 )
 
-update_parser = reqparse.RequestParser()
-update_parser.add_argument(
-    "duration",
-    type=_positive_int,
-    location=("json", "form"),
-)
-update_parser.add_argument(
-    "calories",
-    type=_positive_int,
-    location=("json", "form"),
-)
-update_parser.add_argument(
-    "date",
-    type=str,
-    location=("json", "form"),
+update_parser = Schema(
+    Arg("duration", type=_positive_int),
+    Arg("calories", type=_positive_int),
+    Arg("date", type=str),
 )
 
-list_parser = reqparse.RequestParser()
-list_parser.add_argument("page", type=int, default=1, location="args")
-list_parser.add_argument("page_size", type=int, default=10, location="args")
-list_parser.add_argument("type_id", type=int, location="args")
-list_parser.add_argument("date_from", type=str, location="args")
-list_parser.add_argument("date_to", type=str, location="args")
+list_parser = Schema(
+    Arg("page", type=int, default=1),
+    Arg("page_size", type=int, default=10),
+    Arg("type_id", type=int),
+    Arg("date_from", type=str),
+    Arg("date_to", type=str),
+    Arg("cursor", type=str),
+    Arg("include_total", type=str),
+    location="args",
+)
 
 
 def _get_or_404_owned(session_id: int, owner_id: int) -> WorkoutSession:
@@ -77,24 +65,10 @@ def _get_or_404_owned(session_id: int, owner_id: int) -> WorkoutSession:
     return session
 
 
-def _etype_owned_or_404(type_id: int, owner_id: int) -> ExerciseType:
-    et = ExerciseType.query.filter_by(id=type_id, user_id=owner_id).first()
-    if et is None:
-        abort(404, message="Exercise type not found")
-    return et
-
-
-def _parse_iso(d: str) -> datetime:
+def _parse_iso(d: str, tz: str) -> datetime:
+    """Naive UTC; input without an offset is the owner's local time."""
     try:
-        if len(d) == 10:
-            dt = datetime.fromisoformat(d + "T00:00:00")
-        else:
-            dt = datetime.fromisoformat(d.replace(" ", "T"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        else:
-            dt = dt.astimezone(timezone.utc)
-        return dt
+        return parse_local(d, tz)
     except Exception:
         abort(400, message="Invalid date format. Use ISO 8601 (YYYY-MM-DD or full ISO).")
 
@@ -116,48 +90,114 @@ def _to_iso(val):
     return dt.replace(microsecond=0).isoformat()
 
 
+def _list_filters(args, user_id: int) -> list:
+    filters = [WorkoutSession.user_id == user_id]
+
+    if args.get("type_id") is not None:
+        filters.append(WorkoutSession.exercise_type_id == args["type_id"])
+
+    if args.get("date_from") or args.get("date_to"):
+        tz = user_timezone(user_id)
+        if args.get("date_from"):
+            filters.append(WorkoutSession.date >= _parse_iso(args["date_from"], tz))
+        if args.get("date_to"):
+            dt = _parse_iso(args["date_to"], tz)
+            if len(args["date_to"]) == 10:
+                end = end_of_day_exclusive(dt, tz)
+            else:
+                end = dt + timedelta(days=1)
+            filters.append(WorkoutSession.date < end)
+
+    return filters
+
+
+def _session_item(row) -> dict:
+    return {
+        "id": row.id,
+        "exercise_type": row.etype_name,
+        "duration": row.duration,
+        "calories": row.calories,
+        "date": _to_iso(row.date),
+    }
+
+
 class SessionList(Resource):
     @jwt_required()
+    @etag.conditional_get()
     def get(self):
         user_id = int(get_jwt_identity())
-        args = list_parser.parse_args()
+        args = list_parser.parse()
 
         page = max(1, args["page"] or 1)
         page_size = min(max(1, args["page_size"] or 10), 100)
 
-        q = (
-            db.session.query(WorkoutSession, ExerciseType.name.label("etype_name"))
+        # Plain column tuples: no ORM instances or identity-map bookkeeping per row.
+        filters = _list_filters(args, user_id)
+        if args.get("cursor") is not None:
+            # The keyset is (date, id); legacy rows without a date have no place in
+            # it, so cursor mode leaves them out (and out of its total).
+            filters.append(WorkoutSession.date.isnot(None))
+        stmt = (
+            select(
+                WorkoutSession.id,
+                ExerciseType.name.label("etype_name"),
+                WorkoutSession.duration,
+                WorkoutSession.calories,
+                WorkoutSession.date,
+            )
             .join(ExerciseType, WorkoutSession.exercise_type_id == ExerciseType.id)
-            .filter(WorkoutSession.user_id == user_id)
+            .where(*filters)
         )
 
-        if args.get("type_id") is not None:
-            q = q.filter(WorkoutSession.exercise_type_id == args["type_id"])
-
-        if args.get("date_from"):
-            q = q.filter(WorkoutSession.date >= _parse_iso(args["date_from"]))
-        if args.get("date_to"):
-            dt = _parse_iso(args["date_to"])
-            q = q.filter(WorkoutSession.date < (dt + timedelta(days=1)))
-
-        total = q.count()
-        rows = (
-            q.order_by(WorkoutSession.date.desc())
+        include_total = args.get("include_total") is None or truthy(args["include_total"])
+        total = None
+        if include_total:
+            total = db.session.execute(
+                select(func.count())
+                .select_from(WorkoutSession)
+                .join(ExerciseType, WorkoutSession.exercise_type_id == ExerciseType.id)
+                .where(*filters)
+            ).scalar_one()
+
+        if args.get("cursor") is not None:
+            if args["cursor"]:
+                c_date, c_id = decode_cursor(args["cursor"], 2)
+                try:
+                    c_date = datetime.fromisoformat(c_date)
+                    c_id = int(c_id)
+                except (TypeError, ValueError):
+                    abort(400, message="Invalid cursor")
+                stmt = stmt.where(
+                    or_(
+                        WorkoutSession.date < c_date,
+                        and_(WorkoutSession.date == c_date, WorkoutSession.id < c_id),
+                    )
+                )
+            rows = db.session.execute(
+                stmt.order_by(WorkoutSession.date.desc(), WorkoutSession.id.desc()).limit(
+                    page_size + 1
+                )
+            ).all()
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                last = rows[-1]
+                next_cursor = encode_cursor(last.date.isoformat(), last.id)
+
+            return {
+                "items": [_session_item(row) for row in rows],
+                "total": total,
+                "next_cursor": next_cursor,
+                "page_size": page_size,
+            }, 200
+
+        rows = db.session.execute(
+            stmt.order_by(WorkoutSession.date.desc())
             .limit(page_size)
             .offset((page - 1) * page_size)
-            .all()
-        )
+        ).all()
 
-        items = [
-            {
-                "id": s.id,
-                "exercise_type": etype_name,
-                "duration": s.duration,
-                "calories": s.calories,
-                "date": _to_iso(s.date),
-            }
-            for (s, etype_name) in rows
-        ]
+        items = [_session_item(row) for row in rows]
 
         return {
             "items": items,
@@ -169,41 +209,135 @@ class SessionList(Resource):
     @jwt_required()
     def post(self):
         user_id = int(get_jwt_identity())
-        args = create_parser.parse_args()
+        args = create_parser.parse()
 
-        _etype_owned_or_404(args["exercise_type_id"], user_id)
+        owned_name_or_404(args["exercise_type_id"], user_id)
 
-        dt = _parse_iso(args["date"]) if args.get("date") else None
+        dt = _parse_iso(args["date"], user_timezone(user_id)) if args.get("date") else None
 
         session = WorkoutSession(
             user_id=user_id,
             exercise_type_id=args["exercise_type_id"],
             duration=args["duration"],
             calories=args["calories"],
-            date=dt or datetime.now(timezone.utc),
+            date=dt or now_utc_naive(),
         )
-        db.session.add(session)
-        db.session.commit()
+        with type_fk_guard(session.exercise_type_id, user_id):
+            db.session.add(session)
+            rollup.add_session(session)
+            stats.add_session(session)
+            leaderboards.add_session(session)
+            etag.bump(user_id)
+            snapshots.mark_user_dirty(user_id)
+            db.session.commit()
+        cache.invalidate(user_id)
 
         return {"id": session.id}, 201
 
 
+export_parser = Schema(
+    Arg("format", type=str, default="csv"),
+    Arg("type_id", type=int),
+    Arg("date_from", type=str),
+    Arg("date_to", type=str),
+    location="args",
+)
+
+EXPORT_COLUMNS = ("id", "exercise_type_id", "exercise_type", "duration", "calories", "date")
+EXPORT_BATCH = 500
+
+
+def _export_csv(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for n, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if n % EXPORT_BATCH == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def _export_ndjson(rows):
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+        if len(batch) >= EXPORT_BATCH:
+            yield "\n".join(batch) + "\n"
+            batch = []
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+
+class SessionExport(Resource):
+    @jwt_required()
+    def get(self):
+        user_id = int(get_jwt_identity())
+        args = export_parser.parse()
+
+        fmt = (args["format"] or "").lower()
+        if fmt not in ("csv", "ndjson"):
+            abort(400, message="format must be one of: csv, ndjson")
+
+        stmt = (
+            select(
+                WorkoutSession.id,
+                WorkoutSession.exercise_type_id,
+                ExerciseType.name,
+                WorkoutSession.duration,
+                WorkoutSession.calories,
+                WorkoutSession.date,
+            )
+            .join(ExerciseType, WorkoutSession.exercise_type_id == ExerciseType.id)
+            .where(*_list_filters(args, user_id))
+            .order_by(WorkoutSession.date, WorkoutSession.id)
+            .execution_options(yield_per=EXPORT_BATCH)
+        )
+
+        def rows():
+            for sid, etid, etname, duration, calories, date in db.session.execute(stmt):
+                yield sid, etid, etname, duration, calories, _to_iso(date)
+
+        if fmt == "csv":
+            body, mimetype = _export_csv(rows()), "text/csv"
+        else:
+            body, mimetype = _export_ndjson(rows()), "application/x-ndjson"
+
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename=sessions.{fmt}"},
+        )
+
+
 class SessionDetail(Resource):
     @jwt_required()
     def put(self, session_id: int):
         user_id = int(get_jwt_identity())
-        args = update_parser.parse_args()
+        args = update_parser.parse()
 
         session = _get_or_404_owned(session_id, user_id)
+        rollup.remove_session(session)
+        before = (session.date, session.duration, session.calories)
 
         if args["duration"] is not None:
             session.duration = args["duration"]
         if args["calories"] is not None:
             session.calories = args["calories"]
         if args.get("date"):
-            session.date = _parse_iso(args["date"])
-
+            session.date = _parse_iso(args["date"], user_timezone(user_id))
+
+        rollup.add_session(session)
+        stats.session_removed(user_id, session.exercise_type_id, *before)
+        stats.add_session(session)
+        leaderboards.session_removed(user_id, session.exercise_type_id, *before)
+        leaderboards.add_session(session)
+        etag.bump(user_id)
+        snapshots.mark_user_dirty(user_id)
         db.session.commit()
+        cache.invalidate(user_id)
         return {"message": "updated"}, 200
 
     @jwt_required()
@@ -211,6 +345,155 @@ class SessionDetail(Resource):
         user_id = int(get_jwt_identity())
         session = _get_or_404_owned(session_id, user_id)
 
+        rollup.remove_session(session)
         db.session.delete(session)
+        stats.remove_session(session)
+        leaderboards.remove_session(session)
+        etag.bump(user_id)
+        snapshots.mark_user_dirty(user_id)
         db.session.commit()
+        cache.invalidate(user_id)
         return "", 204
+
+
+def _bulk_error(exc: HTTPException) -> str:
+    data = getattr(exc, "data", None) or {}
+    return data.get("message") or exc.description or "Invalid row."
+
+
+def _iter_bulk_payload():
+    """Yield raw rows from a JSON array body or an NDJSON stream.
+
+    NDJSON is read line by line from the request stream, so large imports
+    are never fully materialised in memory. A row that is not valid JSON is
+    yielded as an exception instance so the caller can report it in place.
+    """
+    ctype = (request.mimetype or "").lower()
+    if ctype in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        for raw_line in request.stream:
+            line = raw_line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield exc
+        return
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        abort(400, message="Body must be a JSON array or an NDJSON stream of sessions.")
+    yield from data
+
+
+def _bulk_row(raw, owns, user_id: int, tz: str) -> dict:
+    if isinstance(raw, ValueError):
+        abort(400, message="Invalid JSON.")
+    if not isinstance(raw, dict):
+        abort(400, message="Each session must be a JSON object.")
+
+    for field in ("exercise_type_id", "duration", "calories"):
+        if raw.get(field) is None:
+            abort(400, message=f"{field} is required.")
+
+    try:
+        etid = int(raw["exercise_type_id"])
+    except (TypeError, ValueError):
+        abort(400, message="exercise_type_id must be an integer.")
+    if not owns(etid):
+        abort(404, message="Exercise type not found")
+
+    return {
+        "user_id": user_id,
+        "exercise_type_id": etid,
+        "duration": _positive_int(raw["duration"]),
+        "calories": _positive_int(raw["calories"]),
+        "date": _parse_iso(str(raw["date"]), tz) if raw.get("date") else now_utc_naive(),
+    }
+
+
+def _flush_bulk_chunk(rows: list[dict]) -> None:
+    db.session.execute(insert(WorkoutSession), rows)
+
+    deltas: dict = defaultdict(lambda: [0, 0, 0])
+    for row in rows:
+        acc = deltas[(row["exercise_type_id"], rollup.day_of(row["date"]))]
+        acc[0] += row["duration"]
+        acc[1] += row["calories"]
+        acc[2] += 1
+    user_id = rows[0]["user_id"]
+    for (etid, day), (duration, calories, count) in deltas.items():
+        rollup.apply_delta(
+            user_id,
+            etid,
+            day,
+            duration=duration,
+            calories=calories,
+            sessions=count,
+        )
+    entries = [(r["exercise_type_id"], r["date"], r["duration"], r["calories"]) for r in rows]
+    stats.sessions_added(user_id, entries)
+    leaderboards.sessions_added(user_id, entries)
+    etag.bump(user_id)
+    snapshots.mark_user_dirty(user_id)
+    db.session.commit()
+    cache.invalidate(user_id)
+
+
+def _confirmed(chunk: list[tuple[int, dict]], user_id: int, errors: list) -> list[dict]:
+    """Drop rows whose type stopped existing since the cached ownership check."""
+    live = owned_ids({row["exercise_type_id"] for _, row in chunk}, user_id)
+    rows = []
+    for index, row in chunk:
+        if row["exercise_type_id"] in live:
+            rows.append(row)
+        else:
+            errors.append({"index": index, "message": "Exercise type not found"})
+    return rows
+
+
+class SessionBulk(Resource):
+    @jwt_required()
+    def post(self):
+        user_id = int(get_jwt_identity())
+        chunk_size = max(1, int(current_app.config.get("SESSIONS_BULK_CHUNK_SIZE", 1000)))
+
+        tz = user_timezone(user_id)
+        known = set(type_names(user_id))
+        refreshed = False
+
+        def owns(etid: int) -> bool:
+            # Same rule as owned_name_or_404: a miss re-reads (once per import)
+            # before refusing, so a type made on another worker is accepted.
+            nonlocal known, refreshed
+            if etid not in known and not refreshed:
+                invalidate_types(user_id)
+                known = set(type_names(user_id))
+                refreshed = True
+            return etid in known
+
+        inserted = 0
+        errors = []
+        chunk: list[tuple[int, dict]] = []
+
+        def flush() -> int:
+            rows = _confirmed(chunk, user_id, errors)
+            if rows:
+                _flush_bulk_chunk(rows)
+            return len(rows)
+
+        for index, raw in enumerate(_iter_bulk_payload()):
+            try:
+                chunk.append((index, _bulk_row(raw, owns, user_id, tz)))
+            except HTTPException as exc:
+                errors.append({"index": index, "message": _bulk_error(exc)})
+                continue
+            if len(chunk) >= chunk_size:
+                inserted += flush()
+                chunk = []
+        if chunk:
+            inserted += flush()
+
+        errors.sort(key=lambda e: e["index"])
+        status = 201 if inserted or not errors else 400
+        return {"inserted": inserted, "failed": len(errors), "errors": errors}, status
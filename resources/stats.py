@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_restful import Resource
+
+from ..extensions import db
+from ..models import ExerciseType, UserExerciseStats, UserStats
+from ..utils import stats as user_stats
+from ..utils.dates import now_utc_naive
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+class StatsOverview(Resource):
+    @jwt_required()
+    def get(self):
+        user_id = int(get_jwt_identity())
+
+        row = db.session.get(UserStats, user_id)
+        if row is None:
+            # Users with history from before user_stats existed.
+            row = user_stats.recompute(user_id)
+            db.session.commit()
+
+        records = (
+            db.session.query(UserExerciseStats, ExerciseType.name)
+            .join(ExerciseType, UserExerciseStats.exercise_type_id == ExerciseType.id)
+            .filter(UserExerciseStats.user_id == user_id)
+            .order_by(ExerciseType.name)
+            .all()
+        )
+
+        return {
+            "streaks": {
+                "current": user_stats.current_streak(row, now_utc_naive().date()),
+                "longest": row.longest_streak,
+                "longest_start": _iso(row.longest_streak_start),
+                "longest_end": _iso(row.longest_streak_end),
+                "last_active_day": _iso(row.last_active_day),
+            },
+            "personal_records": [
+                {
+                    "exercise_type_id": rec.exercise_type_id,
+                    "exercise_type": name,
+                    "longest_session": {
+                        "duration": rec.longest_duration,
+                        "date": _iso(rec.longest_duration_date),
+                    },
+                    "most_calories": {
+                        "calories": rec.most_calories,
+                        "date": _iso(rec.most_calories_date),
+                    },
+                }
+                for rec, name in records
+            ],
+        }, 200
@@ -0,0 +1,93 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _analytics():
+    try:
+        from backend.utils import analytics
+    except Exception:
+        from utils import analytics
+    return analytics
+
+
+def test_moving_average_and_streaks():
+    analytics = _analytics()
+
+    ma = analytics.moving_average(np.array([2, 4, 6, 8]), 2)
+    assert ma.tolist() == [2.0, 3.0, 5.0, 7.0]
+
+    days = np.array(
+        ["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03", "2024-01-07", "2024-01-08"],
+        dtype="datetime64[D]",
+    )
+    s = analytics.streaks(days, date(2024, 1, 9))
+    assert s == {
+        "current": 2,
+        "longest": 3,
+        "longest_start": "2024-01-01",
+        "longest_end": "2024-01-03",
+    }
+    assert analytics.streaks(days, date(2024, 1, 10))["current"] == 0
+
+
+def test_week_and_month_buckets_start_on_boundaries():
+    analytics = _analytics()
+
+    days = np.array(["2024-01-03", "2024-01-07", "2024-01-08", "2024-02-29"], dtype="datetime64[D]")
+    weeks = analytics.bucket_start(days, "week")
+    assert [str(d) for d in weeks] == ["2024-01-01", "2024-01-01", "2024-01-08", "2024-02-26"]
+    months = analytics.bucket_keys(date(2024, 1, 15), date(2024, 3, 2), "month")
+    assert [str(d) for d in months] == ["2024-01-01", "2024-02-01", "2024-03-01"]
+
+
+def test_timeseries_endpoint(client):
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    for days_ago, dur in ((0, 30), (1, 20), (1, 10), (2, 40), (10, 60)):
+        r = client.post(
+            "/api/sessions",
+            json={
+                "exercise_type_id": etid,
+                "duration": dur,
+                "calories": dur * 10,
+                "date": (today - timedelta(days=days_ago)).isoformat(),
+            },
+            headers=h,
+        )
+        assert r.status_code == 201
+
+    r = client.get("/api/reports/timeseries?bucket=day&window=3", headers=h)
+    assert r.status_code == 200
+    body = r.get_json()
+
+    series = body["series"]
+    assert len(series) == 11
+    assert series[0]["key"] == (today - timedelta(days=10)).date().isoformat()
+    assert [p["minutes"] for p in series[-3:]] == [40, 30, 30]
+    assert series[-1]["minutes_avg"] == round((40 + 30 + 30) / 3, 2)
+    assert sum(p["sessions"] for p in series) == 5
+
+    assert body["totals"] == {"minutes": 160, "calories": 1600, "sessions": 5}
+    assert body["streaks"]["current"] == 3
+    assert body["streaks"]["longest"] == 3
+    assert body["percentiles"]["duration"]["p50"] == 30.0
+    assert body["personal_bests"]["longest_session"]["duration"] == 60
+
+    weekly = client.get("/api/reports/timeseries?bucket=week", headers=h).get_json()
+    assert sum(p["minutes"] for p in weekly["series"]) == 160
+
+    assert client.get("/api/reports/timeseries?bucket=hour", headers=h).status_code == 400
+    r = client.get("/api/reports/timeseries?start=2024-02-01&end=2024-01-01", headers=h)
+    assert r.status_code == 400
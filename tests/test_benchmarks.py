@@ -0,0 +1,48 @@
+try:
+    from backend.benchmarks.bench_memory import measure
+    from backend.benchmarks.datagen import DatasetSpec, generate
+    from backend.benchmarks.run import build_cases
+    from backend.extensions import db
+    from backend.models import DailyActivityRollup, Goal, WorkoutSession
+except Exception:
+    from benchmarks.bench_memory import measure
+    from benchmarks.datagen import DatasetSpec, generate
+    from benchmarks.run import build_cases
+    from extensions import db
+    from models import DailyActivityRollup, Goal, WorkoutSession
+
+
+def test_datagen_and_cases_smoke(app, client):
+    spec = DatasetSpec(users=2, types_per_user=3, sessions_per_user=50, goals_per_user=4)
+    with app.app_context():
+        user_ids = generate(spec)
+        assert WorkoutSession.query.count() == 100
+        assert Goal.query.count() == 8
+        total = db.session.query(db.func.sum(DailyActivityRollup.session_count)).scalar()
+        assert total == 100
+
+    for fn in build_cases(app, client, user_ids[0], spec).values():
+        fn()
+
+
+def test_session_columns_are_compact_and_lossless(app):
+    try:
+        from backend.utils.columns import SessionColumns, session_rows
+    except Exception:
+        from utils.columns import SessionColumns, session_rows
+
+    spec = DatasetSpec(users=1, types_per_user=2, sessions_per_user=2000, goals_per_user=0)
+    with app.app_context():
+        (user_id,) = generate(spec)
+        cols = SessionColumns.load(user_id, batch=300)
+        rows = db.session.execute(session_rows(user_id)).all()
+        assert len(cols) == len(rows) == 2000
+        for i in (0, 999, 1999):
+            sid, etid, duration, calories, _ = list(cols)[i]
+            assert (sid, etid, duration, calories) == tuple(rows[i][:4])
+            assert cols.date_at(i) == rows[i].date.replace(microsecond=0)
+
+    result = measure(app, user_id)
+    orm = result["orm"]["retained_bytes_per_row"]
+    compact = result["session_columns"]["retained_bytes_per_row"]
+    assert compact * 5 < orm
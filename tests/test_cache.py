@@ -0,0 +1,104 @@
+import uuid
+
+from flask_jwt_extended import decode_token
+
+try:
+    from backend.extensions import cache, db
+    from backend.utils import etag, rollup
+    from backend.utils.cache import MemoryBackend, ResponseCache
+    from backend.utils.dates import now_utc_naive
+except Exception:
+    from extensions import cache, db
+    from utils import etag, rollup
+    from utils.cache import MemoryBackend, ResponseCache
+    from utils.dates import now_utc_naive
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_memory_backend_evicts_lru_and_expires():
+    backend = MemoryBackend(maxsize=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    assert backend.get("a") == 1
+    backend.set("c", 3, ttl=60)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+
+    backend.set("d", 4, ttl=-1)
+    assert backend.get("d") is None
+
+
+def test_generation_bump_hides_old_entries():
+    rc = ResponseCache(MemoryBackend())
+    key = rc.key(1, "x", {"b": 2, "a": 1})
+    assert key == rc.key(1, "x", {"a": 1, "b": 2})
+    rc.set(key, {"v": 1})
+    assert rc.get(key) == {"v": 1}
+    rc.invalidate(1)
+    assert rc.get(rc.key(1, "x", {"a": 1, "b": 2})) is None
+    assert rc.stats()["hits"] == 1
+    assert rc.stats()["misses"] == 1
+
+
+def test_summary_is_cached_and_invalidated_by_session_writes(client):
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+
+    def minutes():
+        return client.get("/api/reports/summary", headers=h).get_json()["totals"]["minutes"]
+
+    assert minutes() == 0
+    hits = cache.stats()["hits"]
+    assert minutes() == 0
+    assert cache.stats()["hits"] == hits + 1
+
+    client.post(
+        "/api/sessions",
+        json={"exercise_type_id": etid, "duration": 25, "calories": 100},
+        headers=h,
+    )
+    assert minutes() == 25
+
+
+def test_goal_progress_cache_invalidated_by_goal_update(client):
+    h = auth_headers(client)
+    gid = client.post(
+        "/api/goals",
+        json={"description": "g", "target_value": 10, "period": "weekly", "metric": "sessions"},
+        headers=h,
+    ).get_json()["id"]
+
+    def target():
+        items = client.get("/api/goals?with_progress=1", headers=h).get_json()["items"]
+        return items[0]["progress"]["target"]
+
+    assert target() == 10
+    assert target() == 10
+    client.put(f"/api/goals/{gid}", json={"target_value": 20}, headers=h)
+    assert target() == 20
+
+
+def test_writes_from_another_worker_reach_cached_summaries(app, client):
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+
+    def minutes():
+        return client.get("/api/reports/summary", headers=h).get_json()["totals"]["minutes"]
+
+    assert minutes() == 0
+
+    # Another worker's write: same database, but this process's cache is never told.
+    with app.app_context():
+        user_id = int(decode_token(h["Authorization"].split()[1])["sub"])
+        rollup.apply_delta(user_id, etid, now_utc_naive(), duration=25, calories=100, sessions=1)
+        etag.bump(user_id)
+        db.session.commit()
+
+    assert minutes() == 25
@@ -0,0 +1,329 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from flask_jwt_extended import decode_token
+from sqlalchemy import event, update
+
+try:
+    from backend.extensions import db
+    from backend.models import Challenge, ChallengeScore, ExerciseType, WorkoutSession
+    from backend.utils import leaderboards
+    from backend.utils.pagination import encode_cursor
+except Exception:
+    from extensions import db
+    from models import Challenge, ChallengeScore, ExerciseType, WorkoutSession
+    from utils import leaderboards
+    from utils.pagination import encode_cursor
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _type(client, h, name):
+    return client.post("/api/exercise-types", json={"name": name}, headers=h).get_json()["id"]
+
+
+def _add(client, h, etid, minutes):
+    r = client.post(
+        "/api/sessions",
+        json={"exercise_type_id": etid, "duration": minutes, "calories": minutes * 10},
+        headers=h,
+    )
+    assert r.status_code == 201
+    return r.get_json()["id"]
+
+
+def _board(client, h, cid, **params):
+    query = "&".join(f"{k}={v}" for k, v in params.items())
+    r = client.get(f"/api/challenges/{cid}/leaderboard?{query}", headers=h)
+    assert r.status_code == 200
+    return r.get_json()
+
+
+def _ranks(body):
+    return [(item["rank"], item["value"]) for item in body["items"]]
+
+
+def test_leaderboard_ranks_members_and_follows_session_writes(app, client):
+    a, b, c = auth_headers(client), auth_headers(client), auth_headers(client)
+    run_a, run_b, run_c = _type(client, a, "Run"), _type(client, b, "run"), _type(client, c, "Run")
+    bike_c = _type(client, c, "Bike")
+
+    r = client.post(
+        "/api/challenges",
+        json={"name": "Team", "metric": "duration", "period": "weekly", "exercise_name": "Run"},
+        headers=a,
+    )
+    assert r.status_code == 201
+    challenge = r.get_json()
+    cid = challenge["id"]
+    for h in (b, c):
+        r = client.post("/api/challenges/join", json={"code": challenge["join_code"]}, headers=h)
+        assert r.status_code == 200
+    assert r.get_json()["member_count"] == 3
+
+    _add(client, a, run_a, 30)
+    _add(client, b, run_b, 50)
+    _add(client, c, run_c, 30)
+    _add(client, c, bike_c, 100)
+
+    body = _board(client, a, cid)
+    assert _ranks(body) == [(1, 50), (2, 30), (2, 30)]
+    assert body["me"] == {"rank": 2, "value": 30}
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        extra = _add(client, a, run_a, 20)
+        body = _board(client, a, cid)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    # The write moved A's score in place; the read never went back to the sessions.
+    assert _ranks(body) == [(1, 50), (1, 50), (3, 30)]
+    reads = [s for s in statements if "challenge_score" in s and s.lstrip().startswith("SELECT")]
+    assert reads and not any("workout_session" in s for s in reads)
+
+    assert client.delete(f"/api/sessions/{extra}", headers=a).status_code == 204
+    assert _ranks(_board(client, c, cid)) == [(1, 50), (2, 30), (2, 30)]
+
+
+def test_leaderboard_cursor_pages_keep_tied_ranks(client):
+    owner = auth_headers(client)
+    r = client.post(
+        "/api/challenges",
+        json={"name": "Count", "metric": "sessions", "period": "monthly"},
+        headers=owner,
+    )
+    cid, code = r.get_json()["id"], r.get_json()["join_code"]
+
+    for sessions in (2, 2, 1):
+        h = auth_headers(client)
+        client.post("/api/challenges/join", json={"code": code}, headers=h)
+        etid = _type(client, h, "Swim")
+        for _ in range(sessions):
+            _add(client, h, etid, 10)
+
+    seen, cursor = [], None
+    while True:
+        params = {"page_size": 1}
+        if cursor:
+            params["cursor"] = cursor
+        body = _board(client, owner, cid, **params)
+        seen += _ranks(body)
+        cursor = body["next_cursor"]
+        if not body["items"] or cursor is None:
+            break
+    assert seen == [(1, 2), (1, 2), (3, 1), (4, 0)]
+
+    for bad in (encode_cursor("a", {}), encode_cursor(1), "bogus"):
+        r = client.get(f"/api/challenges/{cid}/leaderboard?cursor={bad}", headers=owner)
+        assert r.status_code == 400
+
+
+def test_challenge_access_and_membership(client):
+    owner, member, outsider = auth_headers(client), auth_headers(client), auth_headers(client)
+    r = client.post(
+        "/api/challenges",
+        json={"name": "C", "metric": "steps", "period": "weekly"},
+        headers=owner,
+    )
+    assert r.status_code == 400
+
+    r = client.post(
+        "/api/challenges",
+        json={"name": "C", "metric": "calories", "period": "weekly"},
+        headers=owner,
+    )
+    cid, code = r.get_json()["id"], r.get_json()["join_code"]
+
+    assert client.get(f"/api/challenges/{cid}/leaderboard", headers=outsider).status_code == 404
+    r = client.post("/api/challenges/join", json={"code": "nope"}, headers=outsider)
+    assert r.status_code == 404
+
+    client.post("/api/challenges/join", json={"code": code}, headers=member)
+    assert len(_board(client, owner, cid)["items"]) == 2
+    assert client.delete(f"/api/challenges/{cid}", headers=member).status_code == 403
+
+    assert client.delete(f"/api/challenges/{cid}/membership", headers=member).status_code == 204
+    body = _board(client, owner, cid)
+    assert body["member_count"] == 1
+    assert len(body["items"]) == 1
+    assert client.get("/api/challenges", headers=member).get_json()["items"] == []
+
+    assert client.delete(f"/api/challenges/{cid}", headers=owner).status_code == 204
+    assert client.get(f"/api/challenges/{cid}", headers=owner).status_code == 404
+
+
+def test_named_challenge_counts_types_renamed_on_another_worker(app, client):
+    h = auth_headers(client)
+    jog = _type(client, h, "Jog")
+    r = client.post(
+        "/api/challenges",
+        json={"name": "Runs", "metric": "duration", "period": "weekly", "exercise_name": "Run"},
+        headers=h,
+    )
+    cid = r.get_json()["id"]
+    _add(client, h, jog, 10)  # caches {jog: "Jog"} in this process
+    assert _ranks(_board(client, h, cid)) == [(1, 0)]
+
+    # Another worker renames the type: this process's type cache still says "Jog".
+    with app.app_context():
+        user_id = db.session.get(ExerciseType, jog).user_id
+        db.session.get(ExerciseType, jog).name = "Run"
+        leaderboards.reset_named(user_id)
+        db.session.commit()
+    assert _ranks(_board(client, h, cid)) == [(1, 10)]
+
+    _add(client, h, jog, 15)
+    assert _ranks(_board(client, h, cid)) == [(1, 25)]
+
+
+def test_join_adds_only_the_newcomer_to_built_windows(app, client):
+    owner, late = auth_headers(client), auth_headers(client)
+    r = client.post(
+        "/api/challenges",
+        json={"name": "Weekly", "metric": "duration", "period": "weekly"},
+        headers=owner,
+    )
+    cid, code = r.get_json()["id"], r.get_json()["join_code"]
+    _add(client, owner, _type(client, owner, "Run"), 40)
+    swim = _type(client, late, "Swim")
+    _add(client, late, swim, 30)
+    last_week = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+    r = client.post(
+        "/api/sessions",
+        json={"exercise_type_id": swim, "duration": 20, "calories": 1, "date": last_week},
+        headers=late,
+    )
+    assert r.status_code == 201
+    for ago in (0, 1):
+        _board(client, owner, cid, ago=ago)
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(" ".join(statement.split()))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        r = client.post("/api/challenges/join", json={"code": code}, headers=late)
+        assert r.status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert not [s for s in statements if s.startswith("DELETE FROM challenge_score")]
+    grouped = [s for s in statements if "FROM workout_session" in s]
+    assert len(grouped) == 1 and "GROUP BY" in grouped[0]
+
+    statements.clear()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert _ranks(_board(client, owner, cid)) == [(1, 40), (2, 30)]
+        assert _ranks(_board(client, owner, cid, ago=1)) == [(1, 20), (2, 0)]
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert not [s for s in statements if "workout_session" in s]
+
+
+def _in_thread(app, fn, hold: threading.Event, started: threading.Event):
+    """Run ``fn`` in its own app context and keep its transaction open until ``hold``."""
+    errors = []
+
+    def run():
+        with app.app_context():
+            try:
+                fn()
+                started.set()
+                hold.wait(10)
+                db.session.commit()
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+                started.set()
+            finally:
+                db.session.remove()
+
+    t = threading.Thread(target=run)
+    t.start()
+    return t, errors
+
+
+def test_build_and_session_write_interleave_without_losing_the_delta(app, client):
+    h = auth_headers(client)
+    etid = _type(client, h, "Run")
+    cid = client.post(
+        "/api/challenges",
+        json={"name": "Race", "metric": "duration", "period": "weekly"},
+        headers=h,
+    ).get_json()["id"]
+    with app.app_context():
+        user_id = int(decode_token(h["Authorization"].split()[1])["sub"])
+
+    def write(minutes):
+        def fn():
+            s = WorkoutSession(
+                user_id=user_id, exercise_type_id=etid, duration=minutes, calories=1
+            )
+            db.session.add(s)
+            db.session.flush()
+            leaderboards.add_session(s)
+
+        return fn
+
+    def build():
+        c = db.session.get(Challenge, cid)
+        leaderboards.ensure_window(c, leaderboards.window_of(c))
+
+    # Write in flight while the window is built, then a build in flight while a write lands.
+    for first, second, expected in ((write(20), build, 20), (build, write(15), 35)):
+        hold, started = threading.Event(), threading.Event()
+        t1, errors1 = _in_thread(app, first, hold, started)
+        assert started.wait(10)
+        go = threading.Event()
+        go.set()
+        t2, errors2 = _in_thread(app, second, go, threading.Event())
+        time.sleep(0.3)  # the second one is now waiting on the first's lock
+        hold.set()
+        t1.join(10)
+        t2.join(10)
+        assert not errors1 and not errors2
+        assert _ranks(_board(client, h, cid)) == [(1, expected)]
+
+
+def test_rebuild_command_recomputes_scores(app, client):
+    h = auth_headers(client)
+    cid = client.post(
+        "/api/challenges",
+        json={"name": "Fix", "metric": "duration", "period": "weekly"},
+        headers=h,
+    ).get_json()["id"]
+    _add(client, h, _type(client, h, "Run"), 30)
+    assert _ranks(_board(client, h, cid)) == [(1, 30)]
+
+    with app.app_context():
+        db.session.execute(
+            update(ChallengeScore).where(ChallengeScore.challenge_id == cid).values(value=999)
+        )
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["challenges", "rebuild", str(cid)])
+    assert result.exit_code == 0, result.output
+    assert _ranks(_board(client, h, cid)) == [(1, 30)]
+
+    result = app.test_cli_runner().invoke(args=["challenges", "rebuild", "999999"])
+    assert result.exit_code != 0
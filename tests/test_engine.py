@@ -0,0 +1,80 @@
+import threading
+
+from sqlalchemy import text
+
+
+def _engine_options():
+    try:
+        from backend.utils.engine import engine_options
+    except Exception:
+        from utils.engine import engine_options
+    return engine_options
+
+
+SETTINGS = {
+    "DB_POOL_SIZE": 7,
+    "DB_MAX_OVERFLOW": 3,
+    "DB_POOL_RECYCLE": 600,
+    "DB_POOL_TIMEOUT": 10,
+    "DB_POOL_PRE_PING": True,
+    "DB_STATEMENT_TIMEOUT_MS": 15000,
+    "SQLITE_BUSY_TIMEOUT_MS": 4000,
+}
+
+
+def test_engine_options_per_backend():
+    engine_options = _engine_options()
+
+    pg = engine_options("postgresql://u:p@db/fitness", SETTINGS)
+    assert pg["pool_size"] == 7
+    assert pg["max_overflow"] == 3
+    assert pg["pool_recycle"] == 600
+    assert pg["pool_pre_ping"] is True
+    assert pg["connect_args"] == {"options": "-c statement_timeout=15000"}
+
+    lite = engine_options("sqlite:////tmp/x.db", SETTINGS)
+    assert lite == {"connect_args": {"timeout": 4.0}}
+
+
+def test_sqlite_pragmas_applied_on_connect(app):
+    try:
+        from backend.extensions import db
+    except Exception:
+        from extensions import db
+
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+
+
+def test_concurrent_session_writes_do_not_lock(app):
+    import uuid
+
+    client = app.test_client()
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "pw"}).get_json()
+    h = {"Authorization": f"Bearer {token['access_token']}"}
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+
+    statuses = []
+
+    def worker():
+        c = app.test_client()
+        for _ in range(5):
+            r = c.post(
+                "/api/sessions",
+                json={"exercise_type_id": etid, "duration": 10, "calories": 50},
+                headers=h,
+            )
+            statuses.append(r.status_code)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert statuses == [201] * 20
@@ -0,0 +1,106 @@
+import uuid
+
+from flask_jwt_extended import decode_token
+from sqlalchemy import event
+
+try:
+    from backend.extensions import db
+    from backend.utils import etag, rollup
+    from backend.utils.dates import now_utc_naive
+except Exception:
+    from extensions import db
+    from utils import etag, rollup
+    from utils.dates import now_utc_naive
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_conditional_get_returns_304_until_a_write(app, client):
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+
+    for url in ("/api/sessions", "/api/goals?with_progress=true", "/api/reports/summary"):
+        r = client.get(url, headers=h)
+        assert r.status_code == 200
+        tag = r.headers["ETag"]
+
+        r = client.get(url, headers={**h, "If-None-Match": tag})
+        assert r.status_code == 304
+        assert r.data == b""
+        assert r.headers["ETag"] == tag
+
+        other = client.get(url + ("&" if "?" in url else "?") + "page_size=5", headers=h)
+        assert other.headers["ETag"] != tag
+
+        client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": 10, "calories": 50},
+            headers=h,
+        )
+        r = client.get(url, headers={**h, "If-None-Match": tag})
+        assert r.status_code == 200
+        assert r.headers["ETag"] != tag
+
+
+def test_etags_are_per_user_and_bumped_by_exercise_writes(app, client):
+    h1, h2 = auth_headers(client), auth_headers(client)
+    tag1 = client.get("/api/sessions", headers=h1).headers["ETag"]
+    tag2 = client.get("/api/sessions", headers=h2).headers["ETag"]
+    assert tag1 != tag2
+
+    client.post("/api/exercise-types", json={"name": "Swim"}, headers=h1)
+    assert client.get("/api/sessions", headers={**h1, "If-None-Match": tag1}).status_code == 200
+    assert client.get("/api/sessions", headers={**h2, "If-None-Match": tag2}).status_code == 304
+
+
+def test_not_modified_skips_the_heavy_queries(app, client):
+    try:
+        from backend.extensions import db
+    except Exception:
+        from extensions import db
+
+    h = auth_headers(client)
+    tag = client.get("/api/reports/summary", headers=h).headers["ETag"]
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        r = client.get("/api/reports/summary", headers={**h, "If-None-Match": tag})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert r.status_code == 304
+    assert len(statements) == 1
+    assert "data_version" in statements[0]
+
+
+def test_etag_and_cached_body_share_a_version(app, client):
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    first = client.get("/api/reports/summary", headers=h)
+    assert first.get_json()["totals"]["minutes"] == 0
+
+    # A write handled by another worker: this process's response cache is not told.
+    with app.app_context():
+        user_id = int(decode_token(h["Authorization"].split()[1])["sub"])
+        rollup.apply_delta(user_id, etid, now_utc_naive(), duration=25, calories=100, sessions=1)
+        etag.bump(user_id)
+        db.session.commit()
+
+    r = client.get("/api/reports/summary", headers={**h, "If-None-Match": first.headers["ETag"]})
+    assert r.status_code == 200
+    assert r.get_json()["totals"]["minutes"] == 25
+    r = client.get("/api/reports/summary", headers={**h, "If-None-Match": r.headers["ETag"]})
+    assert r.status_code == 304
@@ -0,0 +1,152 @@
+import uuid
+
+from sqlalchemy import event
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _session(client, h, etid):
+    return client.post(
+        "/api/sessions",
+        json={"exercise_type_id": etid, "duration": 10, "calories": 50},
+        headers=h,
+    )
+
+
+def test_session_write_skips_exercise_type_query_when_cached(app, client):
+    try:
+        from backend.extensions import db
+    except Exception:
+        from extensions import db
+
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    assert _session(client, h, etid).status_code == 201
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert _session(client, h, etid).status_code == 201
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert not [s for s in statements if "FROM exercise_type" in s]
+
+
+def test_exercise_type_writes_invalidate_cache(app, client):
+    try:
+        from backend.extensions import db
+        from backend.models import ExerciseType
+    except Exception:
+        from extensions import db
+        from models import ExerciseType
+
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    assert _session(client, h, etid).status_code == 201
+
+    r = client.post(
+        "/api/goals",
+        json={"description": "g", "target_value": 5, "period": "weekly",
+              "metric": "sessions", "exercise_type_id": etid},
+        headers=h,
+    )
+    goal_id = r.get_json()["id"]
+    client.put(f"/api/exercise-types/{etid}", json={"name": "Trail run"}, headers=h)
+    r = client.put(f"/api/goals/{goal_id}", json={"target_value": 6}, headers=h)
+    assert r.get_json()["exercise_type"] == "Trail run"
+
+    # A type created behind the cache's back (e.g. by another worker) is
+    # still accepted: a miss re-reads before refusing.
+    with app.app_context():
+        user_id = db.session.get(ExerciseType, etid).user_id
+        other = ExerciseType(user_id=user_id, name="Swim")
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+    assert _session(client, h, other_id).status_code == 201
+
+    yoga = client.post("/api/exercise-types", json={"name": "Yoga"}, headers=h).get_json()["id"]
+    assert _session(client, h, etid).status_code == 201
+    assert client.delete(f"/api/exercise-types/{yoga}", headers=h).status_code == 204
+    assert _session(client, h, yoga).status_code == 404
+
+
+def test_bulk_import_checks_ownership_past_the_cache(app, client):
+    try:
+        from backend.extensions import db
+        from backend.models import ExerciseType
+    except Exception:
+        from extensions import db
+        from models import ExerciseType
+
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    gone = client.post("/api/exercise-types", json={"name": "Row"}, headers=h).get_json()["id"]
+    assert _session(client, h, etid).status_code == 201  # caches both types
+
+    # Behind the cache's back (another worker): one type appears, one disappears.
+    with app.app_context():
+        user_id = db.session.get(ExerciseType, etid).user_id
+        fresh = ExerciseType(user_id=user_id, name="Swim")
+        db.session.add(fresh)
+        db.session.delete(db.session.get(ExerciseType, gone))
+        db.session.commit()
+        fresh_id = fresh.id
+
+    rows = [
+        {"exercise_type_id": fresh_id, "duration": 10, "calories": 50},
+        {"exercise_type_id": gone, "duration": 10, "calories": 50},
+        {"exercise_type_id": etid, "duration": 10, "calories": 50},
+    ]
+    r = client.post("/api/sessions/bulk", json=rows, headers=h)
+    assert r.status_code == 201
+    body = r.get_json()
+    assert body["inserted"] == 2
+    assert body["errors"] == [{"index": 1, "message": "Exercise type not found"}]
+
+
+def test_single_writes_refuse_a_type_deleted_on_another_worker(app, client):
+    try:
+        from backend.extensions import db
+        from backend.models import ExerciseType, Goal, WorkoutSession
+    except Exception:
+        from extensions import db
+        from models import ExerciseType, Goal, WorkoutSession
+
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    goal = {"description": "g", "target_value": 5, "period": "weekly", "metric": "sessions"}
+    goal_id = client.post("/api/goals", json=goal, headers=h).get_json()["id"]
+
+    writes = (
+        lambda gone: _session(client, h, gone),
+        lambda gone: client.post("/api/goals", json={**goal, "exercise_type_id": gone}, headers=h),
+        lambda gone: client.put(
+            f"/api/goals/{goal_id}", json={"exercise_type_id": gone}, headers=h
+        ),
+    )
+    for write in writes:
+        gone = client.post("/api/exercise-types", json={"name": "Row"}, headers=h).get_json()["id"]
+        assert _session(client, h, etid).status_code == 201  # caches the new type
+        # Deleted behind the cache's back (another worker); this process still lists it.
+        with app.app_context():
+            db.session.delete(db.session.get(ExerciseType, gone))
+            db.session.commit()
+
+        assert write(gone).status_code == 404
+        with app.app_context():
+            assert db.session.query(WorkoutSession).filter_by(exercise_type_id=gone).count() == 0
+            assert db.session.query(Goal).filter_by(exercise_type_id=gone).count() == 0
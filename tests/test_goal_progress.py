@@ -0,0 +1,123 @@
+import uuid
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_goal_list_progress_matches_single_goal_progress(app, client):
+    try:
+        from backend.models import Goal
+        from backend.utils.progress import compute_goal_progress
+    except Exception:
+        from models import Goal
+        from utils.progress import compute_goal_progress
+
+    h = auth_headers(client)
+    run = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    bike = client.post("/api/exercise-types", json={"name": "Bike"}, headers=h).get_json()["id"]
+
+    for etid, dur, kcal in ((run, 30, 300), (run, 20, 200), (bike, 60, 500)):
+        r = client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": dur, "calories": kcal},
+            headers=h,
+        )
+        assert r.status_code == 201
+
+    goals = [
+        {"description": "run", "target_value": 40, "period": "weekly", "metric": "duration",
+         "exercise_type_id": run},
+        {"description": "all", "target_value": 2000, "period": "monthly", "metric": "calories"},
+        {"description": "cnt", "target_value": 10, "period": "yearly", "metric": "sessions"},
+        {"description": "old", "target_value": 5, "period": "weekly", "metric": "sessions",
+         "start_date": "2000-01-01", "end_date": "2000-12-31"},
+    ]
+    for g in goals:
+        assert client.post("/api/goals", json=g, headers=h).status_code == 201
+
+    r = client.get("/api/goals?with_progress=true", headers=h)
+    assert r.status_code == 200
+    items = {it["description"]: it["progress"] for it in r.get_json()["items"]}
+
+    assert items["run"]["value"] == 50
+    assert items["run"]["status"] == "achieved"
+    assert items["all"]["value"] == 1000
+    assert items["cnt"]["value"] == 3
+    assert items["old"]["value"] == 0
+    assert items["old"]["status"] == "overdue"
+
+    with app.app_context():
+        for g in Goal.query.all():
+            expected = compute_goal_progress(g).as_dict()
+            assert {k: v for k, v in items[g.description].items() if k != "freshness"} == expected
+
+
+def test_goal_history_sums_every_window_in_one_query(app, client):
+    from datetime import timedelta
+
+    from sqlalchemy import event
+
+    try:
+        from backend.extensions import db
+        from backend.utils.dates import current_window
+    except Exception:
+        from extensions import db
+        from utils.dates import current_window
+
+    h = auth_headers(client)
+    run = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    this_week, _ = current_window("weekly")
+    for weeks_ago, minutes in ((0, 40), (1, 10), (3, 50)):
+        when = this_week - timedelta(weeks=weeks_ago) + timedelta(hours=1)
+        r = client.post(
+            "/api/sessions",
+            json={
+                "exercise_type_id": run,
+                "duration": minutes,
+                "calories": 1,
+                "date": when.isoformat(),
+            },
+            headers=h,
+        )
+        assert r.status_code == 201
+
+    goal = {"description": "w", "target_value": 30, "period": "weekly", "metric": "duration"}
+    goal_id = client.post("/api/goals", json=goal, headers=h).get_json()["id"]
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        r = client.get(f"/api/goals/{goal_id}/history?periods=4", headers=h)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert r.status_code == 200
+    history = r.get_json()["history"]
+    assert [p["value"] for p in history] == [50, 0, 10, 40]
+    assert [p["status"] for p in history] == ["achieved", "missed", "missed", "achieved"]
+    assert sum("daily_activity_rollup" in s for s in statements) == 1
+
+    current = client.get(f"/api/goals/{goal_id}/progress", headers=h).get_json()["progress"]
+    assert history[-1]["window"] == current["window"]
+    assert history[-1]["value"] == current["value"]
+
+
+def test_goal_history_rejects_bad_requests(client):
+    h = auth_headers(client)
+    dated = {"description": "d", "target_value": 5, "period": "weekly", "metric": "sessions",
+             "start_date": "2000-01-01", "end_date": "2000-12-31"}
+    dated_id = client.post("/api/goals", json=dated, headers=h).get_json()["id"]
+    assert client.get(f"/api/goals/{dated_id}/history", headers=h).status_code == 400
+    assert client.get(f"/api/goals/{dated_id}/history?periods=0", headers=h).status_code == 400
+    assert client.get("/api/goals/999999/history", headers=h).status_code == 404
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select, text
+
+try:
+    from backend.extensions import db
+    from backend.models import WorkoutSession
+except Exception:
+    from extensions import db
+    from models import WorkoutSession
+
+
+def _plan(stmt) -> str:
+    sql = stmt.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(str(r[-1]) for r in rows)
+
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 2, 1)
+
+
+@pytest.mark.parametrize(
+    "stmt, index",
+    [
+        (
+            select(WorkoutSession.id)
+            .where(WorkoutSession.user_id == 1, WorkoutSession.date >= START)
+            .order_by(WorkoutSession.date.desc()),
+            "ix_workout_session_user_id_date",
+        ),
+        (
+            select(func.sum(WorkoutSession.duration)).where(
+                WorkoutSession.user_id == 1,
+                WorkoutSession.date >= START,
+                WorkoutSession.date < END,
+            ),
+            "ix_workout_session_user_id_date",
+        ),
+        (
+            select(func.count(WorkoutSession.id)).where(
+                WorkoutSession.user_id == 1,
+                WorkoutSession.exercise_type_id == 2,
+                WorkoutSession.date >= START,
+                WorkoutSession.date < END,
+            ),
+            "ix_workout_session_user_id_exercise_type_id_date",
+        ),
+    ],
+)
+def test_workout_session_queries_use_composite_index(app, stmt, index):
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            pytest.skip("query plan check is SQLite specific")
+        plan = _plan(stmt)
+        assert index in plan, plan
+        assert "SCAN workout_session\n" not in plan + "\n", plan
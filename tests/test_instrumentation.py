@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+
+try:
+    from backend import config
+    from backend.app import create_app
+    from backend.extensions import db
+    from backend.utils.instrumentation import metrics
+except Exception:
+    import config
+    from app import create_app
+    from extensions import db
+    from utils.instrumentation import metrics
+
+
+@pytest.fixture
+def instrumented(monkeypatch):
+    monkeypatch.setattr(config, "INSTRUMENTATION_ENABLED", True)
+    monkeypatch.setattr(config, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(config, "METRICS_TOKEN", "scrape-token")
+    metrics.reset()
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        db.create_all()
+    try:
+        yield app.test_client()
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+
+def test_server_timing_and_metrics(instrumented, caplog):
+    client = instrumented
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "pw"}).get_json()
+    h = {"Authorization": f"Bearer {token['access_token']}"}
+
+    with caplog.at_level("WARNING", logger="backend.sql.slow"):
+        r = client.get("/api/goals?with_progress=true", headers=h)
+    assert r.status_code == 200
+    timing = r.headers["Server-Timing"]
+    assert timing.startswith("app;dur=")
+    assert "queries" in timing
+    assert any("slow query" in rec.getMessage() for rec in caplog.records)
+
+    assert client.get("/api/metrics").status_code == 401
+    assert client.get("/api/metrics", headers=h).status_code == 401
+    r = client.get("/api/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert r.status_code == 200
+    body = r.get_data(as_text=True)
+    assert "# TYPE http_requests_total counter" in body
+    assert 'http_requests_total{endpoint="goallist",method="GET",status="200"} 1' in body
+    assert 'db_queries_total{endpoint="goallist"}' in body
+    assert 'http_request_duration_seconds_bucket{endpoint="goallist",le="+Inf"} 1' in body
+    assert "response_cache_hits_total" in body
+
+
+def test_metrics_endpoint_is_opt_in(client):
+    assert client.get("/api/metrics").status_code == 404
@@ -0,0 +1,39 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+
+try:
+    from backend.app import create_app
+    from backend.utils.logging import JsonFormatter, SamplingFilter
+except Exception:
+    from app import create_app
+    from utils.logging import JsonFormatter, SamplingFilter
+
+
+def test_setup_logging_is_idempotent(app):
+    create_app()
+    create_app()
+    queue_handlers = [h for h in logging.getLogger().handlers if isinstance(h, QueueHandler)]
+    assert len(queue_handlers) == 1
+
+
+def test_json_formatter_keeps_extra_fields():
+    record = logging.LogRecord("backend.x", logging.INFO, __file__, 1, "hi %s", ("there",), None)
+    record.user_id = 7
+    out = json.loads(JsonFormatter().format(record))
+    assert out["message"] == "hi there"
+    assert out["logger"] == "backend.x"
+    assert out["level"] == "INFO"
+    assert out["user_id"] == 7
+
+
+def test_sampling_filter_keeps_every_nth_below_warning():
+    f = SamplingFilter({"backend.sql": 0.25})
+
+    def rec(name, level=logging.INFO):
+        return logging.LogRecord(name, level, __file__, 1, "m", None, None)
+
+    kept = sum(f.filter(rec("backend.sql.slow")) for _ in range(8))
+    assert kept == 2
+    assert f.filter(rec("backend.sql", logging.WARNING))
+    assert all(f.filter(rec("backend.other")) for _ in range(3))
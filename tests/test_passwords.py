@@ -0,0 +1,68 @@
+import uuid
+
+
+def _hasher():
+    try:
+        from backend.extensions import password_hasher
+    except Exception:
+        from extensions import password_hasher
+    return password_hasher
+
+
+def _register(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    r = client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    assert r.status_code == 201
+    return email
+
+
+def test_login_upgrades_hash_when_method_changes(app, client):
+    try:
+        from backend.models import User
+    except Exception:
+        from models import User
+
+    hasher = _hasher()
+    email = _register(client)
+    with app.app_context():
+        assert User.query.filter_by(email=email).one().password_hash.startswith("scrypt:")
+
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    hasher.init_app(app)
+    try:
+        r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+        assert r.status_code == 200
+        with app.app_context():
+            stored = User.query.filter_by(email=email).one().password_hash
+        assert stored.startswith("pbkdf2:sha256:1000$")
+        assert not hasher.needs_rehash(stored)
+
+        r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+        assert r.status_code == 200
+        r = client.post("/api/auth/login", json={"email": email, "password": "nope"})
+        assert r.status_code == 401
+    finally:
+        app.config["PASSWORD_HASH_METHOD"] = "scrypt"
+        hasher.init_app(app)
+
+
+def test_saturated_hasher_answers_429(app, client):
+    hasher = _hasher()
+    email = _register(client)
+
+    app.config["PASSWORD_HASH_MAX_PENDING"] = 1
+    hasher.init_app(app)
+    assert hasher._slots.acquire(blocking=False)
+    try:
+        r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+        assert r.status_code == 429
+        assert r.headers["Retry-After"] == "1"
+        r = client.post("/api/auth/register", json={"email": f"x{email}", "password": "pw"})
+        assert r.status_code == 429
+    finally:
+        hasher._slots.release()
+        app.config["PASSWORD_HASH_MAX_PENDING"] = 32
+        hasher.init_app(app)
+
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    assert r.status_code == 200
@@ -0,0 +1,61 @@
+import uuid
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed(client, h):
+    run = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    bike = client.post("/api/exercise-types", json={"name": "Bike"}, headers=h).get_json()["id"]
+    for etid, dur, kcal in ((run, 30, 300), (run, 20, 200), (bike, 60, 500)):
+        client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": dur, "calories": kcal},
+            headers=h,
+        )
+    return run, bike
+
+
+def test_summary_totals(client):
+    h = auth_headers(client)
+    _seed(client, h)
+    r = client.get("/api/reports/summary?range=month", headers=h)
+    assert r.status_code == 200
+    body = r.get_json()
+    assert body["totals"] == {"minutes": 110, "calories": 1000, "sessions": 3}
+    assert "breakdown" not in body
+
+
+def test_summary_group_by_exercise_type(client):
+    h = auth_headers(client)
+    run, bike = _seed(client, h)
+    r = client.get("/api/reports/summary?range=month&group_by=exercise_type", headers=h)
+    assert r.status_code == 200
+    body = r.get_json()
+    assert body["totals"]["sessions"] == 3
+    by_key = {b["key"]: b for b in body["breakdown"]}
+    assert by_key[run] == {"key": run, "minutes": 50, "calories": 500, "sessions": 2}
+    assert by_key[bike]["minutes"] == 60
+
+
+def test_summary_group_by_day_and_week(client):
+    h = auth_headers(client)
+    _seed(client, h)
+    for group_by in ("day", "week"):
+        r = client.get(f"/api/reports/summary?range=month&group_by={group_by}", headers=h)
+        assert r.status_code == 200
+        breakdown = r.get_json()["breakdown"]
+        assert len(breakdown) == 1
+        assert breakdown[0]["sessions"] == 3
+        assert len(breakdown[0]["key"]) == 10
+
+
+def test_summary_invalid_group_by(client):
+    h = auth_headers(client)
+    r = client.get("/api/reports/summary?group_by=hour", headers=h)
+    assert r.status_code == 400
@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+from werkzeug.exceptions import HTTPException
+
+try:
+    from backend.utils.schema import Arg, Schema
+except Exception:
+    from utils.schema import Arg, Schema
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+schema = Schema(
+    Arg("name", type=str, required=True),
+    Arg("count", type=int, default=3),
+    Arg("from", type=str, dest="date_from"),
+)
+
+
+def test_schema_reads_json_then_form(app):
+    with app.test_request_context(json={"name": "a", "count": "5", "from": "2025-01-01"}):
+        assert schema.parse() == {"name": "a", "count": 5, "date_from": "2025-01-01"}
+    with app.test_request_context(data={"name": "b"}):
+        assert schema.parse() == {"name": "b", "count": 3, "date_from": None}
+
+
+def test_schema_errors_are_400_with_field_message(app):
+    with app.test_request_context(json={"count": 1}):
+        with pytest.raises(HTTPException) as exc:
+            schema.parse()
+    assert exc.value.code == 400
+    assert exc.value.data["message"] == {
+        "name": "Missing required parameter in the JSON body or the post body"
+    }
+
+    with app.test_request_context(json={"name": "a", "count": "x"}):
+        with pytest.raises(HTTPException) as exc:
+            schema.parse()
+    assert exc.value.code == 400
+    assert "count" in exc.value.data["message"]
+
+
+def test_validator_messages_are_kept(client):
+    h = auth_headers(client)
+    r = client.post(
+        "/api/goals",
+        json={"description": "g", "target_value": 0, "period": "weekly", "metric": "sessions"},
+        headers=h,
+    )
+    assert r.status_code == 400
+    assert r.get_json()["message"] == "target_value must be > 0"
+
+    r = client.post("/api/sessions", json={"exercise_type_id": 1, "duration": "x"}, headers=h)
+    assert r.status_code == 400
+    assert r.get_json()["message"] == "Value must be an integer."
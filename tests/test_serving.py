@@ -0,0 +1,77 @@
+import os
+import runpy
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    from backend.benchmarks.bench_concurrency import StubProvider
+    from backend.models import User
+except Exception:
+    from benchmarks.bench_concurrency import StubProvider
+    from models import User
+
+CONF = Path(__file__).resolve().parents[1] / "gunicorn.conf.py"
+
+
+def _load_conf(monkeypatch, **env):
+    environ = {k: v for k, v in os.environ.items() if not k.startswith(("GUNICORN_", "DB_POOL"))}
+    environ.pop("WEB_CONCURRENCY", None)
+    environ.pop("OAUTH_MAX_INFLIGHT", None)
+    environ.update(env)
+    monkeypatch.setattr(os, "environ", environ)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 2, 3}, raising=False)
+    return runpy.run_path(str(CONF)), environ
+
+
+def test_gunicorn_conf_sizes_from_cpus(monkeypatch):
+    conf, environ = _load_conf(monkeypatch)
+    assert conf["worker_class"] == "gthread"
+    assert (conf["workers"], conf["threads"]) == (5, 8)
+    assert conf["preload_app"] is True
+    assert environ["DB_POOL_SIZE"] == "8"
+    assert environ["OAUTH_MAX_INFLIGHT"] == "4"
+
+    conf, _ = _load_conf(monkeypatch, GUNICORN_WORKER_CLASS="sync")
+    assert (conf["workers"], conf["threads"]) == (9, 1)
+
+    conf, _ = _load_conf(monkeypatch, WEB_CONCURRENCY="3", GUNICORN_THREADS="16")
+    assert (conf["workers"], conf["threads"]) == (3, 16)
+
+
+def _sign_in(client):
+    r = client.get("/api/auth/google/login")
+    assert r.status_code == 302
+    state = parse_qs(urlsplit(r.headers["Location"]).query)["state"][0]
+    return client.get(f"/api/auth/google/callback?code=stub&state={state}")
+
+
+def test_google_callback_against_stub_and_inflight_limit(app, client):
+    with StubProvider(delay=0) as stub:
+        app.config.update(
+            GOOGLE_CLIENT_ID="stub",
+            GOOGLE_CLIENT_SECRET="stub",
+            GOOGLE_METADATA_URL=stub.metadata_url,
+            OAUTH_MAX_INFLIGHT=1,
+        )
+        app.extensions.pop("oauth_google_client", None)
+        app.extensions.pop("oauth_google_slots", None)
+
+        r = _sign_in(client)
+        assert r.status_code == 302
+        assert "access_token=" in r.headers["Location"]
+        with app.app_context():
+            user = User.query.filter_by(provider="google", provider_sub="stub-1").first()
+            assert user is not None and user.email == "stub-1@stub.dev"
+
+        # With the only slot taken by a slow callback, the next one is turned away.
+        slots = app.extensions["oauth_google_slots"]
+        assert slots.acquire(blocking=False)
+        try:
+            r = _sign_in(client)
+        finally:
+            slots.release()
+        assert r.status_code == 503
+        assert r.headers["Retry-After"] == "1"
+
+    app.extensions.pop("oauth_google_client", None)
+    app.extensions.pop("oauth_google_slots", None)
@@ -0,0 +1,269 @@
+import json
+import uuid
+
+from sqlalchemy import event, update
+
+try:
+    from backend.extensions import db
+    from backend.models import WorkoutSession
+except Exception:
+    from extensions import db
+    from models import WorkoutSession
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _etype(client, h, name="Run"):
+    return client.post("/api/exercise-types", json={"name": name}, headers=h).get_json()["id"]
+
+
+def test_session_cursor_pagination_walks_all_rows(client):
+    h = auth_headers(client)
+    etid = _etype(client, h)
+    created = set()
+    for i in range(7):
+        day = "2025-01-0%d" % (1 + i % 3)
+        r = client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": 10 + i, "calories": 100, "date": day},
+            headers=h,
+        )
+        created.add(r.get_json()["id"])
+
+    seen = []
+    cursor = ""
+    while True:
+        r = client.get(
+            f"/api/sessions?page_size=3&include_total=false&cursor={cursor}", headers=h
+        )
+        assert r.status_code == 200
+        body = r.get_json()
+        assert body["total"] is None
+        seen += [it["id"] for it in body["items"]]
+        if not body["next_cursor"]:
+            break
+        cursor = body["next_cursor"]
+
+    assert len(seen) == len(created)
+    assert set(seen) == created
+
+
+def test_session_cursor_skips_rows_without_date(app, client):
+    h = auth_headers(client)
+    etid = _etype(client, h)
+    ids = [
+        client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": 10, "calories": 100},
+            headers=h,
+        ).get_json()["id"]
+        for _ in range(3)
+    ]
+    with app.app_context():
+        db.session.execute(
+            update(WorkoutSession).where(WorkoutSession.id == ids[0]).values(date=None)
+        )
+        db.session.commit()
+
+    body = client.get("/api/sessions?page_size=1&cursor=", headers=h).get_json()
+    assert body["total"] == 2
+    seen = [it["id"] for it in body["items"]]
+    while body["next_cursor"]:
+        body = client.get(
+            f"/api/sessions?page_size=1&cursor={body['next_cursor']}", headers=h
+        ).get_json()
+        seen += [it["id"] for it in body["items"]]
+    assert sorted(seen) == ids[1:]
+
+
+def test_session_offset_pagination_keeps_total(client):
+    h = auth_headers(client)
+    etid = _etype(client, h)
+    for _ in range(3):
+        client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": 10, "calories": 100},
+            headers=h,
+        )
+    body = client.get("/api/sessions?page=2&page_size=2", headers=h).get_json()
+    assert body["total"] == 3
+    assert body["page"] == 2
+    assert len(body["items"]) == 1
+
+
+def test_invalid_cursor_returns_400(client):
+    h = auth_headers(client)
+    assert client.get("/api/sessions?cursor=bogus", headers=h).status_code == 400
+    assert client.get("/api/goals?cursor=bogus", headers=h).status_code == 400
+
+
+def test_goal_cursor_pagination(client):
+    h = auth_headers(client)
+    ids = []
+    for i in range(5):
+        r = client.post(
+            "/api/goals",
+            json={"description": f"g{i}", "target_value": 1, "period": "weekly",
+                  "metric": "sessions"},
+            headers=h,
+        )
+        ids.append(r.get_json()["id"])
+
+    first = client.get("/api/goals?page_size=2&cursor=", headers=h).get_json()
+    assert [it["id"] for it in first["items"]] == sorted(ids, reverse=True)[:2]
+    assert first["total"] == 5
+
+    second = client.get(f"/api/goals?page_size=2&cursor={first['next_cursor']}", headers=h)
+    assert [it["id"] for it in second.get_json()["items"]] == sorted(ids, reverse=True)[2:4]
+
+
+def _rollup_rows(app):
+    try:
+        from backend.models import DailyActivityRollup
+    except Exception:
+        from models import DailyActivityRollup
+
+    with app.app_context():
+        return sorted(
+            (r.day.isoformat(), r.duration_sum, r.calories_sum, r.session_count)
+            for r in DailyActivityRollup.query.all()
+        )
+
+
+def test_rollup_follows_session_writes(app, client):
+    h = auth_headers(client)
+    etid = _etype(client, h)
+    a = client.post(
+        "/api/sessions",
+        json={"exercise_type_id": etid, "duration": 30, "calories": 300, "date": "2025-03-01"},
+        headers=h,
+    ).get_json()["id"]
+    client.post(
+        "/api/sessions",
+        json={"exercise_type_id": etid, "duration": 10, "calories": 100, "date": "2025-03-01"},
+        headers=h,
+    )
+    assert _rollup_rows(app) == [("2025-03-01", 40, 400, 2)]
+
+    r = client.put(f"/api/sessions/{a}", json={"duration": 50, "date": "2025-03-02"}, headers=h)
+    assert r.status_code == 200
+    assert _rollup_rows(app) == [("2025-03-01", 10, 100, 1), ("2025-03-02", 50, 300, 1)]
+
+    assert client.delete(f"/api/sessions/{a}", headers=h).status_code == 204
+    assert _rollup_rows(app) == [("2025-03-01", 10, 100, 1)]
+
+    result = app.test_cli_runner().invoke(args=["rollup", "rebuild"])
+    assert result.exit_code == 0, result.output
+    assert _rollup_rows(app) == [("2025-03-01", 10, 100, 1)]
+
+
+def test_rollup_add_is_a_single_upsert(app, client):
+    h = auth_headers(client)
+    etid = _etype(client, h)
+    day = "2025-04-01"
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        if "daily_activity_rollup" in statement and not statement.lstrip().startswith("SELECT"):
+            statements.append(" ".join(statement.split()))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for minutes in (30, 10):
+            client.post(
+                "/api/sessions",
+                json={"exercise_type_id": etid, "duration": minutes, "calories": 1, "date": day},
+                headers=h,
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    # No UPDATE-then-INSERT window for a concurrent first-of-the-day write to fall into.
+    assert len(statements) == 2
+    assert all(s.startswith("INSERT") and "ON CONFLICT" in s for s in statements)
+    assert _rollup_rows(app) == [("2025-04-01", 40, 2, 2)]
+
+
+def test_bulk_import_json_array_reports_row_errors(app, client):
+    h = auth_headers(client)
+    etid = _etype(client, h)
+    rows = [
+        {"exercise_type_id": etid, "duration": 30, "calories": 300, "date": "2024-05-01"},
+        {"exercise_type_id": etid, "duration": 0, "calories": 100},
+        {"exercise_type_id": 999999, "duration": 10, "calories": 100},
+        {"exercise_type_id": etid, "duration": 20, "calories": 200, "date": "2024-05-01"},
+        {"exercise_type_id": etid, "duration": 5, "calories": 50, "date": "nope"},
+    ]
+    app.config["SESSIONS_BULK_CHUNK_SIZE"] = 1
+    r = client.post("/api/sessions/bulk", json=rows, headers=h)
+    assert r.status_code == 201
+    body = r.get_json()
+    assert body["inserted"] == 2
+    assert [e["index"] for e in body["errors"]] == [1, 2, 4]
+    assert body["errors"][0]["message"] == "Value must be > 0."
+    assert body["errors"][1]["message"] == "Exercise type not found"
+
+    assert client.get("/api/sessions", headers=h).get_json()["total"] == 2
+    assert _rollup_rows(app) == [("2024-05-01", 50, 500, 2)]
+
+
+def test_bulk_import_ndjson(client):
+    h = auth_headers(client)
+    etid = _etype(client, h)
+    lines = [
+        '{"exercise_type_id": %d, "duration": %d, "calories": 10}' % (etid, i + 1)
+        for i in range(25)
+    ]
+    lines.insert(3, "{not json")
+    r = client.post(
+        "/api/sessions/bulk",
+        data="\n".join(lines) + "\n",
+        headers={**h, "Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 201
+    body = r.get_json()
+    assert body["inserted"] == 25
+    assert body["errors"] == [{"index": 3, "message": "Invalid JSON."}]
+
+
+def test_bulk_import_rejects_non_array(client):
+    h = auth_headers(client)
+    r = client.post("/api/sessions/bulk", json={"duration": 1}, headers=h)
+    assert r.status_code == 400
+
+
+def test_export_csv_and_ndjson(client):
+    h = auth_headers(client)
+    etid = _etype(client, h, "Swim")
+    for day in ("2025-01-02", "2025-01-01", "2025-02-01"):
+        client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": 10, "calories": 90, "date": day},
+            headers=h,
+        )
+
+    r = client.get("/api/sessions/export?format=csv&date_to=2025-01-31", headers=h)
+    assert r.status_code == 200
+    assert r.mimetype == "text/csv"
+    lines = r.get_data(as_text=True).splitlines()
+    assert lines[0] == "id,exercise_type_id,exercise_type,duration,calories,date"
+    assert [ln.split(",")[-1] for ln in lines[1:]] == [
+        "2025-01-01T00:00:00+00:00",
+        "2025-01-02T00:00:00+00:00",
+    ]
+
+    r = client.get("/api/sessions/export?format=ndjson", headers=h)
+    assert r.mimetype == "application/x-ndjson"
+    rows = [json.loads(ln) for ln in r.get_data(as_text=True).splitlines()]
+    assert len(rows) == 3
+    assert rows[0]["exercise_type"] == "Swim"
+
+    assert client.get("/api/sessions/export?format=xml", headers=h).status_code == 400
@@ -0,0 +1,93 @@
+import uuid
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _setup_goal(client, h):
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    client.post(
+        "/api/sessions",
+        json={"exercise_type_id": etid, "duration": 30, "calories": 300},
+        headers=h,
+    )
+    r = client.post(
+        "/api/goals",
+        json={"description": "d", "target_value": 100, "period": "weekly", "metric": "duration"},
+        headers=h,
+    )
+    return etid, r.get_json()["id"]
+
+
+def test_progress_served_from_snapshot_after_refresh(app, client):
+    h = auth_headers(client)
+    etid, goal_id = _setup_goal(client, h)
+
+    r = client.get(f"/api/goals/{goal_id}/progress", headers=h)
+    assert r.status_code == 200
+    assert r.get_json()["progress"]["freshness"]["source"] == "live"
+
+    result = app.test_cli_runner().invoke(args=["snapshots", "refresh"])
+    assert result.exit_code == 0, result.output
+
+    body = client.get(f"/api/goals/{goal_id}/progress", headers=h).get_json()["progress"]
+    assert body["freshness"]["source"] == "snapshot"
+    assert body["value"] == 30
+
+    items = client.get("/api/goals?with_progress=true", headers=h).get_json()["items"]
+    assert items[0]["progress"]["freshness"]["source"] == "snapshot"
+
+
+def test_session_write_marks_snapshot_dirty(app, client):
+    h = auth_headers(client)
+    etid, goal_id = _setup_goal(client, h)
+    app.test_cli_runner().invoke(args=["snapshots", "refresh"])
+
+    client.post(
+        "/api/sessions",
+        json={"exercise_type_id": etid, "duration": 15, "calories": 100},
+        headers=h,
+    )
+    body = client.get(f"/api/goals/{goal_id}/progress", headers=h).get_json()["progress"]
+    assert body["freshness"]["source"] == "live"
+    assert body["value"] == 45
+
+    app.test_cli_runner().invoke(args=["snapshots", "refresh"])
+    body = client.get(f"/api/goals/{goal_id}/progress", headers=h).get_json()["progress"]
+    assert body["freshness"]["source"] == "snapshot"
+    assert body["value"] == 45
+
+
+def test_refresh_keeps_dirty_flag_when_marked_concurrently(app, client):
+    try:
+        from backend.extensions import db
+        from backend.models import Goal, GoalProgressSnapshot
+        from backend.utils import snapshots
+        from backend.utils.progress import compute_goal_progress
+    except Exception:
+        from extensions import db
+        from models import Goal, GoalProgressSnapshot
+        from utils import snapshots
+        from utils.progress import compute_goal_progress
+
+    h = auth_headers(client)
+    _, goal_id = _setup_goal(client, h)
+
+    with app.app_context():
+        snapshots.refresh_all()
+        goal = db.session.get(Goal, goal_id)
+        seen = db.session.get(GoalProgressSnapshot, goal_id).revision
+
+        snapshots.mark_goal_dirty(goal_id)
+        db.session.commit()
+
+        # A refresh that read the row before the mark must not clear it.
+        snapshots._store(goal, seen, compute_goal_progress(goal), snapshots.now_utc_naive())
+        db.session.commit()
+        db.session.expire_all()
+        assert db.session.get(GoalProgressSnapshot, goal_id).dirty is True
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+STARTUP_BUDGET_US = 3_000_000
+LAZY_MODULES = ("authlib", "numpy", "requests")
+
+
+def _importtime(module: str) -> dict[str, int]:
+    import backend
+
+    root = os.path.dirname(os.path.dirname(backend.__file__))
+    env = {**os.environ, "PYTHONPATH": root + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+def test_importing_app_module_is_cheap_and_side_effect_free():
+    modules = _importtime("backend.app")
+
+    heavy = [m for m in modules if m.split(".")[0] in LAZY_MODULES]
+    assert heavy == [], f"imported at startup: {heavy}"
+    assert modules["backend.app"] < STARTUP_BUDGET_US
+
+    try:
+        import backend.app as app_module
+    except Exception:
+        import app as app_module
+    assert not hasattr(app_module, "app")
+
+
+def test_oauth_client_registered_on_first_use(app):
+    try:
+        from backend.resources.oauth_google import _google
+    except Exception:
+        from resources.oauth_google import _google
+
+    assert "oauth_google_client" not in app.extensions
+    with app.test_request_context("/api/auth/google/login"):
+        client = _google()
+        assert client is not None
+        assert _google() is client
+    assert app.extensions["oauth_google_client"] is client
+
+
+def test_after_fork_restarts_logging_and_resets_pool(app, client):
+    try:
+        from backend.utils import logging as app_logging
+        from backend.utils.prefork import after_fork_in_child
+    except Exception:
+        from utils import logging as app_logging
+        from utils.prefork import after_fork_in_child
+
+    before = app_logging._state["listener"]
+    after_fork_in_child(app)
+    assert app_logging._state["listener"] is not before
+    assert client.get("/api/health").status_code == 200
@@ -0,0 +1,109 @@
+import uuid
+from datetime import datetime, timedelta
+
+
+def auth_headers(client):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    client.post("/api/auth/register", json={"email": email, "password": "pw"})
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _add(client, h, etid, days_ago, duration, calories=100):
+    when = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    r = client.post(
+        "/api/sessions",
+        json={
+            "exercise_type_id": etid,
+            "duration": duration,
+            "calories": calories,
+            "date": (when - timedelta(days=days_ago)).isoformat(),
+        },
+        headers=h,
+    )
+    assert r.status_code == 201
+    return r.get_json()["id"]
+
+
+def _overview(client, h):
+    r = client.get("/api/stats/overview", headers=h)
+    assert r.status_code == 200
+    return r.get_json()
+
+
+def test_streaks_and_records_follow_session_writes(app, client):
+    h = auth_headers(client)
+    run = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+
+    assert _overview(client, h)["streaks"]["current"] == 0
+
+    _add(client, h, run, 5, 10)
+    _add(client, h, run, 4, 20)
+    _add(client, h, run, 1, 30)
+    best = _add(client, h, run, 0, 90, calories=900)
+
+    body = _overview(client, h)
+    assert body["streaks"]["current"] == 2
+    assert body["streaks"]["longest"] == 2
+    rec = body["personal_records"][0]
+    assert rec["exercise_type"] == "Run"
+    assert rec["longest_session"]["duration"] == 90
+    assert rec["most_calories"]["calories"] == 900
+
+    # Backdated inserts fill the gap and join everything into one run.
+    _add(client, h, run, 3, 15)
+    _add(client, h, run, 2, 15)
+    assert _overview(client, h)["streaks"]["longest"] == 6
+
+    assert client.delete(f"/api/sessions/{best}", headers=h).status_code == 204
+    body = _overview(client, h)
+    assert body["streaks"]["current"] == 5
+    assert body["personal_records"][0]["longest_session"]["duration"] == 30
+
+    sid = _add(client, h, run, 3, 5)
+    client.put(f"/api/sessions/{sid}", json={"duration": 120}, headers=h)
+    assert _overview(client, h)["personal_records"][0]["longest_session"]["duration"] == 120
+
+
+def test_incremental_state_matches_recompute(app, client):
+    try:
+        from backend.extensions import db
+        from backend.models import ExerciseType, UserExerciseStats, UserStats
+        from backend.utils import stats
+    except Exception:
+        from extensions import db
+        from models import ExerciseType, UserExerciseStats, UserStats
+        from utils import stats
+
+    h = auth_headers(client)
+    run = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    ids = [_add(client, h, run, d, 10 + d, 50 + d) for d in (9, 8, 7, 3, 2, 0)]
+    client.delete(f"/api/sessions/{ids[1]}", headers=h)
+    client.delete(f"/api/sessions/{ids[0]}", headers=h)
+    r = client.post(
+        "/api/sessions/bulk",
+        json=[{"exercise_type_id": run, "duration": 5, "calories": 5, "date": "2001-01-01"}],
+        headers=h,
+    )
+    assert r.status_code in (200, 201)
+
+    def snapshot(user_id):
+        s = db.session.get(UserStats, user_id)
+        recs = UserExerciseStats.query.filter_by(user_id=user_id).all()
+        return (
+            s.last_active_day,
+            s.current_streak_start,
+            s.longest_streak,
+            s.longest_streak_start,
+            s.longest_streak_end,
+            sorted((r.exercise_type_id, r.longest_duration, r.most_calories) for r in recs),
+        )
+
+    with app.app_context():
+        user_id = db.session.get(ExerciseType, run).user_id
+        incremental = snapshot(user_id)
+        stats.recompute(user_id)
+        db.session.flush()
+        assert snapshot(user_id) == incremental
+        db.session.rollback()
@@ -0,0 +1,205 @@
+import uuid
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+
+try:
+    from backend.extensions import db
+    from backend.models import Goal, User
+    from backend.utils.dates import current_window, window_bounds
+    from backend.utils.progress import compute_goal_progress
+except Exception:
+    from extensions import db
+    from models import Goal, User
+    from utils.dates import current_window, window_bounds
+    from utils.progress import compute_goal_progress
+
+
+def auth_headers(client, tz=None):
+    email = f"{uuid.uuid4().hex}@test.dev"
+    payload = {"email": email, "password": "pw"}
+    if tz:
+        payload["timezone"] = tz
+    assert client.post("/api/auth/register", json=payload).status_code == 201
+    r = client.post("/api/auth/login", json={"email": email, "password": "pw"})
+    token = r.get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_windows_follow_local_calendar_and_dst():
+    # Monday 01:00 UTC is already Monday afternoon in Auckland (UTC+13).
+    ref = datetime(2026, 10, 19, 1, 0)
+    assert current_window("weekly", ref) == (datetime(2026, 10, 19), datetime(2026, 10, 26))
+    assert current_window("weekly", ref, "Pacific/Auckland") == (
+        datetime(2026, 10, 18, 11, 0),
+        datetime(2026, 10, 25, 11, 0),
+    )
+
+    # Warsaw switches to summer time during March: +01:00 at the start, +02:00 at the end.
+    start, end = current_window("monthly", datetime(2026, 3, 15, 12), "Europe/Warsaw")
+    assert (start, end) == (datetime(2026, 2, 28, 23, 0), datetime(2026, 3, 31, 22, 0))
+
+    before = window_bounds.cache_info().hits
+    for hour in range(24):
+        current_window("yearly", datetime(2026, 6, 1, hour), "America/New_York")
+    assert window_bounds.cache_info().hits >= before + 22
+
+
+def test_session_dates_are_stored_as_naive_utc(app, client):
+    h = auth_headers(client)
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    r = client.post(
+        "/api/sessions",
+        json={
+            "exercise_type_id": etid,
+            "duration": 30,
+            "calories": 300,
+            "date": "2026-03-01T08:30:00+02:00",
+        },
+        headers=h,
+    )
+    assert r.status_code == 201
+    sid = r.get_json()["id"]
+    items = client.get("/api/sessions", headers=h).get_json()["items"]
+    assert [i["date"] for i in items if i["id"] == sid] == ["2026-03-01T06:30:00+00:00"]
+
+    with app.app_context():
+        stored = db.session.execute(
+            text("SELECT date FROM workout_session WHERE id = :id"), {"id": sid}
+        ).scalar()
+    assert stored.startswith("2026-03-01 06:30:00")
+
+
+def test_weekly_goal_uses_owner_timezone(app, client):
+    h = auth_headers(client, tz="Pacific/Auckland")
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    # Sunday 12:00 UTC is Monday 01:00 in Auckland; Sunday 10:00 UTC is still Sunday there.
+    for when, minutes in (("2026-10-18T12:00:00Z", 40), ("2026-10-18T10:00:00Z", 15)):
+        r = client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": minutes, "calories": 1, "date": when},
+            headers=h,
+        )
+        assert r.status_code == 201
+    r = client.post(
+        "/api/goals",
+        json={"description": "w", "target_value": 100, "period": "weekly", "metric": "duration"},
+        headers=h,
+    )
+    goal_id = r.get_json()["id"]
+
+    with app.app_context():
+        goal = db.session.get(Goal, goal_id)
+        progress = compute_goal_progress(goal, now=datetime(2026, 10, 19, 1, 0))
+        assert progress.value == 40
+        assert progress.window["start"] == "2026-10-18T11:00:00"
+
+        db.session.get(User, goal.user_id).timezone = "UTC"
+        progress = compute_goal_progress(goal, now=datetime(2026, 10, 19, 1, 0))
+        assert progress.value == 0
+
+
+def test_account_timezone_drives_summary_report(client):
+    h = auth_headers(client)
+    r = client.patch("/api/account/settings", json={"timezone": "Mars/Olympus"}, headers=h)
+    assert r.status_code == 400
+    assert client.get("/api/account/settings", headers=h).get_json()["timezone"] == "UTC"
+
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    client.post(
+        "/api/sessions",
+        json={"exercise_type_id": etid, "duration": 25, "calories": 250},
+        headers=h,
+    )
+    before = client.get("/api/reports/summary?range=week", headers=h)
+    assert before.get_json()["timezone"] == "UTC"
+
+    r = client.patch("/api/account/settings", json={"timezone": "Asia/Kolkata"}, headers=h)
+    assert r.status_code == 200
+    assert r.get_json()["timezone"] == "Asia/Kolkata"
+
+    after = client.get(
+        "/api/reports/summary?range=week&group_by=day",
+        headers={**h, "If-None-Match": before.headers["ETag"]},
+    )
+    assert after.status_code == 200
+    body = after.get_json()
+    assert body["timezone"] == "Asia/Kolkata"
+    assert body["window"]["start"].endswith("T18:30:00")
+    today = datetime.now(timezone.utc).astimezone(ZoneInfo("Asia/Kolkata")).date()
+    assert body["breakdown"] == [
+        {"key": today.isoformat(), "minutes": 25, "calories": 250, "sessions": 1}
+    ]
+    assert date.fromisoformat(body["breakdown"][0]["key"]).weekday() == today.weekday()
+
+
+def test_register_rejects_unknown_timezone(client):
+    r = client.post(
+        "/api/auth/register",
+        json={"email": f"{uuid.uuid4().hex}@test.dev", "password": "pw", "timezone": "Nowhere"},
+    )
+    assert r.status_code == 400
+
+
+def test_dates_without_offset_are_the_owners_local_time(app, client):
+    h = auth_headers(client, tz="America/Los_Angeles")
+    etid = client.post("/api/exercise-types", json={"name": "Run"}, headers=h).get_json()["id"]
+    ids = []
+    for when, minutes in (("2026-10-19", 30), ("2026-10-19T07:30", 20)):
+        r = client.post(
+            "/api/sessions",
+            json={"exercise_type_id": etid, "duration": minutes, "calories": 1, "date": when},
+            headers=h,
+        )
+        assert r.status_code == 201
+        ids.append(r.get_json()["id"])
+    items = client.get("/api/sessions?date_from=2026-10-19&date_to=2026-10-19", headers=h)
+    dates = {i["id"]: i["date"] for i in items.get_json()["items"]}
+    # Monday midnight and 07:30 in Los Angeles (UTC-7), not Sunday evening.
+    assert dates == {ids[0]: "2026-10-19T07:00:00+00:00", ids[1]: "2026-10-19T14:30:00+00:00"}
+
+    r = client.post(
+        "/api/goals",
+        json={"description": "w", "target_value": 100, "period": "weekly", "metric": "duration"},
+        headers=h,
+    )
+    with app.app_context():
+        goal = db.session.get(Goal, r.get_json()["id"])
+        progress = compute_goal_progress(goal, now=datetime(2026, 10, 19, 20, 0))
+        assert progress.window["start"] == "2026-10-19T07:00:00"
+        assert progress.value == 50
+
+
+def test_dated_goal_follows_owner_calendar_days(app, client):
+    h = auth_headers(client, tz="America/Los_Angeles")
+    r = client.post(
+        "/api/goals",
+        json={
+            "description": "d",
+            "target_value": 10,
+            "period": "weekly",
+            "metric": "sessions",
+            "start_date": "2026-10-19",
+            "end_date": "2026-10-25",
+        },
+        headers=h,
+    )
+    assert r.status_code == 201
+    with app.app_context():
+        goal = db.session.get(Goal, r.get_json()["id"])
+        assert (goal.start_date, goal.end_date) == (
+            datetime(2026, 10, 19, 7, 0),
+            datetime(2026, 10, 25, 7, 0),
+        )
+        # Inclusive end: the window closes at the end of the local 25th.
+        progress = compute_goal_progress(goal, now=datetime(2026, 10, 20))
+        assert progress.window == {"start": "2026-10-19T07:00:00", "end": "2026-10-26T07:00:00"}
+
+    r = client.put(f"/api/goals/{goal.id}", json={"end_date": "2026-11-01"}, headers=h)
+    assert r.status_code == 200
+    with app.app_context():
+        # Across the DST change (Nov 1), midnight is UTC-8 again.
+        goal = db.session.get(Goal, goal.id)
+        progress = compute_goal_progress(goal, now=datetime(2026, 10, 20))
+        assert progress.window["end"] == "2026-11-02T08:00:00"
@@ -0,0 +1,225 @@
+"""Vectorized trend analytics over a user's full session history.
+
+One streamed columnar fetch (``SessionColumns``) is viewed as NumPy arrays
+without per-row objects; bucketing, moving averages, streaks, percentiles
+and personal bests are then computed without per-row Python loops.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from .columns import SessionColumns
+
+BUCKETS = ("day", "week", "month")
+PERCENTILES = (50, 75, 90)
+
+# datetime64[D] day 0 (1970-01-01) is a Thursday; shift by 3 to land on Monday.
+_MONDAY_OFFSET = 3
+
+
+@dataclass(frozen=True)
+class History:
+    """Sessions as parallel arrays, sorted by date."""
+
+    dates: np.ndarray  # datetime64[s]
+    duration: np.ndarray  # int64
+    calories: np.ndarray  # int64
+    exercise_type_id: np.ndarray  # int64
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def days(self) -> np.ndarray:
+        return self.dates.astype("datetime64[D]")
+
+
+def load_history(
+    user_id: int,
+    *,
+    exercise_type_id: int | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> History:
+    cols = SessionColumns.load(user_id, exercise_type_id=exercise_type_id, start=start, end=end)
+    if len(cols) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return History(np.empty(0, dtype="datetime64[s]"), empty, empty, empty)
+
+    # frombuffer shares the arrays' memory; only the int32 columns are widened.
+    return History(
+        dates=np.frombuffer(cols.epochs, dtype=np.int64).astype("datetime64[s]"),
+        duration=np.frombuffer(cols.durations, dtype=np.int32).astype(np.int64),
+        calories=np.frombuffer(cols.calories, dtype=np.int32).astype(np.int64),
+        exercise_type_id=np.frombuffer(cols.exercise_type_ids, dtype=np.int64),
+    )
+
+
+def bucket_start(days: np.ndarray, bucket: str) -> np.ndarray:
+    """Map datetime64[D] values to the first day of their bucket."""
+    if bucket == "day":
+        return days
+    if bucket == "week":
+        ordinal = days.astype(np.int64)
+        return days - ((ordinal + _MONDAY_OFFSET) % 7).astype("timedelta64[D]")
+    if bucket == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+
+
+def bucket_keys(first: date, last: date, bucket: str) -> np.ndarray:
+    """Every bucket start between ``first`` and ``last`` inclusive."""
+    lo = bucket_start(np.array([first], dtype="datetime64[D]"), bucket)[0]
+    hi = bucket_start(np.array([last], dtype="datetime64[D]"), bucket)[0]
+    if bucket == "month":
+        months = np.arange(lo.astype("datetime64[M]"), hi.astype("datetime64[M]") + 1)
+        return months.astype("datetime64[D]")
+    step = 7 if bucket == "week" else 1
+    return np.arange(lo, hi + 1, step, dtype="datetime64[D]")
+
+
+def bucketed(history: History, keys: np.ndarray, bucket: str) -> dict[str, np.ndarray]:
+    """Dense per-bucket totals aligned with ``keys`` (empty buckets are zero)."""
+    n = len(keys)
+    if len(history) == 0 or n == 0:
+        zeros = np.zeros(n, dtype=np.int64)
+        return {"minutes": zeros, "calories": zeros, "sessions": zeros}
+
+    idx = np.searchsorted(keys, bucket_start(history.days, bucket), side="right") - 1
+    keep = (idx >= 0) & (idx < n)
+    idx = idx[keep]
+    return {
+        "minutes": np.bincount(idx, weights=history.duration[keep], minlength=n).astype(np.int64),
+        "calories": np.bincount(idx, weights=history.calories[keep], minlength=n).astype(np.int64),
+        "sessions": np.bincount(idx, minlength=n).astype(np.int64),
+    }
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` points; the first points average what exists."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return values
+    window = max(1, int(window))
+    csum = np.cumsum(values)
+    out = csum.copy()
+    out[window:] = csum[window:] - csum[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return out / counts
+
+
+def streaks(days: np.ndarray, today: date) -> dict:
+    """Current and longest run of consecutive active days.
+
+    The current streak survives until the end of the day after the last
+    session, so an unfinished today does not reset it.
+    """
+    active = np.unique(days)
+    if len(active) == 0:
+        return {"current": 0, "longest": 0, "longest_start": None, "longest_end": None}
+
+    ordinal = active.astype(np.int64)
+    breaks = np.flatnonzero(np.diff(ordinal) != 1)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [len(active) - 1]))
+    lengths = ends - starts + 1
+
+    best = int(np.argmax(lengths))
+    gap = (np.datetime64(today, "D") - active[-1]).astype(np.int64)
+    return {
+        "current": int(lengths[-1]) if gap <= 1 else 0,
+        "longest": int(lengths[best]),
+        "longest_start": str(active[starts[best]]),
+        "longest_end": str(active[ends[best]]),
+    }
+
+
+def percentiles(values: np.ndarray, qs=PERCENTILES) -> dict[str, float | None]:
+    if len(values) == 0:
+        return {f"p{q}": None for q in qs}
+    return {f"p{q}": round(float(v), 2) for q, v in zip(qs, np.percentile(values, qs))}
+
+
+def personal_bests(history: History, keys: np.ndarray, series: dict[str, np.ndarray]) -> dict:
+    if len(history) == 0:
+        return {"longest_session": None, "most_calories_session": None, "best_bucket": None}
+
+    def session_at(i: int) -> dict:
+        return {
+            "date": str(history.dates[i]),
+            "duration": int(history.duration[i]),
+            "calories": int(history.calories[i]),
+            "exercise_type_id": int(history.exercise_type_id[i]),
+        }
+
+    b = int(np.argmax(series["minutes"]))
+    return {
+        "longest_session": session_at(int(np.argmax(history.duration))),
+        "most_calories_session": session_at(int(np.argmax(history.calories))),
+        "best_bucket": {"key": str(keys[b]), "minutes": int(series["minutes"][b])},
+    }
+
+
+def timeseries(
+    history: History,
+    *,
+    bucket: str,
+    first: date,
+    last: date,
+    window: int,
+    today: date,
+) -> dict:
+    keys = bucket_keys(first, last, bucket)
+    series = bucketed(history, keys, bucket)
+    minutes_ma = moving_average(series["minutes"], window)
+    calories_ma = moving_average(series["calories"], window)
+
+    points = [
+        {
+            "key": k,
+            "minutes": m,
+            "calories": c,
+            "sessions": n,
+            "minutes_avg": round(ma, 2),
+            "calories_avg": round(ca, 2),
+        }
+        for k, m, c, n, ma, ca in zip(
+            np.datetime_as_string(keys).tolist(),
+            series["minutes"].tolist(),
+            series["calories"].tolist(),
+            series["sessions"].tolist(),
+            minutes_ma.tolist(),
+            calories_ma.tolist(),
+        )
+    ]
+    return {
+        "bucket": bucket,
+        "moving_average_window": window,
+        "series": points,
+        "totals": {
+            "minutes": int(history.duration.sum()),
+            "calories": int(history.calories.sum()),
+            "sessions": len(history),
+        },
+        "streaks": streaks(history.days, today),
+        "percentiles": {
+            "duration": percentiles(history.duration),
+            "calories": percentiles(history.calories),
+        },
+        "personal_bests": personal_bests(history, keys, series),
+    }
+
+
+def default_range(history: History, today: date) -> tuple[date, date]:
+    if len(history) == 0:
+        return today, today
+    first = history.dates[0].astype("datetime64[D]").item()
+    return first, max(today, history.dates[-1].astype("datetime64[D]").item())
+
+
+def span_days(first: date, last: date) -> int:
+    return (last - first) // timedelta(days=1) + 1
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+log = logging.getLogger(__name__)
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover
+    redis = None
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry TTL. Generations are never evicted."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def generation(self, user_id: int) -> int:
+        return self._generations.get(user_id, 0)
+
+    def bump(self, user_id: int) -> int:
+        with self._lock:
+            gen = self._generations.get(user_id, 0) + 1
+            self._generations[user_id] = gen
+        return gen
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generations.clear()
+
+
+class RedisBackend:
+    """Shared backend so every worker sees the same entries and generations."""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "ft:cache:"):
+        if redis is None:
+            raise RuntimeError("redis package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value, ttl: float) -> None:
+        self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def generation(self, user_id: int) -> int:
+        return int(self.client.get(f"{self.prefix}gen:{user_id}") or 0)
+
+    def bump(self, user_id: int) -> int:
+        return int(self.client.incr(f"{self.prefix}gen:{user_id}"))
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class ResponseCache:
+    """Short-TTL per-user cache for read-heavy aggregates.
+
+    Keys combine (user_id, endpoint, normalized args, window) with the
+    user's version and generation counter, so a write only has to bump either
+    to make every older entry for that user unreachable. The generation lives
+    in the backend, which for the memory backend means one process; the
+    version comes from ``version(user_id)`` (the app wires in
+    ``User.data_version``), which every worker reads from the database.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttl: float = 30.0,
+        version: Callable[[int], int] | None = None,
+    ):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.version = version
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app, version: Callable[[int], int] | None = None) -> None:
+        if version is not None:
+            self.version = version
+        self.enabled = bool(app.config.get("RESPONSE_CACHE_ENABLED", True))
+        self.ttl = float(app.config.get("RESPONSE_CACHE_TTL", 30))
+        url = app.config.get("RESPONSE_CACHE_URL") or ""
+        if url:
+            self.backend = RedisBackend(url)
+        else:
+            self.backend = MemoryBackend(int(app.config.get("RESPONSE_CACHE_SIZE", 1024)))
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+        app.extensions["response_cache"] = self
+
+    def key(self, user_id: int, endpoint: str, args: dict, window: str = "") -> str:
+        normalized = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        gen = self.backend.generation(user_id)
+        version = self.version(user_id) if self.version is not None else 0
+        return f"{user_id}:{version}.{gen}:{endpoint}:{window}:{digest}"
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value) -> None:
+        if self.enabled:
+            self.backend.set(key, value, self.ttl)
+
+    def get_or_set(
+        self,
+        user_id: int,
+        endpoint: str,
+        args: dict,
+        window: str,
+        compute: Callable[[], Any],
+    ):
+        key = self.key(user_id, endpoint, args, window)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, user_id: int) -> None:
+        self.backend.bump(user_id)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class ExerciseTypeCache:
+    """Per-user ``{exercise_type_id: name}`` map for ownership checks.
+
+    Kept apart from ResponseCache because session writes bump the user's
+    generation there, which would drop this map on every write. Entries
+    live for EXERCISE_TYPE_CACHE_TTL seconds and are deleted explicitly by
+    the exercise-type endpoints.
+    """
+
+    def __init__(self, backend=None, ttl: float = 300.0):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.enabled = True
+
+    def init_app(self, app) -> None:
+        self.enabled = bool(app.config.get("EXERCISE_TYPE_CACHE_ENABLED", True))
+        self.ttl = float(app.config.get("EXERCISE_TYPE_CACHE_TTL", 300))
+        url = app.config.get("RESPONSE_CACHE_URL") or ""
+        if url:
+            self.backend = RedisBackend(url, prefix="ft:etypes:")
+        else:
+            self.backend = MemoryBackend(int(app.config.get("RESPONSE_CACHE_SIZE", 1024)))
+        app.extensions["exercise_type_cache"] = self
+
+    def names(self, user_id: int, load: Callable[[int], dict[int, str]]) -> dict[int, str]:
+        key = str(user_id)
+        cached = self.backend.get(key) if self.enabled else None
+        if cached is not None:
+            # JSON round-trips (Redis) turn the int keys into strings.
+            return {int(k): v for k, v in cached.items()}
+        value = load(user_id)
+        if self.enabled:
+            self.backend.set(key, value, self.ttl)
+        return value
+
+    def invalidate(self, user_id: int) -> None:
+        self.backend.delete(str(user_id))
+
+    def clear(self) -> None:
+        self.backend.clear()
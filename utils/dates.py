@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Every DateTime column stores naive UTC. Local time only exists at the edges:
+# parsing input and deciding which local day/week/month a moment falls in.
+UTC = "UTC"
+PERIODS = ("weekly", "monthly", "yearly")
 
 
 @dataclass(frozen=True)
@@ -14,51 +21,149 @@ class Window:
 
 
 def now_utc_naive() -> datetime:
-    return datetime.utcnow().replace(tzinfo=None)
-
-
-def _midnight_utc(d: datetime) -> datetime:
-    return d.replace(hour=0, minute=0, second=0, microsecond=0)
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Canonical storage form: aware values are converted, naive ones are already UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@lru_cache(maxsize=None)
+def zone(name: str | None) -> ZoneInfo:
+    """ZoneInfo for an IANA name; ``None``/empty means UTC. Raises ValueError if unknown."""
+    try:
+        return ZoneInfo(name or UTC)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{name}'") from None
+
+
+def is_valid_timezone(name) -> bool:
+    if not isinstance(name, str) or not name:
+        return False
+    try:
+        zone(name)
+    except ValueError:
+        return False
+    return True
+
+
+def local_day(moment: datetime, tz: str | None = None) -> date:
+    """Calendar day of a naive-UTC ``moment`` as seen in ``tz``."""
+    if not tz or tz == UTC:
+        return moment.date()
+    return moment.replace(tzinfo=timezone.utc).astimezone(zone(tz)).date()
+
+
+def end_of_day_exclusive(d: datetime, tz: str | None = None) -> datetime:
+    """Exclusive end for an inclusive bound: a local midnight covers that whole local day."""
+    if not tz or tz == UTC:
+        if d.time() == time(0, 0, 0, 0):
+            return d + timedelta(days=1)
+        return d + timedelta(microseconds=1)
+    local = d.replace(tzinfo=timezone.utc).astimezone(zone(tz))
+    if local.time() == time(0, 0, 0, 0):
+        return _local_midnight_utc(local.date() + timedelta(days=1), zone(tz))
+    return d + timedelta(microseconds=1)
 
 
-def end_of_day_exclusive(d: datetime) -> datetime:
-    if d.time() == time(0, 0, 0, 0):
-        return d.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-    return d + timedelta(microseconds=1)
+def parse_local(value: str, tz: str | None = None) -> datetime:
+    """Naive UTC for ISO input; values without an offset are wall time in ``tz``.
 
+    ``YYYY-MM-DD`` is that day's local midnight. Raises ValueError on bad input.
+    """
+    if len(value) == 10:
+        day = date.fromisoformat(value)
+        if not tz or tz == UTC:
+            return datetime.combine(day, time(0))
+        return _local_midnight_utc(day, zone(tz))
+    dt = datetime.fromisoformat(value.replace(" ", "T"))
+    if dt.tzinfo is None and tz and tz != UTC:
+        dt = dt.replace(tzinfo=zone(tz))
+    return to_utc_naive(dt)
 
-def current_window(period: str, ref: datetime | None = None) -> tuple[datetime, datetime]:
-    base = _midnight_utc(ref or now_utc_naive())
-    p = (period or "").lower()
 
-    if p == "weekly":
-        start = base - timedelta(days=base.weekday())
-        end = start + timedelta(days=7)
-        return start, end
+def _period_days(period: str, day: date) -> tuple[date, date]:
+    if period == "weekly":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
 
-    if p == "monthly":
-        start = base.replace(day=1)
-        next_month = start.replace(
+    if period == "monthly":
+        start = day.replace(day=1)
+        end = start.replace(
             year=start.year + (start.month == 12),
             month=1 if start.month == 12 else start.month + 1,
         )
-        end = next_month
         return start, end
 
-    if p == "yearly":
-        start = base.replace(month=1, day=1)
-        end = start.replace(year=start.year + 1)
-        return start, end
+    if period == "yearly":
+        start = day.replace(month=1, day=1)
+        return start, start.replace(year=start.year + 1)
 
     raise ValueError("period must be one of: weekly, monthly, yearly")
 
 
+def _local_midnight_utc(day: date, tz: ZoneInfo) -> datetime:
+    local = datetime.combine(day, time(0), tzinfo=tz)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=4096)
+def window_bounds(tz: str, period: str, day: date) -> tuple[datetime, datetime]:
+    """Naive-UTC ``[start, end)`` of the local ``period`` containing local ``day``.
+
+    Memoized: the answer only depends on (tz, period, day), and a handful of
+    zones times three periods covers a day's worth of calls.
+    """
+    first, last = _period_days(period, day)
+    if tz == UTC:
+        return datetime.combine(first, time(0)), datetime.combine(last, time(0))
+    z = zone(tz)
+    return _local_midnight_utc(first, z), _local_midnight_utc(last, z)
+
+
+def current_window(
+    period: str,
+    ref: datetime | None = None,
+    tz: str | None = None,
+) -> tuple[datetime, datetime]:
+    """Window of ``period`` around ``ref`` (naive UTC, default now) in the user's zone."""
+    p = (period or "").lower()
+    if p not in PERIODS:
+        raise ValueError("period must be one of: weekly, monthly, yearly")
+    tz = tz or UTC
+    return window_bounds(tz, p, local_day(ref or now_utc_naive(), tz))
+
+
 def window_for_period(
     period: str,
     ref: datetime | None = None,
     now: datetime | None = None,
+    tz: str | None = None,
 ) -> Window:
     if now is not None and ref is None:
         ref = now
-    start, end = current_window(period, ref)
+    start, end = current_window(period, ref, tz)
     return Window(start=start, end=end)
+
+
+def recent_windows(
+    period: str,
+    count: int,
+    ref: datetime | None = None,
+    tz: str | None = None,
+) -> list[Window]:
+    """The last ``count`` windows of ``period``, oldest first; the final one is current."""
+    p = (period or "").lower()
+    if p not in PERIODS:
+        raise ValueError("period must be one of: weekly, monthly, yearly")
+    tz = tz or UTC
+    day = local_day(ref or now_utc_naive(), tz)
+    windows = []
+    for _ in range(count):
+        windows.append(Window(*window_bounds(tz, p, day)))
+        day = _period_days(p, day)[0] - timedelta(days=1)
+    windows.reverse()
+    return windows
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+log = logging.getLogger(__name__)
+
+
+def engine_options(uri: str, settings: dict) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS for the backend named by ``uri``.
+
+    ``settings`` is the app config with the DB_* / SQLITE_* values. SQLite
+    pragmas are not engine options; ``init_engine`` applies them on connect.
+    """
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        # pysqlite's own lock wait, in seconds; the busy_timeout pragma matches it.
+        return {"connect_args": {"timeout": settings["SQLITE_BUSY_TIMEOUT_MS"] / 1000}}
+
+    options = {
+        "pool_size": settings["DB_POOL_SIZE"],
+        "max_overflow": settings["DB_MAX_OVERFLOW"],
+        "pool_recycle": settings["DB_POOL_RECYCLE"],
+        "pool_timeout": settings["DB_POOL_TIMEOUT"],
+        "pool_pre_ping": settings["DB_POOL_PRE_PING"],
+    }
+    if url.get_backend_name() == "postgresql" and settings["DB_STATEMENT_TIMEOUT_MS"] > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings['DB_STATEMENT_TIMEOUT_MS']}"
+        }
+    return options
+
+
+def _sqlite_pragmas(config, in_memory: bool) -> dict[str, str]:
+    pragmas = {
+        "busy_timeout": str(int(config.get("SQLITE_BUSY_TIMEOUT_MS", 5000))),
+        "synchronous": str(config.get("SQLITE_SYNCHRONOUS", "NORMAL")),
+        # Off by default in SQLite; on, a row pointing at a deleted parent fails as on Postgres.
+        "foreign_keys": "ON",
+    }
+    if not in_memory:
+        pragmas["journal_mode"] = str(config.get("SQLITE_JOURNAL_MODE", "WAL"))
+        pragmas["mmap_size"] = str(int(config.get("SQLITE_MMAP_SIZE", 0)))
+    return pragmas
+
+
+def init_engine(app, db) -> None:
+    """Install SQLite connect-time pragmas and log the effective engine settings."""
+    with app.app_context():
+        engine = db.engine
+
+    if engine.dialect.name == "sqlite":
+        database = engine.url.database or ""
+        pragmas = _sqlite_pragmas(app.config, database in ("", ":memory:"))
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_conn, _record):
+            cur = dbapi_conn.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cur.execute(f"PRAGMA {name}={value}")
+            finally:
+                cur.close()
+
+        log.info(
+            "Database engine: sqlite (%s), pool=%s, pragmas=%s",
+            database or ":memory:",
+            type(engine.pool).__name__,
+            ", ".join(f"{k}={v}" for k, v in pragmas.items()),
+        )
+        return
+
+    pool = engine.pool
+    log.info(
+        "Database engine: %s, pool=%s size=%s max_overflow=%s recycle=%ss pre_ping=%s",
+        engine.dialect.name,
+        type(pool).__name__,
+        getattr(pool, "size", lambda: "-")(),
+        getattr(pool, "_max_overflow", "-"),
+        getattr(pool, "_recycle", "-"),
+        getattr(pool, "_pre_ping", "-"),
+    )
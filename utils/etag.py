@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+from functools import wraps
+
+from flask import Response, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select, update
+
+from ..extensions import db
+from ..models import User
+from .dates import UTC, local_day, now_utc_naive
+
+
+def bump(user_id: int | None = None) -> None:
+    """Advance the user's (or, with no id, everyone's) data version.
+
+    Runs in the caller's transaction.
+    """
+    stmt = update(User).values(data_version=User.data_version + 1)
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+    db.session.execute(stmt.execution_options(synchronize_session=False))
+    if has_request_context():
+        g.pop("data_versions", None)
+
+
+def _version_and_zone(user_id: int) -> tuple[int, str]:
+    row = db.session.execute(
+        select(User.data_version, User.timezone).where(User.id == user_id)
+    ).first()
+    version, tz = (row[0] or 0, row[1] or UTC) if row else (0, UTC)
+    if has_request_context():
+        g.setdefault("data_versions", {})[user_id] = version
+    return version, tz
+
+
+def data_version(user_id: int) -> int:
+    """The user's data version, read once per request and shared by all workers.
+
+    The response cache keys on it, so an entry written under a version always
+    holds data at least that new, whichever worker serves it; a request that
+    already computed its ETag reuses that read.
+    """
+    if has_request_context():
+        seen = g.get("data_versions") or {}
+        if user_id in seen:
+            return seen[user_id]
+    return _version_and_zone(user_id)[0]
+
+
+def compute_etag(user_id: int, version: int, *, daily: bool = False, tz: str = UTC) -> str:
+    parts = [
+        str(user_id),
+        str(version),
+        request.path,
+        "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True))),
+    ]
+    if daily:
+        # Windows ("this week", "overdue") move with the user's calendar, not with writes.
+        parts.append(local_day(now_utc_naive(), tz).isoformat())
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _status(rv) -> int:
+    if isinstance(rv, Response):
+        return rv.status_code
+    if isinstance(rv, tuple) and len(rv) > 1:
+        return rv[1]
+    return 200
+
+
+def _with_headers(rv, headers: dict):
+    if isinstance(rv, Response):
+        rv.headers.update(headers)
+        return rv
+    if not isinstance(rv, tuple):
+        return rv, 200, headers
+    if len(rv) == 2:
+        data, status = rv
+        return data, status, headers
+    data, status, extra = rv
+    return data, status, {**dict(extra), **headers}
+
+
+def conditional_get(*, daily: bool = False):
+    """Answer ``If-None-Match`` with 304 before the wrapped GET runs.
+
+    The ETag covers the user's data version and the request args, so it has
+    to sit below ``jwt_required``. It costs one primary-key lookup, and the
+    response cache reuses that version for its keys, so a cached body is never
+    older than the tag sent with it.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            user_id = int(get_jwt_identity())
+            version, tz = _version_and_zone(user_id)
+            tag = compute_etag(user_id, version, daily=daily, tz=tz)
+            headers = {"ETag": f'"{tag}"', "Cache-Control": "private, no-cache"}
+
+            if request.if_none_match.contains(tag):
+                resp = Response(status=304)
+                resp.headers.update(headers)
+                return resp
+
+            rv = fn(*args, **kwargs)
+            if _status(rv) != 200:
+                return rv
+            return _with_headers(rv, headers)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterable
+
+from flask_restful import abort
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db, exercise_type_cache
+from ..models import ExerciseType
+
+
+def _load(user_id: int) -> dict[int, str]:
+    return dict(
+        db.session.query(ExerciseType.id, ExerciseType.name).filter(
+            ExerciseType.user_id == user_id
+        )
+    )
+
+
+def type_names(user_id: int) -> dict[int, str]:
+    """The user's exercise types as ``{id: name}``, served from the cache."""
+    return exercise_type_cache.names(user_id, _load)
+
+
+def owned_name_or_404(type_id: int, user_id: int) -> str:
+    """Name of the user's type; a stale hit is caught by ``type_fk_guard``."""
+    name = type_names(user_id).get(type_id)
+    if name is None:
+        # The map may predate a type created through another worker; only a
+        # miss costs a query, so ownership is never refused from stale data.
+        exercise_type_cache.invalidate(user_id)
+        name = type_names(user_id).get(type_id)
+        if name is None:
+            abort(404, message="Exercise type not found")
+    return name
+
+
+def owned_ids(type_ids: Iterable[int], user_id: int) -> set[int]:
+    """The subset of ``type_ids`` the user owns right now, read from the table.
+
+    Writes that insert many rows confirm ownership here just before inserting,
+    so a type deleted through another worker is not trusted from the cache.
+    """
+    ids = set(type_ids)
+    if not ids:
+        return set()
+    return set(
+        db.session.execute(
+            select(ExerciseType.id).where(
+                ExerciseType.id.in_(ids), ExerciseType.user_id == user_id
+            )
+        ).scalars()
+    )
+
+
+@contextmanager
+def type_fk_guard(type_id: int | None, user_id: int):
+    """Wrap a write that references ``type_id`` on the strength of a cached hit.
+
+    If another worker deleted the type meanwhile, the foreign key refuses the
+    row; that is rolled back and reported as the 404 a fresh map would give.
+    """
+    try:
+        yield
+    except IntegrityError:
+        db.session.rollback()
+        if type_id is None or owned_ids([type_id], user_id):
+            raise
+        exercise_type_cache.invalidate(user_id)
+        abort(404, message="Exercise type not found")
+
+
+def invalidate(user_id: int) -> None:
+    exercise_type_cache.invalidate(user_id)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+log = logging.getLogger(__name__)
+slow_log = logging.getLogger("backend.sql.slow")
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    """Minimal process-local registry rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: dict[tuple, float] = {}
+        self.histograms: dict[tuple, list] = {}
+        self.help: dict[str, tuple[str, str]] = {}
+
+    def describe(self, name: str, kind: str, text: str) -> None:
+        self.help[name] = (kind, text)
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = [[0] * len(BUCKETS), 0.0, 0]
+            i = bisect_left(BUCKETS, value)
+            if i < len(BUCKETS):
+                hist[0][i] += 1
+            hist[1] += value
+            hist[2] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def render(self, extra: dict[str, float] | None = None) -> str:
+        def fmt(labels) -> str:
+            if not labels:
+                return ""
+            inner = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in labels)
+            return "{" + inner + "}"
+
+        lines: list[str] = []
+        seen: set[str] = set()
+
+        def header(name: str) -> None:
+            if name in seen:
+                return
+            seen.add(name)
+            kind, text = self.help.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name)
+                lines.append(f"{name}{fmt(labels)} {value:g}")
+            for (name, labels), (buckets, total, count) in sorted(self.histograms.items()):
+                header(name)
+                cumulative = 0
+                for bound, n in zip(BUCKETS, buckets):
+                    cumulative += n
+                    le = labels + (("le", f"{bound:g}"),)
+                    lines.append(f"{name}_bucket{fmt(le)} {cumulative}")
+                lines.append(f"{name}_bucket{fmt(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{fmt(labels)} {total:.6f}")
+                lines.append(f"{name}_count{fmt(labels)} {count}")
+
+        for name, value in (extra or {}).items():
+            header(name)
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+metrics.describe("http_requests_total", "counter", "HTTP requests by endpoint, method and status.")
+metrics.describe("http_request_duration_seconds", "histogram", "Request wall time.")
+metrics.describe("db_queries_total", "counter", "SQL statements executed, by endpoint.")
+metrics.describe("db_query_duration_seconds", "histogram", "SQL statement time, by endpoint.")
+metrics.describe("db_slow_queries_total", "counter", "SQL statements above the slow threshold.")
+
+
+def _register_engine_hooks(engine, slow_ms: float) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+
+        endpoint = "none"
+        if has_request_context():
+            g.db_queries = g.get("db_queries", 0) + 1
+            g.db_time = g.get("db_time", 0.0) + elapsed
+            endpoint = request.endpoint or "unknown"
+
+        metrics.inc("db_queries_total", endpoint=endpoint)
+        metrics.observe("db_query_duration_seconds", elapsed, endpoint=endpoint)
+        if elapsed * 1000 >= slow_ms:
+            metrics.inc("db_slow_queries_total", endpoint=endpoint)
+            slow_log.warning(
+                "slow query %.1f ms on %s: %s",
+                elapsed * 1000,
+                endpoint,
+                " ".join(statement.split()),
+            )
+
+
+def init_instrumentation(app, db) -> None:
+    """Per-request timing, SQL counting, slow-query log and Server-Timing header."""
+    slow_ms = float(app.config.get("SLOW_QUERY_MS", 200))
+
+    with app.app_context():
+        _register_engine_hooks(db.engine, slow_ms)
+
+    @app.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
+        g.db_queries = 0
+        g.db_time = 0.0
+
+    @app.after_request
+    def _record(response):
+        start = g.get("request_start")
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or "unknown"
+
+        metrics.inc(
+            "http_requests_total",
+            endpoint=endpoint,
+            method=request.method,
+            status=response.status_code,
+        )
+        metrics.observe("http_request_duration_seconds", elapsed, endpoint=endpoint)
+
+        queries = g.get("db_queries", 0)
+        db_ms = g.get("db_time", 0.0) * 1000
+        response.headers.add(
+            "Server-Timing",
+            f'app;dur={elapsed * 1000:.1f}, db;dur={db_ms:.1f};desc="{queries} queries"',
+        )
+        return response
+
+    log.info("Instrumentation enabled (slow query threshold %.0f ms)", slow_ms)
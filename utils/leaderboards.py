@@ -0,0 +1,417 @@
+"""Challenge leaderboards kept in ``challenge_score``.
+
+The first read of a window builds every member's score with one
+``INSERT ... SELECT`` over a GROUP BY on ``workout_session``. After that the
+session write paths add their deltas to the affected rows inside the same
+transaction, so a page is an index range scan on ``ix_challenge_score_rank``
+no matter how many members or sessions there are.
+
+A build and a delta must not interleave: a build cannot see a session that
+is not committed yet, and a delta to a window that is not built yet touches
+nothing, so the session would be lost for good. Both take the ``challenge``
+row lock first (``SELECT ... FOR UPDATE``), and a member's writes and joins
+take that user's row first, always in the order user, then challenge.
+SQLite ignores ``FOR UPDATE``, but its writers already serialize on the
+database lock.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models import (
+    Challenge,
+    ChallengeMember,
+    ChallengeScore,
+    ExerciseType,
+    User,
+    WorkoutSession,
+)
+from .dates import Window, current_window, recent_windows, to_utc_naive
+
+METRICS = ("duration", "calories", "sessions")
+
+
+def _metric_expr(metric: str):
+    if metric == "duration":
+        return func.sum(WorkoutSession.duration)
+    if metric == "calories":
+        return func.sum(WorkoutSession.calories)
+    return func.count(WorkoutSession.id)
+
+
+def _metric_value(metric: str, duration: int, calories: int) -> int:
+    if metric == "duration":
+        return duration
+    if metric == "calories":
+        return calories
+    return 1
+
+
+def _scores_query(challenge: Challenge, win: Window):
+    """Per-member totals in ``win``: one GROUP BY over the members' sessions."""
+    stmt = (
+        select(WorkoutSession.user_id, _metric_expr(challenge.metric).label("value"))
+        .join(
+            ChallengeMember,
+            and_(
+                ChallengeMember.user_id == WorkoutSession.user_id,
+                ChallengeMember.challenge_id == challenge.id,
+            ),
+        )
+        .where(WorkoutSession.date >= win.start, WorkoutSession.date < win.end)
+        .group_by(WorkoutSession.user_id)
+    )
+    return _named(stmt, challenge).subquery()
+
+
+def _named(stmt, challenge: Challenge):
+    if challenge.exercise_name:
+        stmt = stmt.join(ExerciseType, ExerciseType.id == WorkoutSession.exercise_type_id).where(
+            func.lower(ExerciseType.name) == challenge.exercise_name.lower()
+        )
+    return stmt
+
+
+def _lock_challenges(ids: Iterable[int]) -> None:
+    ids = sorted(set(ids))
+    if ids and db.engine.dialect.name != "sqlite":
+        db.session.execute(
+            select(Challenge.id)
+            .where(Challenge.id.in_(ids))
+            .order_by(Challenge.id)
+            .with_for_update()
+        ).all()
+
+
+def _lock_member(user_id: int) -> None:
+    if db.engine.dialect.name != "sqlite":
+        db.session.execute(select(User.id).where(User.id == user_id).with_for_update()).all()
+
+
+def _is_built(challenge_id: int, start: datetime) -> bool:
+    return (
+        db.session.execute(
+            select(ChallengeScore.user_id)
+            .where(
+                ChallengeScore.challenge_id == challenge_id,
+                ChallengeScore.window_start == start,
+            )
+            .limit(1)
+        ).first()
+        is not None
+    )
+
+
+def ensure_window(challenge: Challenge, win: Window) -> None:
+    """Build the window's scores (zero for idle members) unless they already exist."""
+    if _is_built(challenge.id, win.start):
+        return
+    # Wait out any session write in flight, then look again: it may have been
+    # a concurrent build.
+    _lock_challenges([challenge.id])
+    if _is_built(challenge.id, win.start):
+        return
+
+    totals = _scores_query(challenge, win)
+    source = (
+        select(
+            ChallengeMember.challenge_id,
+            literal(win.start, ChallengeScore.window_start.type),
+            ChallengeMember.user_id,
+            func.coalesce(totals.c.value, 0),
+        )
+        .outerjoin(totals, totals.c.user_id == ChallengeMember.user_id)
+        .where(ChallengeMember.challenge_id == challenge.id)
+    )
+    try:
+        with db.session.begin_nested():
+            db.session.execute(
+                insert(ChallengeScore).from_select(
+                    ["challenge_id", "window_start", "user_id", "value"], source
+                )
+            )
+    except IntegrityError:
+        pass  # a concurrent reader built it first
+
+
+def window_of(challenge: Challenge, ago: int = 0, now: datetime | None = None) -> Window:
+    """The current window, or the one ``ago`` periods back, in the challenge's zone."""
+    return recent_windows(challenge.period, ago + 1, now, challenge.timezone)[0]
+
+
+def page(
+    challenge: Challenge,
+    win: Window,
+    *,
+    limit: int,
+    after: tuple[int, int] | None = None,
+) -> list[dict]:
+    """Up to ``limit`` ranked entries, best first, continuing after ``(value, user_id)``.
+
+    Ties share a rank (1, 2, 2, 4); order within a tie is by user id, descending,
+    so the scan follows the index backwards.
+    """
+    key = (
+        ChallengeScore.challenge_id == challenge.id,
+        ChallengeScore.window_start == win.start,
+    )
+    stmt = (
+        select(ChallengeScore.user_id, ChallengeScore.value, User.name)
+        .join(User, User.id == ChallengeScore.user_id)
+        .where(*key)
+        .order_by(ChallengeScore.value.desc(), ChallengeScore.user_id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        value, user_id = after
+        stmt = stmt.where(
+            or_(
+                ChallengeScore.value < value,
+                and_(ChallengeScore.value == value, ChallengeScore.user_id < user_id),
+            )
+        )
+    rows = db.session.execute(stmt).all()
+    if not rows:
+        return []
+
+    # Rows before this page, and how many of them score strictly higher than
+    # its first row (the two differ when the page starts inside a tie).
+    first = rows[0]
+    before, ahead = db.session.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((ChallengeScore.value > first.value, 1), else_=0)), 0),
+        ).where(
+            *key,
+            or_(
+                ChallengeScore.value > first.value,
+                and_(ChallengeScore.value == first.value, ChallengeScore.user_id > first.user_id),
+            ),
+        )
+    ).one()
+    out = []
+    rank, prev = ahead + 1, first.value
+    for i, row in enumerate(rows):
+        if row.value != prev:
+            rank, prev = before + i + 1, row.value
+        out.append({"rank": rank, "user_id": row.user_id, "name": row.name, "value": row.value})
+    return out
+
+
+def standing(challenge: Challenge, win: Window, user_id: int) -> dict | None:
+    key = (
+        ChallengeScore.challenge_id == challenge.id,
+        ChallengeScore.window_start == win.start,
+    )
+    value = db.session.execute(
+        select(ChallengeScore.value).where(*key, ChallengeScore.user_id == user_id)
+    ).scalar()
+    if value is None:
+        return None
+    ahead = db.session.execute(
+        select(func.count()).where(*key, ChallengeScore.value > value)
+    ).scalar()
+    return {"rank": ahead + 1, "value": value}
+
+
+def add_member(challenge: Challenge, user_id: int) -> None:
+    """Give a newcomer a row in every window already built.
+
+    One GROUP BY over the newcomer's own sessions, bucketed by window, so a
+    join never sends the other members' windows back to be rebuilt.
+    """
+    _lock_member(user_id)
+    _lock_challenges([challenge.id])
+    starts = built_windows(challenge.id)
+    if not starts:
+        return
+    windows = [Window(*current_window(challenge.period, s, challenge.timezone)) for s in starts]
+
+    bucket = case(
+        *(
+            (and_(WorkoutSession.date >= w.start, WorkoutSession.date < w.end), i)
+            for i, w in enumerate(windows)
+        )
+    )
+    stmt = (
+        select(bucket, _metric_expr(challenge.metric))
+        .where(
+            WorkoutSession.user_id == user_id,
+            WorkoutSession.date >= windows[0].start,
+            WorkoutSession.date < windows[-1].end,
+        )
+        .group_by(bucket)
+    )
+    totals = dict(db.session.execute(_named(stmt, challenge)).all())
+    db.session.execute(
+        insert(ChallengeScore),
+        [
+            {
+                "challenge_id": challenge.id,
+                "window_start": w.start,
+                "user_id": user_id,
+                "value": totals.get(i) or 0,
+            }
+            for i, w in enumerate(windows)
+        ],
+    )
+
+
+def built_windows(challenge_id: int) -> list[datetime]:
+    return list(
+        db.session.execute(
+            select(ChallengeScore.window_start)
+            .where(ChallengeScore.challenge_id == challenge_id)
+            .distinct()
+            .order_by(ChallengeScore.window_start)
+        ).scalars()
+    )
+
+
+def reset(challenge_id: int, user_id: int | None = None) -> None:
+    """Drop built windows (or one member's rows); the next read rebuilds them."""
+    _lock_challenges([challenge_id])
+    stmt = delete(ChallengeScore).where(ChallengeScore.challenge_id == challenge_id)
+    if user_id is not None:
+        stmt = stmt.where(ChallengeScore.user_id == user_id)
+    db.session.execute(stmt.execution_options(synchronize_session=False))
+
+
+def reset_named(user_id: int) -> None:
+    """A renamed or deleted exercise type can change what the user's named challenges count."""
+    _lock_member(user_id)
+    ids = db.session.execute(
+        select(Challenge.id)
+        .join(ChallengeMember, ChallengeMember.challenge_id == Challenge.id)
+        .where(ChallengeMember.user_id == user_id, Challenge.exercise_name.isnot(None))
+    ).scalars().all()
+    if not ids:
+        return
+    _lock_challenges(ids)
+    db.session.execute(
+        delete(ChallengeScore)
+        .where(ChallengeScore.challenge_id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild(challenge_id: int) -> int:
+    """Recompute every built window of a challenge from raw sessions.
+
+    Returns the number of windows rebuilt. The current window is always
+    included, built or not.
+    """
+    challenge = db.session.get(Challenge, challenge_id)
+    if challenge is None:
+        raise LookupError(f"challenge {challenge_id} not found")
+    _lock_challenges([challenge.id])
+    starts = set(built_windows(challenge.id))
+    current = window_of(challenge)
+    starts.add(current.start)
+    reset(challenge.id)
+    for start in sorted(starts):
+        win = Window(*current_window(challenge.period, start, challenge.timezone))
+        ensure_window(challenge, win)
+    db.session.commit()
+    return len(starts)
+
+
+def _apply(user_id: int, entries: list[tuple[int, datetime, int, int]], sign: int) -> None:
+    # Locked before reading memberships, so a concurrent join of this user is
+    # either fully visible here or sees this write in its own GROUP BY.
+    _lock_member(user_id)
+    challenges = db.session.execute(
+        select(
+            Challenge.id,
+            Challenge.metric,
+            Challenge.period,
+            Challenge.timezone,
+            Challenge.exercise_name,
+        )
+        .join(ChallengeMember, ChallengeMember.challenge_id == Challenge.id)
+        .where(ChallengeMember.user_id == user_id)
+    ).all()
+    if not challenges:
+        return
+
+    names = {}
+    if any(c.exercise_name for c in challenges):
+        # Straight from the table: the per-worker type cache may not know a type
+        # created on another worker, and a miss here would drop the delta for good.
+        names = dict(
+            db.session.execute(
+                select(ExerciseType.id, ExerciseType.name).where(
+                    ExerciseType.id.in_({etid for etid, *_ in entries})
+                )
+            ).all()
+        )
+    deltas: dict = defaultdict(int)
+    for c in challenges:
+        wanted = c.exercise_name.lower() if c.exercise_name else None
+        for etid, when, duration, calories in entries:
+            if wanted is not None and (names.get(etid) or "").lower() != wanted:
+                continue
+            start, _ = current_window(c.period, to_utc_naive(when), c.timezone)
+            deltas[(c.id, start)] += sign * _metric_value(c.metric, duration, calories)
+
+    # Windows nobody has read yet have no rows, so these updates touch nothing;
+    # with the lock held, no build of them can be missing this session.
+    _lock_challenges(challenge_id for challenge_id, _ in deltas)
+    for (challenge_id, start), delta in deltas.items():
+        if delta:
+            db.session.execute(
+                update(ChallengeScore)
+                .where(
+                    ChallengeScore.challenge_id == challenge_id,
+                    ChallengeScore.window_start == start,
+                    ChallengeScore.user_id == user_id,
+                )
+                .values(value=ChallengeScore.value + delta)
+                .execution_options(synchronize_session=False)
+            )
+
+
+def sessions_added(user_id: int, entries: Iterable[tuple[int, datetime, int, int]]) -> None:
+    """Fold new ``(exercise_type_id, date, duration, calories)`` entries into built windows."""
+    entries = [e for e in entries if e[1] is not None]
+    if entries:
+        _apply(user_id, entries, 1)
+
+
+def session_removed(user_id: int, etid: int, when, duration: int, calories: int) -> None:
+    if when is not None:
+        _apply(user_id, [(etid, when, duration, calories)], -1)
+
+
+def add_session(s: WorkoutSession) -> None:
+    sessions_added(s.user_id, [(s.exercise_type_id, s.date, s.duration, s.calories)])
+
+
+def remove_session(s: WorkoutSession) -> None:
+    session_removed(s.user_id, s.exercise_type_id, s.date, s.duration, s.calories)
+
+
+@click.group("challenges")
+def challenges_cli():
+    """Maintain challenge_score."""
+
+
+@challenges_cli.command("rebuild")
+@click.argument("challenge_id", type=int)
+@with_appcontext
+def rebuild_command(challenge_id):
+    """Recompute a challenge's leaderboard scores from workout_session."""
+    try:
+        windows = rebuild(challenge_id)
+    except LookupError as exc:
+        raise click.ClickException(str(exc)) from None
+    click.echo(f"challenge_score: rebuilt {windows} windows of challenge {challenge_id}")
@@ -1,20 +1,179 @@
+from __future__ import annotations
+
+import atexit
+import json
 import logging
 import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+_STD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None)).keys()
+) | {"message", "asctime"}
+
+_TEXT_FORMAT = "[%(asctime)s] %(levelname)s %(name)s: %(message)s"
+
+_state: dict = {"listener": None, "handler": None}
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields are kept as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep every Nth record below WARNING for the configured loggers.
+
+    ``rates`` maps a logger name (prefix match on dotted names) to the
+    fraction of records to keep, e.g. ``{"backend.sql": 0.1}``.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.every = {
+            name: max(1, round(1 / rate)) if rate > 0 else 0 for name, rate in rates.items()
+        }
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _match(self, name: str) -> str | None:
+        while name:
+            if name in self.every:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.every:
+            return True
+        key = self._match(record.name)
+        if key is None:
+            return True
+        every = self.every[key]
+        if every == 0:
+            return False
+        with self._lock:
+            n = self._counts.get(key, 0)
+            self._counts[key] = n + 1
+        return n % every == 0
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render tracebacks here so the listener thread never
+        # touches objects owned by the request; formatting happens there.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
-def setup_logging():
-    os.makedirs("logs", exist_ok=True)
-    logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
+def _parse_pairs(raw: str) -> dict[str, str]:
+    pairs = {}
+    for item in (raw or "").split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip():
+            pairs[name.strip()] = value.strip()
+    return pairs
 
-    fmt = logging.Formatter("[%(asctime)s] %(levelname)s %(name)s: %(message)s")
 
-    fh = logging.FileHandler("logs/app.log", encoding="utf-8")
-    fh.setLevel(logging.DEBUG)
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
+def _formatter(kind: str) -> logging.Formatter:
+    if kind == "json":
+        return JsonFormatter()
+    return logging.Formatter(_TEXT_FORMAT)
+
+
+def stop_logging() -> None:
+    with _lock:
+        listener, handler = _state["listener"], _state["handler"]
+        _state["listener"] = _state["handler"] = None
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
+
+
+def setup_logging(force: bool = False) -> QueueListener:
+    """Route all logging through a queue drained by a background listener.
+
+    Request threads only enqueue records; file and console I/O happen on
+    the listener thread. Safe to call repeatedly (``create_app`` does so per
+    test): later calls are no-ops unless ``force`` is set.
+
+    Environment:
+      LOG_LEVEL       root level (default INFO)
+      LOG_LEVELS      per-logger levels, ``sqlalchemy.engine=WARNING,backend=DEBUG``
+      LOG_FORMAT      ``json`` (default) or ``text``
+      LOG_DIR         directory for app.log (default ``logs``; empty disables the file)
+      LOG_MAX_BYTES   rotate app.log at this size (default 10 MiB)
+      LOG_BACKUPS     rotated files to keep (default 5)
+      LOG_SAMPLE      keep a fraction of sub-WARNING records, ``backend.sql=0.1``
+    """
+    if _state["listener"] is not None and not force:
+        return _state["listener"]
+    stop_logging()
+
+    fmt = _formatter(os.getenv("LOG_FORMAT", "json").lower())
+    handlers: list[logging.Handler] = []
+
+    log_dir = os.getenv("LOG_DIR", "logs")
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        fh = RotatingFileHandler(
+            os.path.join(log_dir, "app.log"),
+            maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.getenv("LOG_BACKUPS", "5")),
+            encoding="utf-8",
+            delay=True,
+        )
+        fh.setFormatter(fmt)
+        handlers.append(fh)
 
     ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
     ch.setFormatter(fmt)
-    logger.addHandler(ch)
+    handlers.append(ch)
+
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    qh = _QueueHandler(q)
+    rates = {name: float(rate) for name, rate in _parse_pairs(os.getenv("LOG_SAMPLE", "")).items()}
+    if rates:
+        qh.addFilter(SamplingFilter(rates))
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    for name, level in _parse_pairs(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level.upper())
+    root.addHandler(qh)
+
+    listener = QueueListener(q, *handlers, respect_handler_level=True)
+    listener.start()
+
+    with _lock:
+        _state["listener"], _state["handler"] = listener, qh
+    return listener
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import base64
+import json
+
+from flask_restful import abort
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except Exception:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        abort(400, message="Invalid cursor")
+    return values
+
+
+def truthy(value) -> bool:
+    return str(value or "").lower() in {"1", "true", "yes"}
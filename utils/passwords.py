@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import lru_cache
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+log = logging.getLogger(__name__)
+
+
+class HasherBusy(Exception):
+    """Raised instead of queueing when every hashing slot is taken."""
+
+
+@lru_cache(maxsize=8)
+def _canonical_method(method: str) -> str:
+    # Werkzeug expands defaults ("scrypt" -> "scrypt:32768:8:1"); the stored
+    # prefix uses the expanded form, so compare against that.
+    return generate_password_hash("probe", method).split("$", 1)[0]
+
+
+class PasswordHasher:
+    """Runs password hashing in a small process pool with bounded admission.
+
+    Hashing is CPU-bound and holds the GIL, so doing it in the request
+    thread stalls every other request in the worker. Calls beyond
+    PASSWORD_HASH_MAX_PENDING in flight fail fast with HasherBusy, and the
+    auth endpoints turn that into a 429. With PASSWORD_HASH_WORKERS=0 the
+    hashing runs inline (still bounded).
+    """
+
+    def __init__(self):
+        self.method = "scrypt"
+        self.workers = 2
+        self.timeout = 10.0
+        self._slots = threading.BoundedSemaphore(32)
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_pid: int | None = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.method = app.config.get("PASSWORD_HASH_METHOD", "scrypt")
+        workers = int(app.config.get("PASSWORD_HASH_WORKERS", 2))
+        if workers != self.workers:
+            self.shutdown()
+        self.workers = workers
+        self.timeout = float(app.config.get("PASSWORD_HASH_TIMEOUT", 10))
+        self._slots = threading.BoundedSemaphore(
+            max(1, int(app.config.get("PASSWORD_HASH_MAX_PENDING", 32)))
+        )
+        app.extensions["password_hasher"] = self
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Created on first use and per process, so a preloading master never
+        # hands its pool to forked workers.
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._lock:
+                if self._executor is None or self._executor_pid != pid:
+                    methods = multiprocessing.get_all_start_methods()
+                    ctx = multiprocessing.get_context(
+                        "forkserver" if "forkserver" in methods else "spawn"
+                    )
+                    self._executor = ProcessPoolExecutor(self.workers, mp_context=ctx)
+                    self._executor_pid = pid
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+            future = self._pool().submit(fn, *args)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeout:
+                future.cancel()
+                log.warning("Password hashing timed out after %.1fs", self.timeout)
+                raise HasherBusy() from None
+        finally:
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        return pwhash.split("$", 1)[0] != _canonical_method(self.method)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_pid = None
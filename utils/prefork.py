@@ -0,0 +1,31 @@
+"""Helpers for building the app once and forking workers from it (gunicorn --preload)."""
+
+from __future__ import annotations
+
+import gc
+
+from ..extensions import db
+from .logging import setup_logging
+
+
+def freeze() -> None:
+    """Move everything allocated at startup into the permanent GC generation.
+
+    The collector then never writes to those objects' headers in the
+    workers, so the pages stay shared with the master instead of being
+    copied on the first collection after fork.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def after_fork_in_child(app) -> None:
+    """Drop state that must not be shared across a fork.
+
+    Pooled connections belong to the parent (``close=False`` leaves its
+    sockets alone), and the logging listener thread did not survive the
+    fork, so each worker starts its own.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    setup_logging(force=True)
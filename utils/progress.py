@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime, time
 
-from sqlalchemy import func
+from sqlalchemy import and_, case, func, select
 
-from ..extensions import db
-from ..models import Goal, WorkoutSession
-from .dates import Window, end_of_day_exclusive, now_utc_naive, window_for_period
+from ..extensions import cache, db
+from ..models import DailyActivityRollup, Goal, User, WorkoutSession
+from .dates import (
+    UTC,
+    Window,
+    end_of_day_exclusive,
+    now_utc_naive,
+    recent_windows,
+    window_for_period,
+)
 
 
 def _session_datetime_col():
@@ -63,20 +71,66 @@ def _status_for_goal(goal: Goal, now) -> str:
     return "active"
 
 
-def _goal_window_or_period_window(goal: Goal, now: datetime) -> Window:
+def user_timezones(user_ids) -> dict[int, str]:
+    """IANA zone per user id, in one query."""
+    ids = list(set(user_ids))
+    if not ids:
+        return {}
+    rows = db.session.execute(select(User.id, User.timezone).where(User.id.in_(ids)))
+    return {uid: tz or UTC for uid, tz in rows}
+
+
+def user_timezone(user_id: int) -> str:
+    return user_timezones([user_id]).get(user_id, UTC)
+
+
+def _goal_window_or_period_window(goal: Goal, now: datetime, tz: str | None = None) -> Window:
     start = getattr(goal, "start_date", None)
     end = getattr(goal, "end_date", None)
 
     if start is not None or end is not None:
         win_start = start or datetime.min.replace(microsecond=0)
         win_end_raw = end or datetime.max.replace(microsecond=0)
-        win_end = end_of_day_exclusive(win_end_raw)
+        win_end = end_of_day_exclusive(win_end_raw, tz)
         return Window(start=win_start, end=win_end)
 
-    return window_for_period(goal.period, now=now)
+    # Period windows follow the owner's calendar; stored bounds stay naive UTC,
+    # so a non-UTC window simply misses the day-aligned rollup path below.
+    return window_for_period(goal.period, now=now, tz=tz)
+
+
+def _rollup_days(win: Window) -> tuple[date, date] | None:
+    """Day range [first, end) covering the window, if it falls on day boundaries."""
+    if win.start.time() != time(0) or (win.end.time() != time(0) and win.end.year < 9999):
+        return None
+    return win.start.date(), win.end.date()
+
+
+_ROLLUP_COLUMNS = {
+    "duration": DailyActivityRollup.duration_sum,
+    "calories": DailyActivityRollup.calories_sum,
+    "sessions": DailyActivityRollup.session_count,
+}
 
 
 def _aggregate_value(goal: Goal, win_start, win_end) -> int:
+    metric = (goal.metric or "").lower()
+    if metric not in _ROLLUP_COLUMNS:
+        raise ValueError(f"Unsupported metric '{goal.metric}'. Use: duration|calories|sessions.")
+
+    days = _rollup_days(Window(start=win_start, end=win_end))
+    if days is not None:
+        filters = [
+            DailyActivityRollup.user_id == goal.user_id,
+            DailyActivityRollup.day >= days[0],
+            DailyActivityRollup.day < days[1],
+        ]
+        if getattr(goal, "exercise_type_id", None):
+            filters.append(DailyActivityRollup.exercise_type_id == goal.exercise_type_id)
+        total_expr = func.coalesce(func.sum(_ROLLUP_COLUMNS[metric]), 0)
+        total = db.session.query(total_expr).filter(*filters).scalar()
+        return int(total or 0)
+
     dt_col = _session_datetime_col()
 
     filters = [
@@ -87,8 +141,6 @@ def _aggregate_value(goal: Goal, win_start, win_end) -> int:
     if getattr(goal, "exercise_type_id", None):
         filters.append(WorkoutSession.exercise_type_id == goal.exercise_type_id)
 
-    metric = (goal.metric or "").lower()
-
     if metric == "duration":
         duration_col = getattr(WorkoutSession, "duration", None) or getattr(
             WorkoutSession, "minutes", None
@@ -100,23 +152,13 @@ def _aggregate_value(goal: Goal, win_start, win_end) -> int:
     elif metric == "calories":
         cal_sum = func.coalesce(func.sum(WorkoutSession.calories), 0)
         total = db.session.query(cal_sum).filter(*filters).scalar()
-    elif metric == "sessions":
-        total = db.session.query(func.count(WorkoutSession.id)).filter(*filters).scalar()
     else:
-        raise ValueError(f"Unsupported metric '{goal.metric}'. Use: duration|calories|sessions.")
+        total = db.session.query(func.count(WorkoutSession.id)).filter(*filters).scalar()
 
     return int(total or 0)
 
 
-def compute_goal_progress(goal: Goal, *, now=None) -> Progress:
-    now = now or now_utc_naive()
-
-    status = _status_for_goal(goal, now)
-
-    win = _goal_window_or_period_window(goal, now)
-
-    value = _aggregate_value(goal, win.start, win.end)
-
+def _progress_for(goal: Goal, win: Window, status: str, value: int) -> Progress:
     target = int(getattr(goal, "target_value", 0) or 0)
     if target <= 0:
         percent = 100.0
@@ -137,3 +179,208 @@ def compute_goal_progress(goal: Goal, *, now=None) -> Progress:
         status=status,
         window=win.as_iso(),
     )
+
+
+def _cache_key(goal: Goal, win: Window) -> str:
+    args = {
+        "id": goal.id,
+        "metric": goal.metric,
+        "target": goal.target_value,
+        "period": goal.period,
+        "exercise_type_id": goal.exercise_type_id,
+    }
+    return cache.key(goal.user_id, "goals.progress", args, f"{win.start}/{win.end}")
+
+
+def compute_goal_progress(goal: Goal, *, now=None) -> Progress:
+    """Progress of one goal in its current window.
+
+    Live calls (no explicit ``now``) go through the per-user response cache.
+    """
+    use_cache = now is None
+    now = now or now_utc_naive()
+
+    status = _status_for_goal(goal, now)
+
+    tz = user_timezone(goal.user_id)
+    win = _goal_window_or_period_window(goal, now, tz)
+
+    key = _cache_key(goal, win) if use_cache else None
+    cached = cache.get(key) if key else None
+    if cached is not None:
+        return Progress(**cached)
+
+    value = _aggregate_value(goal, win.start, win.end)
+
+    progress = _progress_for(goal, win, status, value)
+    if key:
+        cache.set(key, progress.as_dict())
+    return progress
+
+
+_METRIC_INDEX = {"duration": 0, "calories": 1, "sessions": 2}
+
+
+def _grouped_totals(totals: dict, source, user_ids, windows: list[Window]) -> None:
+    """Accumulate duration/calories/count per (user, exercise type, window).
+
+    Every window gets its own conditional SUMs and the WHERE clause only
+    narrows the scan to the union of all windows, so this is one query no
+    matter how many windows are involved.
+    """
+    user_col, etype_col, values, in_window, lower, upper = source
+
+    cols = []
+    for win in windows:
+        cond = in_window(win)
+        cols += [func.coalesce(func.sum(case((cond, v), else_=0)), 0) for v in values]
+
+    rows = (
+        db.session.query(user_col, etype_col, *cols)
+        .filter(
+            user_col.in_(user_ids),
+            lower(min(w.start for w in windows)),
+            upper(max(w.end for w in windows)),
+        )
+        .group_by(user_col, etype_col)
+        .all()
+    )
+
+    for user_id, etype_id, *sums in rows:
+        for i, win in enumerate(windows):
+            triple = sums[i * 3 : i * 3 + 3]
+            for key in ((user_id, etype_id, win), (user_id, None, win)):
+                acc = totals[key]
+                for m in range(3):
+                    acc[m] += int(triple[m] or 0)
+
+
+def _rollup_source():
+    day = DailyActivityRollup.day
+
+    def in_window(win):
+        first, end = _rollup_days(win)
+        return and_(day >= first, day < end)
+
+    return (
+        DailyActivityRollup.user_id,
+        DailyActivityRollup.exercise_type_id,
+        (
+            DailyActivityRollup.duration_sum,
+            DailyActivityRollup.calories_sum,
+            DailyActivityRollup.session_count,
+        ),
+        in_window,
+        lambda start: day >= start.date(),
+        lambda end: day <= end.date(),
+    )
+
+
+def _session_source():
+    dt_col = _session_datetime_col()
+    return (
+        WorkoutSession.user_id,
+        WorkoutSession.exercise_type_id,
+        (WorkoutSession.duration, WorkoutSession.calories, 1),
+        lambda win: and_(dt_col >= win.start, dt_col < win.end),
+        lambda start: dt_col >= start,
+        lambda end: dt_col < end,
+    )
+
+
+def _batch_totals(user_ids, windows: list[Window]) -> dict:
+    """Totals for every (user, exercise type, window); ``None`` type means all types.
+
+    Day-aligned windows are answered from the daily rollup, anything else
+    from raw sessions.
+    """
+    totals: dict = defaultdict(lambda: [0, 0, 0])
+    by_day = [w for w in windows if _rollup_days(w) is not None]
+    raw = [w for w in windows if _rollup_days(w) is None]
+    if by_day:
+        _grouped_totals(totals, _rollup_source(), user_ids, by_day)
+    if raw:
+        _grouped_totals(totals, _session_source(), user_ids, raw)
+    return totals
+
+
+def compute_goals_progress(goals, *, now=None) -> dict[int, Progress]:
+    """Batch variant of :func:`compute_goal_progress`.
+
+    Goals are grouped by (user, window, exercise_type_id) and all metrics are
+    computed with a single grouped aggregate query instead of one per goal.
+    Returns a mapping of goal id to :class:`Progress`; cached goals only
+    cost the single lookup of their owners' time zones.
+    """
+    goals = list(goals)
+    if not goals:
+        return {}
+
+    use_cache = now is None
+    now = now or now_utc_naive()
+
+    zones = user_timezones(g.user_id for g in goals)
+    result: dict[int, Progress] = {}
+    plans = []
+    for goal in goals:
+        metric = (goal.metric or "").lower()
+        if metric not in _METRIC_INDEX:
+            raise ValueError(
+                f"Unsupported metric '{goal.metric}'. Use: duration|calories|sessions."
+            )
+        win = _goal_window_or_period_window(goal, now, zones.get(goal.user_id))
+        key = _cache_key(goal, win) if use_cache else None
+        cached = cache.get(key) if key else None
+        if cached is not None:
+            result[goal.id] = Progress(**cached)
+        else:
+            plans.append((goal, win, _METRIC_INDEX[metric], key))
+
+    if not plans:
+        return result
+
+    windows = list(dict.fromkeys(win for _, win, _, _ in plans))
+    user_ids = sorted({g.user_id for g, _, _, _ in plans})
+    totals = _batch_totals(user_ids, windows)
+
+    for goal, win, m, key in plans:
+        acc = totals.get((goal.user_id, getattr(goal, "exercise_type_id", None) or None, win))
+        value = acc[m] if acc else 0
+        progress = _progress_for(goal, win, _status_for_goal(goal, now), value)
+        if key:
+            cache.set(key, progress.as_dict())
+        result[goal.id] = progress
+    return result
+
+
+def goal_history(goal: Goal, periods: int, *, now=None, tz: str | None = None) -> list[Progress]:
+    """Progress of a recurring goal in its last ``periods`` windows, oldest first.
+
+    Windows come from :func:`recent_windows`, so the last entry is the
+    current window with the same boundaries as :func:`compute_goal_progress`.
+    All windows are summed by one grouped query; past windows are
+    ``achieved`` or ``missed``.
+    """
+    metric = (goal.metric or "").lower()
+    if metric not in _METRIC_INDEX:
+        raise ValueError(f"Unsupported metric '{goal.metric}'. Use: duration|calories|sessions.")
+
+    now = now or now_utc_naive()
+    if tz is None:
+        tz = user_timezone(goal.user_id)
+    windows = recent_windows(goal.period, periods, now, tz)
+    totals = _batch_totals([goal.user_id], windows)
+
+    m = _METRIC_INDEX[metric]
+    target = int(getattr(goal, "target_value", 0) or 0)
+    etid = getattr(goal, "exercise_type_id", None) or None
+    history = []
+    for win in windows:
+        acc = totals.get((goal.user_id, etid, win))
+        value = acc[m] if acc else 0
+        if win.end > now:
+            status = _status_for_goal(goal, now)
+        else:
+            status = "achieved" if value >= target else "missed"
+        history.append(_progress_for(goal, win, status, value))
+    return history
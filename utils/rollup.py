@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import cache, db
+from ..models import DailyActivityRollup, WorkoutSession
+from . import etag, snapshots
+from .dates import to_utc_naive
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def day_of(value: datetime | date) -> date:
+    if not isinstance(value, datetime):
+        return value
+    return to_utc_naive(value).date()
+
+
+def apply_delta(
+    user_id: int,
+    exercise_type_id: int,
+    when: datetime | date | None,
+    *,
+    duration: int,
+    calories: int,
+    sessions: int,
+) -> None:
+    """Add (or, with negative values, subtract) one day's worth of activity.
+
+    Runs inside the caller's transaction, so the rollup commits together with
+    the session write that caused it.
+    """
+    if when is None:
+        return
+    day = day_of(when)
+    key = (
+        DailyActivityRollup.user_id == user_id,
+        DailyActivityRollup.exercise_type_id == exercise_type_id,
+        DailyActivityRollup.day == day,
+    )
+    added = {
+        "duration_sum": DailyActivityRollup.duration_sum + duration,
+        "calories_sum": DailyActivityRollup.calories_sum + calories,
+        "session_count": DailyActivityRollup.session_count + sessions,
+    }
+
+    if sessions > 0:
+        # Two first-of-the-day writes can race; an upsert lets the second one add
+        # to the row the first inserted instead of failing on the primary key.
+        upsert = _UPSERTS.get(db.engine.dialect.name)
+        if upsert is not None:
+            stmt = upsert(DailyActivityRollup).values(
+                user_id=user_id,
+                exercise_type_id=exercise_type_id,
+                day=day,
+                duration_sum=duration,
+                calories_sum=calories,
+                session_count=sessions,
+            )
+            db.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["user_id", "exercise_type_id", "day"], set_=added
+                )
+            )
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.execute(
+                    insert(DailyActivityRollup).values(
+                        user_id=user_id,
+                        exercise_type_id=exercise_type_id,
+                        day=day,
+                        duration_sum=duration,
+                        calories_sum=calories,
+                        session_count=sessions,
+                    )
+                )
+            return
+        except IntegrityError:
+            pass  # the row exists; add to it below
+
+    db.session.execute(
+        update(DailyActivityRollup)
+        .where(*key)
+        .values(**added)
+        .execution_options(synchronize_session=False)
+    )
+    if sessions < 0:
+        db.session.execute(
+            delete(DailyActivityRollup)
+            .where(*key, DailyActivityRollup.session_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def add_session(s: WorkoutSession) -> None:
+    apply_delta(
+        s.user_id,
+        s.exercise_type_id,
+        s.date,
+        duration=s.duration,
+        calories=s.calories,
+        sessions=1,
+    )
+
+
+def remove_session(s: WorkoutSession) -> None:
+    apply_delta(
+        s.user_id,
+        s.exercise_type_id,
+        s.date,
+        duration=-s.duration,
+        calories=-s.calories,
+        sessions=-1,
+    )
+
+
+def rebuild(user_id: int | None = None) -> int:
+    """Recompute the rollup from raw sessions. Returns the number of rows written."""
+    clear = delete(DailyActivityRollup)
+    src = select(
+        WorkoutSession.user_id,
+        WorkoutSession.exercise_type_id,
+        func.date(WorkoutSession.date),
+        func.sum(WorkoutSession.duration),
+        func.sum(WorkoutSession.calories),
+        func.count(WorkoutSession.id),
+    ).where(WorkoutSession.date.isnot(None))
+    if user_id is not None:
+        clear = clear.where(DailyActivityRollup.user_id == user_id)
+        src = src.where(WorkoutSession.user_id == user_id)
+    src = src.group_by(
+        WorkoutSession.user_id,
+        WorkoutSession.exercise_type_id,
+        func.date(WorkoutSession.date),
+    )
+
+    db.session.execute(clear)
+    if user_id is None:
+        snapshots.mark_all_dirty()
+    else:
+        snapshots.mark_user_dirty(user_id)
+    # Cached reports in every worker key on the data version, not just this process's cache.
+    etag.bump(user_id)
+    res = db.session.execute(
+        insert(DailyActivityRollup).from_select(
+            ["user_id", "exercise_type_id", "day", "duration_sum", "calories_sum", "session_count"],
+            src,
+        )
+    )
+    db.session.commit()
+    if user_id is None:
+        cache.clear()
+    else:
+        cache.invalidate(user_id)
+    return res.rowcount
+
+
+@click.group("rollup")
+def rollup_cli():
+    """Maintain the daily_activity_rollup table."""
+
+
+@rollup_cli.command("rebuild")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user's rows.")
+@with_appcontext
+def rebuild_command(user_id):
+    """Backfill or rebuild the rollup from workout_session."""
+    rows = rebuild(user_id)
+    click.echo(f"daily_activity_rollup: wrote {rows} rows")
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import and_, delete, or_, update
+
+from ..extensions import db
+from ..models import Goal, GoalProgressSnapshot
+from .dates import now_utc_naive
+from .progress import Progress, compute_goals_progress
+
+log = logging.getLogger(__name__)
+
+
+def _mark(*where) -> None:
+    db.session.execute(
+        update(GoalProgressSnapshot)
+        .where(*where)
+        .values(dirty=True, revision=GoalProgressSnapshot.revision + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def mark_user_dirty(user_id: int) -> None:
+    """Flag every snapshot of the user; runs in the caller's transaction."""
+    _mark(GoalProgressSnapshot.user_id == user_id)
+
+
+def mark_all_dirty() -> None:
+    _mark()
+
+
+def mark_goal_dirty(goal_id: int) -> None:
+    _mark(GoalProgressSnapshot.goal_id == goal_id)
+
+
+def drop_goal(goal_id: int) -> None:
+    db.session.execute(
+        delete(GoalProgressSnapshot)
+        .where(GoalProgressSnapshot.goal_id == goal_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _max_age() -> timedelta:
+    return timedelta(seconds=float(current_app.config.get("SNAPSHOT_MAX_AGE", 900)))
+
+
+def _is_fresh(snap: GoalProgressSnapshot, now: datetime, max_age: timedelta) -> bool:
+    # A window that ended before the snapshot was taken can no longer change.
+    window_current = snap.window_end > now or snap.computed_at >= snap.window_end
+    return not snap.dirty and window_current and now - snap.computed_at < max_age
+
+
+def _freshness(computed_at: datetime, now: datetime, source: str) -> dict:
+    return {
+        "source": source,
+        "computed_at": computed_at.isoformat(),
+        "age_seconds": max(0, int((now - computed_at).total_seconds())),
+    }
+
+
+def progress_for_goals(goals, *, now: datetime | None = None) -> dict[int, dict]:
+    """Goal id -> progress dict with a ``freshness`` block.
+
+    Fresh snapshots are served as-is; goals without one (or with a dirty or
+    expired one) fall back to the live batch computation.
+    """
+    goals = list(goals)
+    if not goals:
+        return {}
+    now = now or now_utc_naive()
+    max_age = _max_age()
+
+    snaps = {
+        s.goal_id: s
+        for s in GoalProgressSnapshot.query.filter(
+            GoalProgressSnapshot.goal_id.in_([g.id for g in goals])
+        )
+    }
+
+    out: dict[int, dict] = {}
+    missing = []
+    for goal in goals:
+        snap = snaps.get(goal.id)
+        if snap is not None and _is_fresh(snap, now, max_age):
+            out[goal.id] = {
+                "value": snap.value,
+                "target": snap.target,
+                "percent": snap.percent,
+                "remaining": snap.remaining,
+                "status": snap.status,
+                "window": {
+                    "start": snap.window_start.isoformat(),
+                    "end": snap.window_end.isoformat(),
+                },
+                "freshness": _freshness(snap.computed_at, now, "snapshot"),
+            }
+        else:
+            missing.append(goal)
+
+    if missing:
+        for goal_id, pr in compute_goals_progress(missing).items():
+            out[goal_id] = {**pr.as_dict(), "freshness": _freshness(now, now, "live")}
+    return out
+
+
+def _store(goal: Goal, seen_revision: int | None, pr: Progress, now: datetime) -> None:
+    values = {
+        "user_id": goal.user_id,
+        "value": pr.value,
+        "target": pr.target,
+        "percent": pr.percent,
+        "remaining": pr.remaining,
+        "status": pr.status,
+        "window_start": datetime.fromisoformat(pr.window["start"]),
+        "window_end": datetime.fromisoformat(pr.window["end"]),
+        "computed_at": now,
+        "dirty": False,
+    }
+    if seen_revision is None:
+        db.session.add(GoalProgressSnapshot(goal_id=goal.id, revision=0, **values))
+        return
+    # Only clear the dirty flag if no write marked the goal since we read it;
+    # otherwise leave the row for the next round.
+    db.session.execute(
+        update(GoalProgressSnapshot)
+        .where(
+            GoalProgressSnapshot.goal_id == goal.id,
+            GoalProgressSnapshot.revision == seen_revision,
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_snapshots(limit: int = 500, *, now: datetime | None = None) -> int:
+    """Recompute up to ``limit`` snapshots that are missing, dirty or expired.
+
+    Returns how many goals were processed; callers loop until it returns 0.
+    """
+    now = now or now_utc_naive()
+
+    rows = (
+        db.session.query(Goal, GoalProgressSnapshot.revision)
+        .outerjoin(GoalProgressSnapshot, GoalProgressSnapshot.goal_id == Goal.id)
+        .filter(
+            or_(
+                GoalProgressSnapshot.goal_id.is_(None),
+                GoalProgressSnapshot.dirty.is_(True),
+                and_(
+                    GoalProgressSnapshot.window_end <= now,
+                    GoalProgressSnapshot.computed_at < GoalProgressSnapshot.window_end,
+                ),
+                GoalProgressSnapshot.computed_at < now - _max_age(),
+            )
+        )
+        .order_by(Goal.id)
+        .limit(limit)
+        .all()
+    )
+    if not rows:
+        return 0
+
+    progress = compute_goals_progress([goal for goal, _ in rows], now=now)
+    for goal, revision in rows:
+        _store(goal, revision, progress[goal.id], now)
+    db.session.commit()
+    return len(rows)
+
+
+def refresh_all(batch: int = 500) -> int:
+    total = 0
+    while True:
+        n = refresh_snapshots(batch)
+        total += n
+        if n < batch:
+            return total
+
+
+class SnapshotWorker(threading.Thread):
+    """Background thread that keeps snapshots fresh inside an app context.
+
+    Meant for single-process deployments; with several gunicorn workers run
+    ``flask snapshots refresh --loop`` as one separate process instead.
+    """
+
+    def __init__(self, app, interval: float = 10.0, batch: int = 500):
+        super().__init__(name="goal-snapshot-worker", daemon=True)
+        self.app = app
+        self.interval = interval
+        self.batch = batch
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            with self.app.app_context():
+                try:
+                    refresh_all(self.batch)
+                except Exception:
+                    log.exception("Goal snapshot refresh failed")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            self._stopped.wait(self.interval)
+
+
+@click.group("snapshots")
+def snapshots_cli():
+    """Maintain goal_progress_snapshot."""
+
+
+@snapshots_cli.command("refresh")
+@click.option("--loop", is_flag=True, help="Keep running and refresh every --interval seconds.")
+@click.option("--interval", type=float, default=10.0, show_default=True)
+@click.option("--batch", type=int, default=500, show_default=True)
+@with_appcontext
+def refresh_command(loop, interval, batch):
+    """Recompute snapshots for goals whose window or sessions changed."""
+    while True:
+        total = refresh_all(batch)
+        click.echo(f"goal_progress_snapshot: refreshed {total} goals")
+        if not loop:
+            return
+        db.session.remove()
+        time.sleep(interval)
@@ -0,0 +1,205 @@
+"""Streak and personal-record state kept in ``user_stats``/``user_exercise_stats``.
+
+The session write paths call in here after updating the daily rollup, inside
+the same transaction. Cheap cases (a session today, a new record) update the
+rows in place; deletes and backdated writes that can split or merge streaks
+fall back to a recompute bounded by the user's active days in the rollup, or
+by one exercise type's sessions for records.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import delete, select
+
+from ..extensions import db
+from ..models import DailyActivityRollup, UserExerciseStats, UserStats, WorkoutSession
+from .rollup import day_of
+
+ONE_DAY = timedelta(days=1)
+
+
+def recompute_streaks(user_id: int) -> UserStats:
+    days = db.session.execute(
+        select(DailyActivityRollup.day)
+        .where(DailyActivityRollup.user_id == user_id)
+        .distinct()
+        .order_by(DailyActivityRollup.day)
+    ).scalars()
+
+    stats = db.session.get(UserStats, user_id) or UserStats(user_id=user_id)
+    db.session.add(stats)
+    start = last = None
+    best = (0, None, None)
+    for day in days:
+        if last is None or day != last + ONE_DAY:
+            start = day
+        last = day
+        length = (last - start).days + 1
+        if length > best[0]:
+            best = (length, start, last)
+
+    stats.last_active_day = last
+    stats.current_streak_start = start
+    stats.longest_streak, stats.longest_streak_start, stats.longest_streak_end = best
+    stats.updated_at = datetime.utcnow()
+    return stats
+
+
+def recompute_records(user_id: int, exercise_type_id: int | None = None) -> None:
+    """Rebuild record rows for one exercise type, or for all of them."""
+    if exercise_type_id is None:
+        db.session.execute(delete(UserExerciseStats).where(UserExerciseStats.user_id == user_id))
+        etids = db.session.execute(
+            select(WorkoutSession.exercise_type_id)
+            .where(WorkoutSession.user_id == user_id)
+            .distinct()
+        ).scalars()
+        for etid in list(etids):
+            recompute_records(user_id, etid)
+        return
+
+    def best(column):
+        return db.session.execute(
+            select(column, WorkoutSession.date)
+            .where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.exercise_type_id == exercise_type_id,
+            )
+            .order_by(column.desc(), WorkoutSession.date)
+            .limit(1)
+        ).first()
+
+    longest, most = best(WorkoutSession.duration), best(WorkoutSession.calories)
+    row = db.session.get(UserExerciseStats, (user_id, exercise_type_id))
+    if longest is None:
+        if row is not None:
+            db.session.delete(row)
+        return
+    if row is None:
+        row = UserExerciseStats(user_id=user_id, exercise_type_id=exercise_type_id)
+        db.session.add(row)
+    row.longest_duration, row.longest_duration_date = longest
+    row.most_calories, row.most_calories_date = most
+
+
+def recompute(user_id: int) -> UserStats:
+    recompute_records(user_id)
+    return recompute_streaks(user_id)
+
+
+def _add_day(stats: UserStats, day: date) -> bool:
+    """Extend the streak state with an active day; False if a recompute is needed."""
+    last, start = stats.last_active_day, stats.current_streak_start
+    if last is None:
+        stats.last_active_day = stats.current_streak_start = day
+        stats.longest_streak, stats.longest_streak_start, stats.longest_streak_end = 1, day, day
+        return True
+    if day < start:
+        # Backdated: may join older runs into something longer.
+        return False
+    if day <= last:
+        return True
+    if day == last + ONE_DAY:
+        length = (day - start).days + 1
+        if length > stats.longest_streak:
+            stats.longest_streak = length
+            stats.longest_streak_start, stats.longest_streak_end = start, day
+    else:
+        stats.current_streak_start = day
+    stats.last_active_day = day
+    return True
+
+
+def _add_record(user_id: int, etid: int, duration: int, calories: int, when) -> None:
+    row = db.session.get(UserExerciseStats, (user_id, etid))
+    if row is None:
+        db.session.add(
+            UserExerciseStats(
+                user_id=user_id,
+                exercise_type_id=etid,
+                longest_duration=duration,
+                longest_duration_date=when,
+                most_calories=calories,
+                most_calories_date=when,
+            )
+        )
+        return
+    if duration > row.longest_duration:
+        row.longest_duration, row.longest_duration_date = duration, when
+    if calories > row.most_calories:
+        row.most_calories, row.most_calories_date = calories, when
+
+
+def sessions_added(user_id: int, entries: Iterable[tuple[int, datetime, int, int]]) -> None:
+    """Fold new ``(exercise_type_id, date, duration, calories)`` entries in.
+
+    The rollup must already include them.
+    """
+    entries = [e for e in entries if e[1] is not None]
+    if not entries:
+        return
+    stats = db.session.get(UserStats, user_id)
+    if stats is None:
+        recompute(user_id)
+        return
+
+    for etid, when, duration, calories in entries:
+        _add_record(user_id, etid, duration, calories, when)
+    for day in sorted({day_of(e[1]) for e in entries}):
+        if not _add_day(stats, day):
+            recompute_streaks(user_id)
+            break
+    stats.updated_at = datetime.utcnow()
+
+
+def session_added(user_id: int, etid: int, when, duration: int, calories: int) -> None:
+    sessions_added(user_id, [(etid, when, duration, calories)])
+
+
+def session_removed(user_id: int, etid: int, when, duration: int, calories: int) -> None:
+    """Account for a deleted (or pre-update) session; the rollup must reflect it."""
+    stats = db.session.get(UserStats, user_id)
+    if stats is None or when is None:
+        recompute(user_id)
+        return
+
+    row = db.session.get(UserExerciseStats, (user_id, etid))
+    if row is None or duration >= row.longest_duration or calories >= row.most_calories:
+        recompute_records(user_id, etid)
+
+    day = day_of(when)
+    still_active = db.session.execute(
+        select(DailyActivityRollup.day)
+        .where(DailyActivityRollup.user_id == user_id, DailyActivityRollup.day == day)
+        .limit(1)
+    ).first()
+    if still_active is not None:
+        return
+    in_current = (
+        stats.current_streak_start is not None
+        and stats.current_streak_start <= day <= stats.last_active_day
+    )
+    in_longest = (
+        stats.longest_streak_start is not None
+        and stats.longest_streak_start <= day <= stats.longest_streak_end
+    )
+    if in_current or in_longest:
+        recompute_streaks(user_id)
+
+
+def add_session(s: WorkoutSession) -> None:
+    session_added(s.user_id, s.exercise_type_id, s.date, s.duration, s.calories)
+
+
+def remove_session(s: WorkoutSession) -> None:
+    session_removed(s.user_id, s.exercise_type_id, s.date, s.duration, s.calories)
+
+
+def current_streak(stats: UserStats, today: date) -> int:
+    """The streak is still alive until the day after the last active day ends."""
+    if stats.last_active_day is None or (today - stats.last_active_day).days > 1:
+        return 0
+    return (stats.last_active_day - stats.current_streak_start).days + 1
@@ -0,0 +1,19 @@
+"""WSGI entry point.
+
+    gunicorn -c backend/gunicorn.conf.py 'backend.wsgi:app'   # what the image runs
+    gunicorn 'backend.wsgi:app'             # each worker builds the app
+    gunicorn --preload 'backend.wsgi:app'   # built once in the master, shared copy-on-write
+
+``backend.app`` only defines ``create_app``; importing it has no side effects.
+"""
+
+from __future__ import annotations
+
+import os
+
+from .app import create_app
+from .utils import prefork
+
+app = create_app()
+prefork.freeze()
+os.register_at_fork(after_in_child=lambda: prefork.after_fork_in_child(app))